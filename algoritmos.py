@@ -1,74 +1,196 @@
 # algoritmos.py
 
+import gc
 import heapq
+import time
+from array import array
 from collections import deque 
+from contextlib import contextmanager
+from functools import partial
+
+import numpy as np
+
+from corredores import Corredores, RutaPerezosa
+from estadisticas import registrar_fase
+from grafo import BIT_LIBRE, VALOR_MINIMO_TERRENO, GrafoMalla, costo_entrada, dimensiones
+from monticulo import ColaCubetas, MonticuloIndexado
+
+# =========================
+# Reconstrucción del camino a partir de los predecesores
+# =========================
+def reconstruir_camino(vino_de, inicio, meta):
+    """Reconstruye el camino siguiendo los predecesores desde la meta hasta el inicio
+
+    Args:
+        vino_de (dict): Diccionario {nodo: predecesor}, con vino_de[inicio] = None
+        inicio (tuple): Punto de inicio en el grafo
+        meta (tuple): Punto de meta en el grafo
+
+    Returns:
+        list: Camino desde inicio hasta meta, o None si la meta no fue alcanzada
+    """
+    if meta not in vino_de:
+        return None
+
+    camino = []
+    nodo = meta
+
+    while nodo is not None:
+        camino.append(nodo)
+        nodo = vino_de[nodo]
+
+    camino.reverse()
+
+    if camino[0] == inicio:
+        return camino
+    else:
+        return None
+
+
+def _desconectados(componentes, inicio, meta, estadisticas):
+    """Indica si el índice de componentes demuestra que no hay camino (y registra una búsqueda vacía).
+
+    Args:
+        componentes (IndiceComponentes | None): Índice de componentes conexas (ver componentes.py)
+        inicio (tuple): Punto de inicio en el grafo
+        meta (tuple): Punto de meta en el grafo
+        estadisticas (Estadisticas | None): Objeto donde se acumulan los contadores
+
+    Returns:
+        bool: True si la búsqueda puede regresar sin solución de inmediato
+    """
+    if componentes is None or componentes.conectados(inicio, meta):
+        return False
+    if estadisticas is not None:
+        estadisticas.registrar_busqueda(0, 0, 0, 0)
+    return True
+
 
 # =========================
 # DFS
 # =========================
-def dfs(grafo, inicio, meta): 
+@registrar_fase("busqueda")
+def dfs(grafo, inicio, meta, componentes=None, estadisticas=None):
     """Implementación del algoritmo DFS
 
     Args:
-        grafo (dict): Grafo representado como un diccionario de adyacencia
+        grafo (dict | GrafoMalla): Grafo representado como un diccionario de adyacencia
         inicio (tuple): Punto de inicio en el grafo
         meta (tuple): Punto de meta en el grafo
+        componentes (IndiceComponentes, optional): Índice de componentes conexas; si inicio y
+            meta están en componentes distintas se regresa sin solución sin buscar (sin el
+            índice no hay salida temprana: se explora toda la componente del inicio)
+        estadisticas (Estadisticas, optional): Objeto donde se acumulan los contadores y tiempos
 
     Returns:
-        list: Camino desde inicio hasta meta, o None si no hay solución
+        tuple: (camino, nodos_expandidos, nodos_generados) donde camino es la lista de
+                celdas (o None si no hay solución), nodos_expandidos es el contador de
+                nodos visitados y nodos_generados el de nodos agregados a la pila
     """
-    pila = [(inicio, [inicio])]
-    visitados = set()
+    if _desconectados(componentes, inicio, meta, estadisticas):
+        return None, 0, 0
+
+    # Cada entrada de la pila guarda (nodo, predecesor); el camino se reconstruye al final.
+    pila = [(inicio, None)]
+    vino_de = {}
+    nodos_expandidos = 0
+    nodos_generados = 1
+    extracciones_obsoletas = 0
+    frontera_maxima = 0
+    al_expandir = estadisticas.al_expandir if estadisticas is not None else None
+    camino = None
 
     # DFS: LIFO (Last In, First Out) usando una pila.
     while pila:
-        nodo, camino = pila.pop()
+        if len(pila) > frontera_maxima:
+            frontera_maxima = len(pila)
+        nodo, padre = pila.pop()
+
+        if nodo in vino_de:
+            extracciones_obsoletas += 1
+            continue
+
+        # El predecesor se fija al visitar el nodo, igual que el camino de la entrada sacada.
+        vino_de[nodo] = padre
+        nodos_expandidos += 1
+        if al_expandir is not None:
+            al_expandir(nodo)
 
         if nodo == meta:
-            return camino
+            camino = reconstruir_camino(vino_de, inicio, meta)
+            break
 
-        if nodo not in visitados:
-            visitados.add(nodo)
-            
-            for vecino, _ in grafo[nodo]:
-                if vecino not in visitados:
-                    pila.append((vecino, camino + [vecino]))
+        for vecino, _ in grafo[nodo]:
+            if vecino not in vino_de:
+                pila.append((vecino, nodo))
+                nodos_generados += 1
+
+    if estadisticas is not None:
+        estadisticas.registrar_busqueda(nodos_expandidos, nodos_generados, extracciones_obsoletas, frontera_maxima)
 
-    return None
+    return camino, nodos_expandidos, nodos_generados
 
 
 # ========================= 
 # BFS
 # ========================= 
-def bfs(grafo, inicio, meta):
+@registrar_fase("busqueda")
+def bfs(grafo, inicio, meta, componentes=None, estadisticas=None):
     """Implementación del algoritmo BFS
 
+    Con terreno, BFS ignora los pesos: encuentra el camino con menos pasos, no el más barato.
+
     Args:
-        grafo (dict): Grafo representado como un diccionario de adyacencia
+        grafo (dict | GrafoMalla): Grafo representado como un diccionario de adyacencia
         inicio (tuple): Punto de inicio en el grafo
         meta (tuple): Punto de meta en el grafo
+        componentes (IndiceComponentes, optional): Índice de componentes conexas; si inicio y
+            meta están en componentes distintas se regresa sin solución sin buscar (sin el
+            índice no hay salida temprana: se explora toda la componente del inicio)
+        estadisticas (Estadisticas, optional): Objeto donde se acumulan los contadores y tiempos
 
     Returns:
-        list: Camino desde inicio hasta meta, o None si no hay solución
+        tuple: (camino, nodos_expandidos, nodos_generados) donde camino es la lista de
+                celdas (o None si no hay solución), nodos_expandidos es el contador de
+                nodos sacados de la cola y nodos_generados el de nodos agregados a ella
     """
-    cola = deque([(inicio, [inicio])])
-    visitados = set()
+    if _desconectados(componentes, inicio, meta, estadisticas):
+        return None, 0, 0
+
+    cola = deque([inicio])
+    # vino_de también funciona como conjunto de visitados: un nodo se marca al agregarlo
+    # a la cola, así que su predecesor es el primero que lo descubrió.
+    vino_de = {inicio: None}
+    nodos_expandidos = 0
+    nodos_generados = 1
+    frontera_maxima = 0
+    al_expandir = estadisticas.al_expandir if estadisticas is not None else None
+    camino = None
 
     # BFS: FIFO (First In, First Out) usando una cola.
     while cola:
-        nodo, camino = cola.popleft()
+        if len(cola) > frontera_maxima:
+            frontera_maxima = len(cola)
+        nodo = cola.popleft()
+        nodos_expandidos += 1
+        if al_expandir is not None:
+            al_expandir(nodo)
 
         if nodo == meta:
-            return camino
+            camino = reconstruir_camino(vino_de, inicio, meta)
+            break
 
-        if nodo not in visitados:
-            visitados.add(nodo)
+        for vecino, _ in grafo[nodo]:
+            if vecino not in vino_de:
+                vino_de[vecino] = nodo
+                cola.append(vecino)
+                nodos_generados += 1
 
-            for vecino, _ in grafo[nodo]:
-                if vecino not in visitados:
-                    cola.append((vecino, camino + [vecino]))
+    # Los nodos se marcan al agregarlos, así que la cola nunca tiene entradas obsoletas.
+    if estadisticas is not None:
+        estadisticas.registrar_busqueda(nodos_expandidos, nodos_generados, 0, frontera_maxima)
 
-    return None
+    return camino, nodos_expandidos, nodos_generados
 
 
 # =========================
@@ -90,56 +212,157 @@ def heuristica(nodo, meta):
 # =========================
 # A* (original, paso a paso)
 # ========================= 
-def a_estrella(grafo, inicio, meta):
-    """Implementación del algoritmo A* original (paso a paso)
+def _a_estrella_nucleo(vecinos, inicio, meta, funcion_heuristica, indexado, estadisticas, cubetas=False):
+    """Núcleo de A* compartido por a_estrella y a_estrella_macro.
+
+    Las entradas de la cola son (f, h, nodo): a igual f se expande primero el nodo con
+    menor h (es decir, mayor g), el más cercano a la meta, y a igual h decide el nodo,
+    así que el orden de expansión es determinista. Los nodos expandidos van a un
+    conjunto de cerrados: una entrada de un nodo cerrado es obsoleta y se descarta sin
+    contarla como expansión, y los vecinos cerrados no se vuelven a relajar (con una
+    heurística consistente su costo ya es óptimo).
 
     Args:
-        grafo (dict): Grafo representado como un diccionario de adyacencia
-        inicio (tuple): Punto de inicio en el grafo
-        meta (tuple): Punto de meta en el grafo
+        vecinos (callable): Función nodo → [(vecino, peso), ...]
+        inicio (tuple): Punto de inicio
+        meta (tuple): Punto de meta
+        funcion_heuristica (callable): Heurística consistente (nodo, meta) → int
+        indexado (bool): Si es True se usa un MonticuloIndexado (disminución de clave, sin
+            entradas obsoletas); si no, heapq con entradas obsoletas descartadas al sacarlas
+        estadisticas (Estadisticas): Objeto donde se acumulan los contadores, o None
+        cubetas (bool, optional): Si es True se usa una ColaCubetas (costos y heurística
+            enteros); a igual f se expande primero la última entrada agregada
 
     Returns:
-        tuple: (camino, nodos_expandidos) donde camino es la lista de celdas
-                y nodos_expandidos es el contador de nodos sacados de la cola
-    """ 
-    cola_prioridad = []
-    heapq.heappush(cola_prioridad, (0, inicio))
+        tuple: (vino_de, nodos_expandidos)
+    """
+    if cubetas:
+        cola = ColaCubetas()
+        agregar, extraer = cola.agregar, cola.extraer
+    elif indexado:
+        cola = MonticuloIndexado()
+        agregar, extraer = cola.agregar, cola.extraer
+    else:
+        cola = []
+        agregar, extraer = partial(heapq.heappush, cola), partial(heapq.heappop, cola)
+
+    h = funcion_heuristica(inicio, meta)
+    agregar((h, h, inicio))
     vino_de = {inicio: None}
     costo_g = {inicio: 0}
+    cerrados = set()
     nodos_expandidos = 0
+    nodos_generados = 1
+    extracciones_obsoletas = 0
+    frontera_maxima = 0
+    al_expandir = estadisticas.al_expandir if estadisticas is not None else None
 
     # A*: Prioridad basada en f(n) = g(n) + h(n), donde g(n) es el costo acumulado
-    # desde el inicio hasta el nodo n, y h(n) es la heurística (distancia Manhattan) desde n hasta la meta.
-    while cola_prioridad:
-        _, actual = heapq.heappop(cola_prioridad)
+    # desde el inicio hasta el nodo n, y h(n) es la heurística desde n hasta la meta.
+    while cola:
+        if len(cola) > frontera_maxima:
+            frontera_maxima = len(cola)
+        _, _, actual = extraer()
+
+        if actual in cerrados:
+            extracciones_obsoletas += 1
+            continue
+        cerrados.add(actual)
         nodos_expandidos += 1
+        if al_expandir is not None:
+            al_expandir(actual)
 
         if actual == meta:
             break
 
-        for vecino, peso in grafo[actual]:
-            nuevo_costo = costo_g[actual] + peso
+        costo_actual = costo_g[actual]
+        for vecino, peso in vecinos(actual):
+            if vecino in cerrados:
+                continue
+            nuevo_costo = costo_actual + peso
 
-            if vecino not in costo_g or nuevo_costo < costo_g[vecino]:
+            if nuevo_costo < costo_g.get(vecino, nuevo_costo + 1):
                 costo_g[vecino] = nuevo_costo
-                prioridad = nuevo_costo + heuristica(vecino, meta)
-                heapq.heappush(cola_prioridad, (prioridad, vecino))
                 vino_de[vecino] = actual
+                h = funcion_heuristica(vecino, meta)
+                agregar((nuevo_costo + h, h, vecino))
+                nodos_generados += 1
+
+    if estadisticas is not None:
+        estadisticas.registrar_busqueda(nodos_expandidos, nodos_generados, extracciones_obsoletas, frontera_maxima)
+
+    return vino_de, nodos_expandidos
+
+
+@registrar_fase("busqueda")
+def a_estrella(grafo, inicio, meta, funcion_heuristica=heuristica, indexado=False, cubetas=False,
+               componentes=None, estadisticas=None):
+    """Implementación del algoritmo A* original (paso a paso)
+
+    Con terreno las aristas pesan el costo de la celda destino; la distancia Manhattan
+    sigue siendo admisible porque ningún paso cuesta menos de 1.
+
+    Args:
+        grafo (dict | GrafoMalla): Grafo representado como un diccionario de adyacencia
+        inicio (tuple): Punto de inicio en el grafo
+        meta (tuple): Punto de meta en el grafo
+        funcion_heuristica (callable, optional): Heurística (nodo, meta) → int; por defecto
+            la distancia Manhattan (por ejemplo, Landmarks.heuristica para ALT)
+        indexado (bool, optional): Usar un montículo indexado con disminución de clave
+        cubetas (bool, optional): Usar una cola de cubetas (ColaCubetas) en lugar de heapq
+        componentes (IndiceComponentes, optional): Índice de componentes conexas; si inicio y
+            meta están en componentes distintas se regresa sin solución sin buscar (sin el
+            índice no hay salida temprana: se explora toda la componente del inicio)
+        estadisticas (Estadisticas, optional): Objeto donde se acumulan los contadores y tiempos
+
+    Returns:
+        tuple: (camino, nodos_expandidos) donde camino es la lista de celdas
+                y nodos_expandidos es el contador de nodos expandidos (sin entradas obsoletas)
+    """ 
+    if _desconectados(componentes, inicio, meta, estadisticas):
+        return None, 0
+
+    vino_de, nodos_expandidos = _a_estrella_nucleo(grafo.__getitem__, inicio, meta, funcion_heuristica,
+                                                   indexado, estadisticas, cubetas)
 
     # Reconstruir camino
-    camino = []
-    nodo = meta
+    return reconstruir_camino(vino_de, inicio, meta), nodos_expandidos
 
-    while nodo is not None:
-        camino.append(nodo)
-        nodo = vino_de.get(nodo)
 
-    camino.reverse()
+def _sin_heuristica(nodo, meta):
+    return 0
 
-    if camino and camino[0] == inicio:
-        return camino, nodos_expandidos
-    else:
-        return None, nodos_expandidos
+
+# =========================
+# Dijkstra con cola de cubetas
+# =========================
+@registrar_fase("busqueda")
+def dijkstra(grafo, inicio, meta, cubetas=True, componentes=None, estadisticas=None):
+    """Implementación de Dijkstra (A* sin heurística) para grafos con costos enteros
+
+    Con la cola de cubetas cada extracción avanza un puntero sobre los costos en lugar de
+    reordenar un montículo, así que en mallas con terreno de costos pequeños el tiempo es
+    casi lineal en el número de celdas.
+
+    Args:
+        grafo (dict | GrafoMalla): Grafo del laberinto (o macro-grafo)
+        inicio (tuple): Punto de inicio en el grafo
+        meta (tuple): Punto de meta en el grafo
+        cubetas (bool, optional): Usar una ColaCubetas; con False se usa heapq
+        componentes (IndiceComponentes, optional): Índice de componentes conexas; si inicio y
+            meta están en componentes distintas se regresa sin solución sin buscar (sin el
+            índice no hay salida temprana: se explora toda la componente del inicio)
+        estadisticas (Estadisticas, optional): Objeto donde se acumulan los contadores y tiempos
+
+    Returns:
+        tuple: (camino, nodos_expandidos), igual que a_estrella
+    """
+    if _desconectados(componentes, inicio, meta, estadisticas):
+        return None, 0
+
+    vino_de, nodos_expandidos = _a_estrella_nucleo(lambda nodo: grafo.get(nodo, ()), inicio, meta,
+                                                   _sin_heuristica, False, estadisticas, cubetas)
+    return reconstruir_camino(vino_de, inicio, meta), nodos_expandidos
 
 
 # =========================
@@ -155,7 +378,7 @@ def identificar_nodos_decision(grafo, inicio, meta):
         - Callejones sin salida (grado 1)
 
     Args:
-        grafo (dict): Grafo original del laberinto
+        grafo (dict | GrafoMalla): Grafo original del laberinto
         inicio (tuple): Coordenada del punto de inicio
         meta (tuple): Coordenada del punto de meta
 
@@ -177,32 +400,33 @@ def identificar_nodos_decision(grafo, inicio, meta):
 # =========================
 # MACRO-GRAFO: Exploración de Corredores
 # =========================
-def explorar_corredor(grafo, origen, primer_paso, nodos_decision):
+def explorar_corredor(grafo, origen, primer_paso, nodos_decision, costo_primer_paso=1):
     """Parte de un nodo de decisión y recorre el corredor hasta encontrar
     el siguiente nodo de decisión, registrando todos los pasos intermedios.
 
     Args:
-        grafo (dict): Grafo original del laberinto
+        grafo (dict | GrafoMalla): Grafo original del laberinto
         origen (tuple): Nodo de decisión desde el que inicia el corredor
         primer_paso (tuple): Primer vecino en la dirección del corredor
         nodos_decision (set): Conjunto de nodos de decisión
+        costo_primer_paso (int, optional): Peso de la arista origen → primer_paso
 
     Returns:
         tuple: (nodo_destino, costo, pasos_intermedios) donde:
             - nodo_destino es el siguiente nodo de decisión encontrado
-            - costo es la longitud (número de pasos) del corredor
+            - costo es la suma de los pesos de las aristas del corredor (su longitud sin terreno)
             - pasos_intermedios es la lista ordenada de celdas del corredor (sin incluir origen, incluyendo nodo_destino)
     """
     pasos = [primer_paso]
     anterior = origen
     actual = primer_paso
-    costo = 1
+    costo = costo_primer_paso
 
     # Avanzar por el corredor mientras no lleguemos a un nodo de decisión.
     while actual not in nodos_decision:
         # Buscar el único vecino que no sea el anterior (el pasillo continúa).
         siguiente = None
-        for vecino, _ in grafo[actual]:
+        for vecino, peso in grafo[actual]:
             if vecino != anterior:
                 siguiente = vecino
                 break
@@ -214,58 +438,311 @@ def explorar_corredor(grafo, origen, primer_paso, nodos_decision):
         anterior = actual
         actual = siguiente
         pasos.append(actual)
-        costo += 1
+        costo += peso
 
     return actual, costo, pasos
 
 
+# =========================
+# MACRO-GRAFO: Aristas de un nodo de decisión
+# =========================
+def explorar_aristas(grafo, nd, nodos_decision):
+    """Explora todos los corredores que salen de un nodo de decisión.
+
+    Un corredor que regresa al mismo nodo nunca forma parte de un camino más corto, así
+    que se descarta; entre dos nodos unidos por varios corredores se conserva el más corto.
+
+    Args:
+        grafo (dict | GrafoMalla): Grafo original del laberinto
+        nd (tuple): Nodo de decisión de origen
+        nodos_decision (set): Conjunto de nodos de decisión
+
+    Returns:
+        dict: {destino: (costo, pasos)} en el orden en que se encontró cada destino
+    """
+    aristas = {}
+
+    for primer_paso, peso in grafo[nd]:
+        # Explorar el corredor que sale hacia primer_paso.
+        destino, costo, pasos = explorar_corredor(grafo, nd, primer_paso, nodos_decision, peso)
+
+        if destino == nd:
+            continue
+
+        if destino not in aristas or costo < aristas[destino][0]:
+            aristas[destino] = (costo, pasos)
+
+    return aristas
+
+
 # =========================
 # MACRO-GRAFO: Construcción
 # =========================
-def construir_macro_grafo(grafo, inicio, meta):
+@registrar_fase("construccion")
+def construir_macro_grafo(grafo, inicio, meta, estadisticas=None):
     """Construye el macro-grafo donde los nodos son los nodos de decisión
     y las aristas representan corredores completos con su longitud como peso.
 
+    Con terreno, el peso es la suma de los costos de las celdas en las que se entra a lo
+    largo del corredor, así que puede ser distinto en cada sentido.
+
     Args:
-        grafo (dict): Grafo original del laberinto
+        grafo (dict | GrafoMalla): Grafo original del laberinto
         inicio (tuple): Coordenada del punto de inicio
         meta (tuple): Coordenada del punto de meta
+        estadisticas (Estadisticas, optional): Objeto donde se suma el tiempo de la fase "construccion"
 
     Returns:
         tuple: (macro_grafo, nodos_decision, corredores) donde:
                 - macro_grafo es un dict {nodo: [(vecino, peso), ...]}
                 - nodos_decision es el conjunto de nodos de decisión
-                - corredores es un dict {(origen, destino): [pasos]} con los
-                pasos intermedios de cada corredor (para reconstruir la ruta)
+                - corredores es un Corredores {(origen, destino): pasos} con los
+                pasos intermedios de cada corredor (para reconstruir la ruta); cada
+                corredor se guarda una vez y el sentido inverso es una vista
     """
+    if isinstance(grafo, GrafoMalla):
+        return construir_macro_grafo_vectorizado(grafo, inicio, meta)
+
     nodos_decision = identificar_nodos_decision(grafo, inicio, meta)
 
     # macro_grafo: nodo de decisión → lista de (nodo_destino, costo).
     macro_grafo = {nd: [] for nd in nodos_decision}
 
-    # corredores: (origen, destino) → lista de celdas intermedias (sin origen, con destino).
-    corredores = {}
+    # corredores: (origen, destino) → celdas intermedias (sin origen, con destino).
+    corredores = Corredores()
 
+    # Cada extremo explora sus propios corredores, así que la dirección inversa de
+    # cada macro-arista se registra cuando se recorre desde el otro nodo.
     for nd in nodos_decision:
-        for primer_paso, _ in grafo[nd]:
-            # Explorar el corredor que sale hacia primer_paso.
-            destino, costo, pasos = explorar_corredor(grafo, nd, primer_paso, nodos_decision)
-
-            # Agregar la macro-arista si no existe ya (evitar duplicados).
-            ya_existe = any(v == destino for v, _ in macro_grafo[nd])
-            if not ya_existe:
-                macro_grafo[nd].append((destino, costo))
-                # Guardar los pasos del corredor en ambas direcciones.
-                corredores[(nd, destino)] = pasos
-                corredores[(destino, nd)] = list(reversed([nd] + pasos[:-1]))
+        for destino, (costo, pasos) in explorar_aristas(grafo, nd, nodos_decision).items():
+            macro_grafo[nd].append((destino, costo))
+            corredores[(nd, destino)] = pasos
 
     return macro_grafo, nodos_decision, corredores
 
 
+# =========================
+# MACRO-GRAFO: Construcción vectorizada
+# =========================
+
+# Índice del movimiento opuesto a cada movimiento de grafo.MOVIMIENTOS.
+_OPUESTO = np.array([1, 0, 3, 2], dtype=np.int64)
+
+# Índice del bit más bajo y del más alto de cada máscara de movimiento (-1 si no hay).
+_BIT_BAJO = np.array([(m & -m).bit_length() - 1 for m in range(16)], dtype=np.int64)
+_BIT_ALTO = np.array([m.bit_length() - 1 for m in range(16)], dtype=np.int64)
+
+
+@contextmanager
+def sin_recolector():
+    """Pausa el recolector de ciclos mientras se crean millones de tuplas y listas.
+
+    Ninguna de esas estructuras forma ciclos, así que las recolecciones que dispararían
+    solo agregan tiempo a la construcción de las estructuras de salida.
+    """
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
+
+
+def calcular_grados(libre):
+    """Calcula el grado de todas las celdas de la malla sumando arreglos desplazados.
+
+    Args:
+        libre (np.ndarray): Matriz booleana (filas x columnas) con True en las celdas libres
+
+    Returns:
+        np.ndarray: Matriz con el número de vecinos libres de cada celda (0 en las paredes)
+    """
+    grado = np.zeros(libre.shape, dtype=np.int8)
+    grado[1:, :] += libre[:-1, :]
+    grado[:-1, :] += libre[1:, :]
+    grado[:, 1:] += libre[:, :-1]
+    grado[:, :-1] += libre[:, 1:]
+    grado[~libre] = 0
+    return grado
+
+
+def construir_macro_grafo_vectorizado(grafo, inicio, meta):
+    """Construye el macro-grafo de un GrafoMalla con operaciones sobre arreglos.
+
+    Los nodos de decisión se marcan en una sola pasada a partir de los grados. Cada
+    celda de corredor (grado 2) tiene dos estados, uno por sentido de recorrido; cada
+    estado apunta al siguiente estado del corredor, y con saltos de punteros (pointer
+    jumping) se obtiene en O(log L) pasadas el final de cada corredor y la distancia
+    hasta él. Ordenar los estados por (final, distancia) etiqueta todos los corredores
+    a la vez y deja sus celdas en orden de recorrido.
+
+    Args:
+        grafo (GrafoMalla): Grafo compacto del laberinto
+        inicio (tuple): Coordenada del punto de inicio
+        meta (tuple): Coordenada del punto de meta
+
+    Returns:
+        tuple: (macro_grafo, nodos_decision, corredores) con la misma estructura que
+                construir_macro_grafo
+    """
+    filas, columnas = grafo.filas, grafo.columnas
+    mascaras = grafo.mascaras
+    movimientos = (mascaras & 15).astype(np.int64)
+    desplazamientos = np.array([-columnas, columnas, -1, 1], dtype=np.int64)
+
+    # ─ Nodos de decisión: grado distinto de 2, más el inicio y la meta ─
+    libre = (mascaras & BIT_LIBRE) != 0
+    grado = calcular_grados(libre.reshape(filas, columnas)).ravel()
+    decision = libre & (grado != 2)
+    for punto in (inicio, meta):
+        if punto is not None and punto in grafo:
+            decision[grafo.id_celda(punto)] = True
+    corredor = libre & ~decision
+
+    ids_decision = np.flatnonzero(decision)
+    ids_corredor = np.flatnonzero(corredor)
+
+    # ─ Estados de corredor ─
+    # El estado 2*c + e de la celda de corredor c sale por su bit bajo (e = 0) o alto (e = 1).
+    indice = np.full(len(mascaras), -1, dtype=np.int64)
+    indice[ids_corredor] = np.arange(len(ids_corredor))
+
+    bajo = _BIT_BAJO[movimientos[ids_corredor]]
+    salida = np.stack([bajo, _BIT_ALTO[movimientos[ids_corredor]]], axis=1).ravel()
+    celda_estado = np.repeat(ids_corredor, 2)
+    celda_siguiente = celda_estado + desplazamientos[salida]
+    terminal = decision[celda_siguiente]
+
+    # En la celda siguiente se entra por el lado opuesto a la salida y se sale por el otro bit.
+    indice_siguiente = indice[celda_siguiente]
+    entra_por_bajo = _BIT_BAJO[movimientos[celda_siguiente]] == _OPUESTO[salida]
+    estados = np.arange(len(celda_estado), dtype=np.int64)
+    puntero = np.where(terminal, estados, 2 * indice_siguiente + entra_por_bajo)
+    distancia = (~terminal).astype(np.int64)
+    # Con terreno se acumula además el costo de las celdas en las que se entra.
+    costo_celda = grafo.costos
+    suma = None if costo_celda is None else np.where(terminal, 0, costo_celda[celda_siguiente]).astype(np.int64)
+
+    # Saltos de punteros: al terminar, puntero[s] es el último estado del corredor y
+    # distancia[s] el número de pasos hasta él. Los ciclos sin nodos de decisión no
+    # convergen, por eso se limita el número de rondas.
+    for _ in range(max(1, len(estados)).bit_length() + 1):
+        nuevo_puntero = puntero[puntero]
+        distancia = distancia + distancia[puntero]
+        if suma is not None:
+            suma = suma + suma[puntero]
+        if np.array_equal(nuevo_puntero, puntero):
+            break
+        puntero = nuevo_puntero
+
+    # Agrupar los estados por estado final y ordenarlos por distancia decreciente:
+    # cada grupo es un corredor en un sentido, con sus celdas en orden de recorrido.
+    validos = np.flatnonzero(terminal[puntero])
+    orden = validos[np.lexsort((-distancia[validos], puntero[validos]))]
+    finales = puntero[orden]
+    arranques = np.flatnonzero(np.diff(finales, prepend=-1) != 0)
+    celdas_orden = celda_estado[orden]
+
+    # ─ Aristas que salen de cada nodo de decisión, en el orden de MOVIMIENTOS ─
+    origenes = []
+    direcciones = []
+    for k in range(4):
+        con_movimiento = ids_decision[(movimientos[ids_decision] >> k) & 1 == 1]
+        origenes.append(con_movimiento)
+        direcciones.append(np.full(len(con_movimiento), k, dtype=np.int64))
+    origenes = np.concatenate(origenes)
+    direcciones = np.concatenate(direcciones)
+    orden_aristas = np.lexsort((direcciones, origenes))
+    origenes = origenes[orden_aristas]
+    direcciones = direcciones[orden_aristas]
+
+    primeros = origenes + desplazamientos[direcciones]
+    por_corredor = corredor[primeros]
+    entra_por_bajo = _BIT_BAJO[movimientos[primeros]] == _OPUESTO[direcciones]
+    estado_inicial = (2 * indice[primeros] + entra_por_bajo)[por_corredor]
+
+    # Aristas directas entre nodos de decisión vecinos: 1 paso. Las que entran a un
+    # corredor llegan al nodo que sigue a su estado final, tras distancia + 2 pasos.
+    estado_final = np.zeros(len(origenes), dtype=np.int64)
+    destinos = primeros.copy()
+    longitudes = np.ones(len(origenes), dtype=np.int64)
+    estado_final[por_corredor] = puntero[estado_inicial]
+    destinos[por_corredor] = celda_siguiente[estado_final[por_corredor]]
+    longitudes[por_corredor] = distancia[estado_inicial] + 2
+    if costo_celda is None:
+        costos = longitudes
+    else:
+        # Costo de la primera celda, de las celdas del corredor que siguen y del destino.
+        costos = costo_celda[destinos].astype(np.int64)
+        costos[por_corredor] += costo_celda[primeros[por_corredor]] + suma[estado_inicial]
+
+    # Sin lazos (un corredor que vuelve al mismo nodo nunca acorta un camino) y, entre
+    # dos nodos unidos por varios corredores, solo el más corto, igual que en construir_macro_grafo.
+    sin_lazo = np.flatnonzero(origenes != destinos)
+    por_par = sin_lazo[np.lexsort((costos[sin_lazo], destinos[sin_lazo], origenes[sin_lazo]))]
+    primero_del_par = np.diff(origenes[por_par], prepend=-1) != 0
+    primero_del_par |= np.diff(destinos[por_par], prepend=-1) != 0
+    conservadas = np.sort(por_par[primero_del_par])
+
+    # ─ Búfer de corredores: cada corredor una sola vez ─
+    # Los dos sentidos de un corredor comparten su celda extrema más baja; el primero
+    # que aparece guarda sus celdas y el otro usa el mismo tramo al revés.
+    aristas_corredor = conservadas[por_corredor[conservadas]]
+    extremos = np.minimum(primeros[aristas_corredor], celda_estado[estado_final[aristas_corredor]])
+    orden_extremo = np.argsort(extremos, kind="stable")
+    duena = np.ones(len(orden_extremo), dtype=bool)
+    duena[1:] = extremos[orden_extremo[1:]] != extremos[orden_extremo[:-1]]
+    propias = aristas_corredor[orden_extremo[duena]]
+
+    interiores = longitudes[propias] - 1
+    desde_buffer = np.cumsum(interiores) - interiores
+    desde_grupo = arranques[np.searchsorted(finales[arranques], estado_final[propias])]
+    posiciones = np.repeat(desde_grupo - desde_buffer, interiores) + np.arange(interiores.sum())
+    celdas_buffer = celdas_orden[posiciones]
+    plano = np.stack([celdas_buffer // columnas, celdas_buffer % columnas], axis=1).astype(np.int32)
+
+    # Tramo de cada arista conservada: (inicio, longitud, sentido) en el búfer.
+    tramo_inicio = np.zeros(len(origenes), dtype=np.int64)
+    tramo_sentido = np.ones(len(origenes), dtype=np.int64)
+    duena_de = np.empty(len(orden_extremo), dtype=np.int64)
+    duena_de[orden_extremo] = (np.cumsum(duena) - 1)
+    tramo_inicio[aristas_corredor] = desde_buffer[duena_de]
+    tramo_sentido[aristas_corredor[orden_extremo[~duena]]] = -1
+
+    # ─ Estructuras de salida ─
+    with sin_recolector():
+        coordenadas_decision = list(zip((ids_decision // columnas).tolist(), (ids_decision % columnas).tolist()))
+        nodos_decision = set(coordenadas_decision)
+        macro_grafo = {nd: [] for nd in coordenadas_decision}
+        tramos = {}
+        vacio = range(0)
+
+        aristas_origen = origenes[conservadas]
+        aristas_destino = destinos[conservadas]
+        for origen, destino, costo, longitud, es_corredor, desde, sentido in zip(
+                zip((aristas_origen // columnas).tolist(), (aristas_origen % columnas).tolist()),
+                zip((aristas_destino // columnas).tolist(), (aristas_destino % columnas).tolist()),
+                costos[conservadas].tolist(), longitudes[conservadas].tolist(),
+                por_corredor[conservadas].tolist(), tramo_inicio[conservadas].tolist(),
+                tramo_sentido[conservadas].tolist()):
+            macro_grafo[origen].append((destino, costo))
+            if not es_corredor:
+                tramos[(origen, destino)] = vacio
+            elif sentido > 0:
+                tramos[(origen, destino)] = range(desde, desde + longitud - 1)
+            else:
+                tramos[(origen, destino)] = range(desde + longitud - 2, desde - 1, -1)
+
+    return macro_grafo, nodos_decision, Corredores(array("i", plano.tobytes()), tramos)
+
+
 # =========================
 # A* sobre el MACRO-GRAFO
 # =========================
-def a_estrella_macro(macro_grafo, inicio, meta):
+@registrar_fase("busqueda")
+def a_estrella_macro(macro_grafo, inicio, meta, funcion_heuristica=heuristica, indexado=False, cubetas=False,
+                     componentes=None, estadisticas=None):
     """Implementación de A* que opera sobre el macro-grafo, saltando entre
     nodos de decisión en lugar de avanzar celda a celda.
 
@@ -276,68 +753,243 @@ def a_estrella_macro(macro_grafo, inicio, meta):
         macro_grafo (dict): Macro-grafo {nodo_decision: [(vecino, peso), ...]}
         inicio (tuple): Coordenada del punto de inicio
         meta (tuple): Coordenada del punto de meta
+        funcion_heuristica (callable, optional): Heurística (nodo, meta) → int; por defecto
+            la distancia Manhattan
+        indexado (bool, optional): Usar un montículo indexado con disminución de clave
+        cubetas (bool, optional): Usar una cola de cubetas (ColaCubetas) en lugar de heapq
+        componentes (IndiceComponentes, optional): Índice de componentes conexas; si inicio y
+            meta están en componentes distintas se regresa sin solución sin buscar (sin el
+            índice no hay salida temprana: se explora toda la componente del inicio)
+        estadisticas (Estadisticas, optional): Objeto donde se acumulan los contadores y tiempos
 
     Returns:
         tuple: (ruta_compacta, nodos_expandidos) donde:
                 - ruta_compacta es la lista de nodos de decisión desde inicio hasta meta
-                - nodos_expandidos es el contador de nodos sacados de la cola
+                - nodos_expandidos es el contador de nodos expandidos (sin entradas obsoletas)
     """
-    cola_prioridad = []
-    heapq.heappush(cola_prioridad, (0, inicio))
+    if _desconectados(componentes, inicio, meta, estadisticas):
+        return None, 0
 
-    vino_de = {inicio: None}
+    # Explorar macro-vecinos (siguiente nodo de decisión al final de cada corredor).
+    vino_de, nodos_expandidos = _a_estrella_nucleo(lambda nodo: macro_grafo.get(nodo, ()), inicio, meta,
+                                                   funcion_heuristica, indexado, estadisticas, cubetas)
+
+    # Reconstruir ruta compacta (solo nodos de decisión).
+    return reconstruir_camino(vino_de, inicio, meta), nodos_expandidos
+
+
+# =========================
+# A* anytime con plazo
+# =========================
+# Peso inicial de la heurística y cuánto baja con cada solución nueva.
+PESO_ANYTIME = 2.5
+DECREMENTO_PESO = 0.5
+# Cada cuántas expansiones se consulta el reloj.
+INTERVALO_RELOJ = 64
+
+
+def _a_estrella_anytime(vecinos, inicio, meta, funcion_heuristica, plazo, max_expansiones, peso, decremento,
+                        estadisticas):
+    """Núcleo de A* ponderado anytime compartido por a_estrella_anytime y a_estrella_macro_anytime.
+
+    Expande por f' = g + peso * h, así que encuentra pronto una primera solución (a lo
+    más peso veces más cara que la óptima). Cada solución nueva pasa a ser la incumbente,
+    el peso baja en `decremento` (hasta 1) y la búsqueda sigue sobre la misma frontera,
+    descartando los nodos con g + h ≥ costo de la incumbente y reabriendo los cerrados a
+    los que se llega más barato. Aparte se lleva una cola con g + h de los nodos
+    abiertos: su mínimo es una cota inferior del costo óptimo, y la búsqueda termina en
+    cuanto alcanza a la incumbente (óptimo demostrado), se vacía la frontera, o se agota
+    el plazo o el límite de expansiones.
+
+    Args:
+        vecinos (callable): Función nodo → [(vecino, peso), ...]
+        inicio (tuple): Punto de inicio
+        meta (tuple): Punto de meta
+        funcion_heuristica (callable): Heurística admisible (nodo, meta) → int
+        plazo (float): Segundos disponibles, o None sin límite de tiempo
+        max_expansiones (int): Expansiones disponibles, o None sin límite
+        peso (float): Peso inicial de la heurística (≥ 1)
+        decremento (float): Cuánto baja el peso con cada solución
+        estadisticas (Estadisticas): Objeto donde se acumulan los contadores, o None
+
+    Returns:
+        tuple: (camino, nodos_expandidos, cota, optimo)
+    """
+    limite_tiempo = None if plazo is None else time.perf_counter() + plazo
+    infinito = float("inf")
+
+    h = funcion_heuristica(inicio, meta)
+    abiertos = [(peso * h, h, 0, inicio)]
+    inferiores = [(h, 0, inicio)]
     costo_g = {inicio: 0}
+    vino_de = {inicio: None}
+    cerrados = set()
+    mejor_costo, mejor_camino = infinito, None
     nodos_expandidos = 0
+    nodos_generados = 1
+    extracciones_obsoletas = 0
+    frontera_maxima = 0
+    al_expandir = estadisticas.al_expandir if estadisticas is not None else None
+
+    def cota_inferior():
+        # Descarta las entradas de nodos cerrados, podados o con un g ya mejorado.
+        while inferiores:
+            f, g, nodo = inferiores[0]
+            if f < mejor_costo and nodo not in cerrados and costo_g[nodo] == g:
+                return f
+            heapq.heappop(inferiores)
+        return mejor_costo
+
+    optimo = True
+    while abiertos:
+        if len(abiertos) > frontera_maxima:
+            frontera_maxima = len(abiertos)
+        if ((max_expansiones is not None and nodos_expandidos >= max_expansiones)
+                or (limite_tiempo is not None and nodos_expandidos % INTERVALO_RELOJ == 0
+                    and time.perf_counter() >= limite_tiempo)):
+            optimo = False
+            break
 
-    while cola_prioridad:
-        _, actual = heapq.heappop(cola_prioridad)
+        _, h, g, actual = heapq.heappop(abiertos)
+        if actual in cerrados or costo_g[actual] != g or g + h >= mejor_costo:
+            extracciones_obsoletas += 1
+            continue
+        cerrados.add(actual)
         nodos_expandidos += 1
+        if al_expandir is not None:
+            al_expandir(actual)
 
         if actual == meta:
-            break
+            mejor_costo, mejor_camino = g, reconstruir_camino(vino_de, inicio, meta)
+            if cota_inferior() >= mejor_costo:
+                break
+            # Reordenar la frontera con el peso nuevo, sin las entradas que ya no sirven.
+            peso = max(1.0, peso - decremento)
+            abiertos = [(g + peso * h, h, g, nodo) for _, h, g, nodo in abiertos
+                        if nodo not in cerrados and costo_g[nodo] == g and g + h < mejor_costo]
+            heapq.heapify(abiertos)
+            continue
+
+        for vecino, costo in vecinos(actual):
+            nuevo_costo = g + costo
+            if nuevo_costo < costo_g.get(vecino, infinito):
+                h = funcion_heuristica(vecino, meta)
+                if nuevo_costo + h >= mejor_costo:
+                    continue
+                costo_g[vecino] = nuevo_costo
+                vino_de[vecino] = actual
+                # Reabrir: con peso > 1 un nodo puede cerrarse antes de tener su g óptimo.
+                cerrados.discard(vecino)
+                heapq.heappush(abiertos, (nuevo_costo + peso * h, h, nuevo_costo, vecino))
+                heapq.heappush(inferiores, (nuevo_costo + h, nuevo_costo, vecino))
+                nodos_generados += 1
 
-        # Explorar macro-vecinos (siguiente nodo de decisión al final de cada corredor).
-        for macro_vecino, peso in macro_grafo.get(actual, []):
-            nuevo_costo = costo_g[actual] + peso
+    if estadisticas is not None:
+        estadisticas.registrar_busqueda(nodos_expandidos, nodos_generados, extracciones_obsoletas, frontera_maxima)
 
-            if macro_vecino not in costo_g or nuevo_costo < costo_g[macro_vecino]:
-                costo_g[macro_vecino] = nuevo_costo
-                prioridad = nuevo_costo + heuristica(macro_vecino, meta)
-                heapq.heappush(cola_prioridad, (prioridad, macro_vecino))
-                vino_de[macro_vecino] = actual
+    if optimo:
+        # Frontera vacía o cota inferior igual a la incumbente: no hay nada mejor (ni, sin
+        # incumbente, ningún camino).
+        return mejor_camino, nodos_expandidos, 1.0 if mejor_camino else infinito, True
 
-    # Reconstruir ruta compacta (solo nodos de decisión).
-    ruta_compacta = []
-    nodo = meta
+    limite = cota_inferior()
+    if mejor_camino is None:
+        return None, nodos_expandidos, infinito, False
+    cota = mejor_costo / limite if limite > 0 else infinito
+    return mejor_camino, nodos_expandidos, max(cota, 1.0), cota <= 1.0
 
-    while nodo is not None:
-        ruta_compacta.append(nodo)
-        nodo = vino_de.get(nodo)
 
-    ruta_compacta.reverse()
+@registrar_fase("busqueda")
+def a_estrella_anytime(grafo, inicio, meta, plazo=None, max_expansiones=None, funcion_heuristica=heuristica,
+                       peso=PESO_ANYTIME, decremento=DECREMENTO_PESO, componentes=None, estadisticas=None):
+    """Implementación de A* ponderado anytime con plazo (paso a paso)
 
-    if ruta_compacta and ruta_compacta[0] == inicio:
-        return ruta_compacta, nodos_expandidos
-    else:
-        return None, nodos_expandidos
+    Regresa la mejor solución encontrada cuando se agota el plazo o el límite de
+    expansiones, junto con una cota de su suboptimalidad, para que la latencia de una
+    consulta no dependa del tamaño del laberinto. Sin plazo ni límite corre hasta
+    demostrar que la solución es óptima.
+
+    Args:
+        grafo (dict | GrafoMalla): Grafo representado como un diccionario de adyacencia
+        inicio (tuple): Punto de inicio en el grafo
+        meta (tuple): Punto de meta en el grafo
+        plazo (float, optional): Segundos disponibles para la búsqueda
+        max_expansiones (int, optional): Número máximo de nodos expandidos
+        funcion_heuristica (callable, optional): Heurística admisible (nodo, meta) → int
+        peso (float, optional): Peso inicial de la heurística (≥ 1)
+        decremento (float, optional): Cuánto baja el peso con cada solución nueva
+        componentes (IndiceComponentes, optional): Índice de componentes conexas; si inicio y
+            meta están en componentes distintas se regresa sin solución sin buscar (sin el
+            índice no hay salida temprana: se explora toda la componente del inicio)
+        estadisticas (Estadisticas, optional): Objeto donde se acumulan los contadores y tiempos
+
+    Returns:
+        tuple: (camino, nodos_expandidos, cota, optimo) donde:
+                - camino es la mejor lista de celdas encontrada, o None
+                - cota es el factor de suboptimalidad garantizado (costo del camino entre
+                  la cota inferior del óptimo; 1.0 si es óptimo, infinito sin camino)
+                - optimo indica si está demostrado que el camino es óptimo (o, si camino
+                  es None, que no hay ninguno)
+    """
+    if _desconectados(componentes, inicio, meta, estadisticas):
+        return None, 0, float("inf"), True
+
+    return _a_estrella_anytime(grafo.__getitem__, inicio, meta, funcion_heuristica, plazo, max_expansiones,
+                               peso, decremento, estadisticas)
+
+
+@registrar_fase("busqueda")
+def a_estrella_macro_anytime(macro_grafo, inicio, meta, plazo=None, max_expansiones=None,
+                             funcion_heuristica=heuristica, peso=PESO_ANYTIME, decremento=DECREMENTO_PESO,
+                             componentes=None, estadisticas=None):
+    """Implementación de A* ponderado anytime con plazo sobre el macro-grafo
+
+    Args:
+        macro_grafo (dict): Macro-grafo {nodo_decision: [(vecino, peso), ...]}
+        inicio (tuple): Coordenada del punto de inicio
+        meta (tuple): Coordenada del punto de meta
+        plazo (float, optional): Segundos disponibles para la búsqueda
+        max_expansiones (int, optional): Número máximo de nodos expandidos
+        funcion_heuristica (callable, optional): Heurística admisible (nodo, meta) → int
+        peso (float, optional): Peso inicial de la heurística (≥ 1)
+        decremento (float, optional): Cuánto baja el peso con cada solución nueva
+        componentes (IndiceComponentes, optional): Índice de componentes conexas; si inicio y
+            meta están en componentes distintas se regresa sin solución sin buscar (sin el
+            índice no hay salida temprana: se explora toda la componente del inicio)
+        estadisticas (Estadisticas, optional): Objeto donde se acumulan los contadores y tiempos
+
+    Returns:
+        tuple: (ruta_compacta, nodos_expandidos, cota, optimo), como a_estrella_anytime
+    """
+    if _desconectados(componentes, inicio, meta, estadisticas):
+        return None, 0, float("inf"), True
+
+    return _a_estrella_anytime(lambda nodo: macro_grafo.get(nodo, ()), inicio, meta, funcion_heuristica, plazo,
+                               max_expansiones, peso, decremento, estadisticas)
 
 
 # =========================
 # Reconstrucción de la Ruta Completa
 # =========================
-def reconstruir_ruta_completa(ruta_compacta, corredores):
+@registrar_fase("reconstruccion")
+def reconstruir_ruta_completa(ruta_compacta, corredores, perezosa=False, estadisticas=None):
     """Expande la ruta compacta (nodos de decisión) a la ruta completa,
     incluyendo todos los pasos intermedios a través de los corredores.
 
     Args:
         ruta_compacta (list): Secuencia de nodos de decisión desde inicio hasta meta
-        corredores (dict): Diccionario {(origen, destino): [pasos_intermedios]} generado por construir_macro_grafo
+        corredores (Mapping): Corredores {(origen, destino): pasos} generados por construir_macro_grafo
+        perezosa (bool, optional): Si es True regresa una RutaPerezosa, que conoce su
+            longitud y se expande solo al recorrerla (también en forma comprimida por tramos)
+        estadisticas (Estadisticas, optional): Objeto donde se suma el tiempo de la fase "reconstruccion"
 
     Returns:
-        list: Ruta completa celda a celda desde inicio hasta meta
+        list | RutaPerezosa: Ruta completa celda a celda desde inicio hasta meta
     """
     if ruta_compacta is None or len(ruta_compacta) == 0:
         return None
+    if perezosa:
+        return RutaPerezosa(ruta_compacta, corredores)
 
     # La ruta completa comienza con el primer nodo de decisión (inicio).
     ruta_completa = [ruta_compacta[0]]
@@ -352,3 +1004,434 @@ def reconstruir_ruta_completa(ruta_compacta, corredores):
         ruta_completa.extend(pasos)
 
     return ruta_completa
+
+
+# =========================
+# Búsquedas bidireccionales
+# =========================
+def _unir_caminos(vino_de_inicio, vino_de_meta, encuentro, inicio, meta):
+    """Une el camino inicio → encuentro con el camino encuentro → meta."""
+    if encuentro is None:
+        return None
+
+    camino = reconstruir_camino(vino_de_inicio, inicio, encuentro)
+    nodo = vino_de_meta[encuentro]
+    while nodo is not None:
+        camino.append(nodo)
+        nodo = vino_de_meta[nodo]
+
+    return camino
+
+
+@registrar_fase("busqueda")
+def bfs_bidireccional(grafo, inicio, meta, componentes=None, estadisticas=None):
+    """Implementación de BFS bidireccional: avanza por capas desde el inicio y desde la meta,
+    expandiendo siempre la frontera más pequeña, hasta que ambas búsquedas se encuentran.
+
+    Al encontrarse las búsquedas se termina la capa en curso y se elige el punto de
+    encuentro con menor distancia total, lo que garantiza el camino más corto.
+
+    Args:
+        grafo (dict | GrafoMalla): Grafo representado como un diccionario de adyacencia
+        inicio (tuple): Punto de inicio en el grafo
+        meta (tuple): Punto de meta en el grafo
+        componentes (IndiceComponentes, optional): Índice de componentes conexas; si inicio y
+            meta están en componentes distintas se regresa sin solución sin buscar (sin el
+            índice no hay salida temprana: se explora toda la componente del inicio)
+        estadisticas (Estadisticas, optional): Objeto donde se acumulan los contadores y tiempos
+
+    Returns:
+        tuple: (camino, nodos_expandidos, nodos_generados), igual que bfs
+    """
+    if _desconectados(componentes, inicio, meta, estadisticas):
+        return None, 0, 0
+
+    if inicio == meta:
+        if estadisticas is not None:
+            estadisticas.registrar_busqueda(1, 1, 0, 1)
+        return [inicio], 1, 1
+
+    # vino_de[lado] guarda los predecesores (y sirve como visitados) y distancia[lado] las distancias.
+    vino_de = ({inicio: None}, {meta: None})
+    distancia = ({inicio: 0}, {meta: 0})
+    fronteras = ([inicio], [meta])
+    nodos_expandidos = 0
+    nodos_generados = 2
+    frontera_maxima = 0
+    al_expandir = estadisticas.al_expandir if estadisticas is not None else None
+    camino = None
+
+    while fronteras[0] and fronteras[1]:
+        frontera_maxima = max(frontera_maxima, len(fronteras[0]) + len(fronteras[1]))
+        lado = 0 if len(fronteras[0]) <= len(fronteras[1]) else 1
+        propios, ajenos = vino_de[lado], vino_de[1 - lado]
+        distancia_ajena = distancia[1 - lado]
+        profundidad = distancia[lado][fronteras[lado][0]] + 1
+
+        mejor = None
+        encuentro = None
+        siguiente = []
+
+        for nodo in fronteras[lado]:
+            nodos_expandidos += 1
+            if al_expandir is not None:
+                al_expandir(nodo)
+            for vecino, _ in grafo[nodo]:
+                if vecino in propios:
+                    continue
+                propios[vecino] = nodo
+                distancia[lado][vecino] = profundidad
+                siguiente.append(vecino)
+                nodos_generados += 1
+
+                if vecino in ajenos:
+                    total = profundidad + distancia_ajena[vecino]
+                    if mejor is None or total < mejor:
+                        mejor = total
+                        encuentro = vecino
+
+        fronteras[lado][:] = siguiente
+
+        if encuentro is not None:
+            camino = _unir_caminos(vino_de[0], vino_de[1], encuentro, inicio, meta)
+            break
+
+    if estadisticas is not None:
+        estadisticas.registrar_busqueda(nodos_expandidos, nodos_generados, 0, frontera_maxima)
+
+    return camino, nodos_expandidos, nodos_generados
+
+
+def _predecesores(grafo, nodo):
+    """Aristas que llegan a un nodo de un grafo cuyas conexiones existen en ambos sentidos,
+    aunque con pesos posiblemente distintos: [(origen, peso de origen → nodo), ...]."""
+    aristas = []
+    for origen, _ in grafo.get(nodo, ()):
+        peso = min((p for destino, p in grafo.get(origen, ()) if destino == nodo), default=None)
+        if peso is not None:
+            aristas.append((origen, peso))
+    return aristas
+
+
+def _a_estrella_bidireccional(vecinos, inicio, meta, funcion_heuristica=heuristica, estadisticas=None,
+                              predecesores=None, costo_nodo=None):
+    """A* bidireccional sobre un grafo cuyas conexiones existen en ambos sentidos.
+
+    Cada lado usa como heurística la distancia a su propio objetivo y se expande el lado
+    cuyo mínimo f es menor. Cada vez que un lado relaja un nodo ya alcanzado por el otro
+    se actualiza el mejor costo conocido mu. La búsqueda termina cuando el mínimo f de
+    alguno de los lados es mayor o igual que mu: como la heurística es consistente, todo
+    camino que pase por esa frontera cuesta al menos ese mínimo, así que mu es óptimo.
+
+    El lado de atrás necesita una cota de d(inicio → v), pero funcion_heuristica(v, inicio)
+    acota d(v → inicio). Con terreno ambas difieren: un camino y su inverso entran a las
+    mismas celdas salvo los extremos, así que d(inicio → v) = d(v → inicio) + c(v) - c(inicio),
+    y esa corrección se suma a la heurística de atrás cuando se recibe costo_nodo.
+
+    Args:
+        vecinos (callable): Función nodo → [(vecino, peso), ...]
+        inicio (tuple): Punto de inicio en el grafo
+        meta (tuple): Punto de meta en el grafo
+        funcion_heuristica (callable, optional): Heurística consistente (nodo, objetivo) → int
+        estadisticas (Estadisticas, optional): Objeto donde se acumulan los contadores
+        predecesores (callable, optional): Función nodo → [(origen, peso de origen → nodo), ...]
+            para la búsqueda hacia atrás; por defecto vecinos (pesos iguales en ambos sentidos)
+        costo_nodo (callable, optional): Función nodo → costo de entrar al nodo, para corregir
+            la heurística de atrás; por defecto no se corrige (todas las celdas cuestan lo mismo)
+
+    Returns:
+        tuple: (camino, nodos_expandidos)
+    """
+    objetivos = (meta, inicio)
+    aristas = (vecinos, predecesores or vecinos)
+    if costo_nodo is None:
+        heuristicas = (funcion_heuristica, funcion_heuristica)
+    else:
+        costo_inicio = costo_nodo(inicio)
+        heuristicas = (funcion_heuristica,
+                       lambda nodo, objetivo: funcion_heuristica(nodo, objetivo) + costo_nodo(nodo) - costo_inicio)
+    colas = ([(heuristicas[0](inicio, meta), inicio)], [(heuristicas[1](meta, inicio), meta)])
+    costo_g = ({inicio: 0}, {meta: 0})
+    vino_de = ({inicio: None}, {meta: None})
+    cerrados = (set(), set())
+    nodos_expandidos = 0
+    nodos_generados = 2
+    extracciones_obsoletas = 0
+    frontera_maxima = 0
+    al_expandir = estadisticas.al_expandir if estadisticas is not None else None
+
+    mu = 0 if inicio == meta else float("inf")
+    encuentro = inicio if inicio == meta else None
+
+    while colas[0] and colas[1]:
+        if len(colas[0]) + len(colas[1]) > frontera_maxima:
+            frontera_maxima = len(colas[0]) + len(colas[1])
+
+        # Descartar entradas obsoletas para que el tope de cada cola sea su mínimo f real.
+        for lado in (0, 1):
+            cola = colas[lado]
+            while cola and cola[0][1] in cerrados[lado]:
+                heapq.heappop(cola)
+                extracciones_obsoletas += 1
+        if not colas[0] or not colas[1]:
+            break
+
+        if max(colas[0][0][0], colas[1][0][0]) >= mu:
+            break
+
+        lado = 0 if colas[0][0][0] <= colas[1][0][0] else 1
+        _, actual = heapq.heappop(colas[lado])
+        cerrados[lado].add(actual)
+        nodos_expandidos += 1
+        if al_expandir is not None:
+            al_expandir(actual)
+
+        propios, ajenos = costo_g[lado], costo_g[1 - lado]
+        for vecino, peso in aristas[lado](actual):
+            nuevo_costo = propios[actual] + peso
+
+            if vecino not in propios or nuevo_costo < propios[vecino]:
+                propios[vecino] = nuevo_costo
+                vino_de[lado][vecino] = actual
+                heapq.heappush(colas[lado], (nuevo_costo + heuristicas[lado](vecino, objetivos[lado]), vecino))
+                nodos_generados += 1
+
+            if vecino in ajenos and propios[vecino] + ajenos[vecino] < mu:
+                mu = propios[vecino] + ajenos[vecino]
+                encuentro = vecino
+
+    if estadisticas is not None:
+        estadisticas.registrar_busqueda(nodos_expandidos, nodos_generados, extracciones_obsoletas, frontera_maxima)
+
+    return _unir_caminos(vino_de[0], vino_de[1], encuentro, inicio, meta), nodos_expandidos
+
+
+@registrar_fase("busqueda")
+def a_estrella_bidireccional(grafo, inicio, meta, funcion_heuristica=heuristica, componentes=None,
+                             estadisticas=None):
+    """Implementación de A* bidireccional (paso a paso) sobre el grafo del laberinto
+
+    Args:
+        grafo (dict | GrafoMalla): Grafo representado como un diccionario de adyacencia
+        inicio (tuple): Punto de inicio en el grafo
+        meta (tuple): Punto de meta en el grafo
+        funcion_heuristica (callable, optional): Heurística (nodo, objetivo) → int
+        componentes (IndiceComponentes, optional): Índice de componentes conexas; si inicio y
+            meta están en componentes distintas se regresa sin solución sin buscar (sin el
+            índice no hay salida temprana: se explora toda la componente del inicio)
+        estadisticas (Estadisticas, optional): Objeto donde se acumulan los contadores y tiempos
+
+    Returns:
+        tuple: (camino, nodos_expandidos), igual que a_estrella
+    """
+    if _desconectados(componentes, inicio, meta, estadisticas):
+        return None, 0
+
+    # La búsqueda hacia atrás recorre las aristas al revés, que con terreno pesan distinto.
+    if isinstance(grafo, GrafoMalla):
+        predecesores = grafo.predecesores if grafo.costos is not None else None
+        costo_nodo = grafo.costo if grafo.costos is not None else None
+    else:
+        predecesores = partial(_predecesores, grafo)
+        costo_nodo = partial(costo_entrada, grafo)
+    return _a_estrella_bidireccional(grafo.__getitem__, inicio, meta, funcion_heuristica, estadisticas,
+                                     predecesores, costo_nodo)
+
+
+@registrar_fase("busqueda")
+def a_estrella_macro_bidireccional(macro_grafo, inicio, meta, funcion_heuristica=heuristica, componentes=None,
+                                   costo_nodo=None, estadisticas=None):
+    """Implementación de A* bidireccional sobre el macro-grafo
+
+    El macro-grafo no guarda el costo de cada celda, y con terreno la búsqueda hacia atrás
+    lo necesita para corregir una heurística que no es simétrica. Si no se pasa costo_nodo
+    y la heurística es un método de un objeto con costo(nodo), como Landmarks.heuristica,
+    se usa ese costo. La distancia Manhattan no necesita corrección.
+
+    Args:
+        macro_grafo (dict): Macro-grafo {nodo_decision: [(vecino, peso), ...]}
+        inicio (tuple): Coordenada del punto de inicio
+        meta (tuple): Coordenada del punto de meta
+        funcion_heuristica (callable, optional): Heurística (nodo, objetivo) → int
+        componentes (IndiceComponentes, optional): Índice de componentes conexas; si inicio y
+            meta están en componentes distintas se regresa sin solución sin buscar (sin el
+            índice no hay salida temprana: se explora toda la componente del inicio)
+        costo_nodo (callable, optional): Función celda → costo de entrar a ella en el laberinto
+            (por ejemplo partial(costo_entrada, grafo)), para corregir la heurística de atrás;
+            por defecto el costo(nodo) del objeto de la heurística, si lo tiene
+        estadisticas (Estadisticas, optional): Objeto donde se acumulan los contadores y tiempos
+
+    Returns:
+        tuple: (ruta_compacta, nodos_expandidos), igual que a_estrella_macro
+    """
+    if _desconectados(componentes, inicio, meta, estadisticas):
+        return None, 0
+
+    if costo_nodo is None:
+        costo_nodo = getattr(getattr(funcion_heuristica, "__self__", None), "costo", None)
+
+    return _a_estrella_bidireccional(lambda nodo: macro_grafo.get(nodo, []), inicio, meta,
+                                     funcion_heuristica, estadisticas, partial(_predecesores, macro_grafo),
+                                     costo_nodo)
+
+
+# =========================
+# Jump Point Search (malla 4-conexa)
+# =========================
+def _saltar(libre, nodo, paso, meta, ancho):
+    """Avanza en línea recta desde nodo hasta el siguiente punto de salto.
+
+    En movimiento horizontal, una celda es punto de salto si tiene un vecino vertical libre
+    cuya celda anterior (en la dirección del movimiento) está bloqueada: ahí aparece un
+    camino que no se podía tomar antes. En movimiento vertical se aplica la misma regla
+    con los vecinos horizontales y, además, la celda es punto de salto si desde ella un
+    salto horizontal encuentra otro punto de salto.
+
+    Args:
+        libre (bytearray): Celdas libres de la malla con un borde de paredes
+        nodo (int): Identificador de la celda de partida
+        paso (int): Desplazamiento del movimiento (±1 horizontal, ±ancho vertical)
+        meta (int): Identificador de la meta
+        ancho (int): Número de columnas de la malla con borde
+
+    Returns:
+        int: Identificador del punto de salto, o None si se llega a una pared
+    """
+    horizontal = paso == 1 or paso == -1
+    lateral = ancho if horizontal else 1
+
+    while True:
+        nodo += paso
+        if not libre[nodo]:
+            return None
+        if nodo == meta:
+            return nodo
+
+        atras = nodo - paso
+        if ((libre[nodo - lateral] and not libre[atras - lateral]) or
+                (libre[nodo + lateral] and not libre[atras + lateral])):
+            return nodo
+
+        if not horizontal:
+            if (_saltar(libre, nodo, 1, meta, ancho) is not None or
+                    _saltar(libre, nodo, -1, meta, ancho) is not None):
+                return nodo
+
+
+@registrar_fase("busqueda")
+def jps(laberinto, N, inicio, meta, componentes=None, estadisticas=None):
+    """Implementación de Jump Point Search para la malla 4-conexa de costo uniforme
+
+    Trabaja directamente sobre la matriz del laberinto, sin construir el grafo. A* solo
+    expande puntos de salto: las celdas intermedias de cada tramo recto se saltan, tanto
+    en los corredores como en las habitaciones abiertas. Los saltos suponen que todos los
+    pasos cuestan lo mismo, así que no admite terreno.
+
+    Args:
+        laberinto (List | np.ndarray): Matriz que representa el laberinto (puede ser rectangular)
+        N (int): Número de filas del laberinto (None para todas)
+        inicio (tuple): Punto de inicio en el laberinto
+        meta (tuple): Punto de meta en el laberinto
+        componentes (IndiceComponentes, optional): Índice de componentes conexas; si inicio y
+            meta están en componentes distintas se regresa sin solución sin buscar (sin el
+            índice no hay salida temprana: se explora toda la componente del inicio)
+        estadisticas (Estadisticas, optional): Objeto donde se acumulan los contadores y tiempos
+
+    Returns:
+        tuple: (camino, nodos_expandidos) donde camino es la lista de celdas
+                y nodos_expandidos es el contador de puntos de salto expandidos
+    """
+    if _desconectados(componentes, inicio, meta, estadisticas):
+        return None, 0
+
+    # Malla con un borde de paredes para no revisar límites en cada paso.
+    filas, columnas = dimensiones(laberinto, N)
+    ancho = columnas + 2
+    valores = np.asarray(laberinto)[:filas, :columnas]
+    if (valores >= VALOR_MINIMO_TERRENO).any():
+        raise ValueError("jps solo admite mallas de costo uniforme (sin terreno)")
+    libre = bytearray(np.pad(valores != 1, 1).astype(np.uint8).tobytes())
+
+    def celda(nodo):
+        i, j = divmod(nodo, ancho)
+        return i - 1, j - 1
+
+    def h(nodo):
+        return heuristica(celda(nodo), meta)
+
+    origen = (inicio[0] + 1) * ancho + inicio[1] + 1
+    destino = (meta[0] + 1) * ancho + meta[1] + 1
+    if not libre[origen] or not libre[destino]:
+        if estadisticas is not None:
+            estadisticas.registrar_busqueda(0, 0, 0, 0)
+        return None, 0
+
+    cola_prioridad = [(h(origen), origen)]
+    costo_g = {origen: 0}
+    vino_de = {origen: None}
+    cerrados = set()
+    nodos_expandidos = 0
+    nodos_generados = 1
+    extracciones_obsoletas = 0
+    frontera_maxima = 0
+    al_expandir = estadisticas.al_expandir if estadisticas is not None else None
+
+    while cola_prioridad:
+        if len(cola_prioridad) > frontera_maxima:
+            frontera_maxima = len(cola_prioridad)
+        _, actual = heapq.heappop(cola_prioridad)
+        if actual in cerrados:
+            extracciones_obsoletas += 1
+            continue
+        cerrados.add(actual)
+        nodos_expandidos += 1
+        if al_expandir is not None:
+            al_expandir(celda(actual))
+
+        if actual == destino:
+            break
+
+        # Direcciones a explorar: todas desde el origen; desde un punto de salto, las dos
+        # perpendiculares a la dirección de llegada y la de avance (nunca hacia atrás).
+        padre = vino_de[actual]
+        if padre is None:
+            pasos = (-ancho, ancho, -1, 1)
+        else:
+            diferencia = actual - padre
+            if abs(diferencia) < ancho:
+                avance = 1 if diferencia > 0 else -1
+                pasos = (-ancho, ancho, avance)
+            else:
+                avance = ancho if diferencia > 0 else -ancho
+                pasos = (-1, 1, avance)
+
+        for paso in pasos:
+            if not libre[actual + paso]:
+                continue
+            salto = _saltar(libre, actual, paso, destino, ancho)
+            if salto is None or salto in cerrados:
+                continue
+
+            # El tramo es recto, así que su costo es la distancia en filas o columnas.
+            distancia = abs(salto - actual) // ancho if abs(paso) == ancho else abs(salto - actual)
+            nuevo_costo = costo_g[actual] + distancia
+            if salto not in costo_g or nuevo_costo < costo_g[salto]:
+                costo_g[salto] = nuevo_costo
+                vino_de[salto] = actual
+                heapq.heappush(cola_prioridad, (nuevo_costo + h(salto), salto))
+                nodos_generados += 1
+
+    if estadisticas is not None:
+        estadisticas.registrar_busqueda(nodos_expandidos, nodos_generados, extracciones_obsoletas, frontera_maxima)
+
+    saltos = reconstruir_camino(vino_de, origen, destino)
+    if saltos is None:
+        return None, nodos_expandidos
+
+    # Expandir cada tramo recto entre puntos de salto a sus celdas.
+    camino = [celda(saltos[0])]
+    for desde, hasta in zip(saltos, saltos[1:]):
+        paso = (1 if hasta > desde else -1) * (1 if abs(hasta - desde) < ancho else ancho)
+        camino.extend(celda(nodo) for nodo in range(desde + paso, hasta + paso, paso))
+
+    return camino, nodos_expandidos
@@ -0,0 +1,352 @@
+# benchmark.py
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from functools import partial
+
+import numpy as np
+
+from estadisticas import Estadisticas
+from generador import TIPOS, agregar_terreno, generar_laberinto
+from grafo import encontrar_puntos, matriz_a_grafo_compacto
+from componentes import IndiceComponentes
+from jerarquico import construir_abstraccion
+from algoritmos import (
+    dfs, bfs,
+    a_estrella,
+    a_estrella_macro,
+    dijkstra,
+    construir_macro_grafo,
+    reconstruir_ruta_completa
+)
+
+TAMANOS = (25, 101, 501, 2001)
+
+# Tolerancias por defecto para marcar una regresión al comparar con la línea base.
+TOLERANCIA_TIEMPO = 0.10
+TOLERANCIA_MEMORIA = 0.10
+# Por debajo de este tiempo el ruido de la medición domina y no se marcan regresiones de tiempo.
+PISO_SEGUNDOS = 0.002
+
+# Arranque en frío: main.py resolviendo el laberinto de ejemplo sin imprimir ni dibujar.
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+COMANDO_ARRANQUE = ("main.py", "laberinto.txt", "-a", "a_estrella", "-f", "ninguno")
+
+
+def _macro(grafo, inicio, meta, componentes=None, estadisticas=None):
+    """Tubería completa del macro-grafo: construcción, búsqueda y reconstrucción de la ruta."""
+    macro_grafo, _, corredores = construir_macro_grafo(grafo, inicio, meta, estadisticas=estadisticas)
+    ruta_compacta, nodos_expandidos = a_estrella_macro(macro_grafo, inicio, meta, componentes=componentes,
+                                                       estadisticas=estadisticas)
+    return reconstruir_ruta_completa(ruta_compacta, corredores, estadisticas=estadisticas), nodos_expandidos
+
+
+def _jerarquico(grafo, inicio, meta, componentes=None, estadisticas=None):
+    """Tubería completa de HPA*: construcción de la abstracción, búsqueda y refinamiento."""
+    abstraccion = construir_abstraccion(grafo, estadisticas=estadisticas)
+    return abstraccion.consultar(inicio, meta, componentes=componentes, estadisticas=estadisticas)
+
+
+# Cada algoritmo recibe (grafo, inicio, meta, componentes, estadisticas) y regresa (camino, nodos_expandidos).
+ALGORITMOS = {
+    "dfs": lambda grafo, inicio, meta, componentes=None, estadisticas=None:
+        dfs(grafo, inicio, meta, componentes=componentes, estadisticas=estadisticas)[:2],
+    "bfs": lambda grafo, inicio, meta, componentes=None, estadisticas=None:
+        bfs(grafo, inicio, meta, componentes=componentes, estadisticas=estadisticas)[:2],
+    "a_estrella": a_estrella,
+    "a_estrella_indexado": partial(a_estrella, indexado=True),
+    "a_estrella_cubetas": partial(a_estrella, cubetas=True),
+    "dijkstra": dijkstra,
+    "macro": _macro,
+    "jerarquico": _jerarquico,
+}
+
+# Algoritmos que rechazan el terreno (ValueError) y se omiten en los casos con terreno;
+# BFS y DFS sí corren, pero ignoran los costos.
+SOLO_COSTO_UNIFORME = frozenset({"jerarquico"})
+
+
+# Función para medir tiempo y memoria de una llamada.
+def medir(funcion, *args, repeticiones=3):
+    """Función que mide el tiempo, el pico de memoria y las estadísticas de una función
+
+    El tiempo es el mínimo de varias repeticiones sin tracemalloc (que frena la
+    ejecución); el pico de memoria se mide en una ejecución aparte con tracemalloc.
+    La función debe aceptar el argumento `estadisticas`; se regresan las de la
+    repetición más rápida.
+
+    Args:
+        funcion (callable): Función a medir
+        *args: Argumentos de la función
+        repeticiones (int, optional): Número de repeticiones para el tiempo
+
+    Returns:
+        tuple: (segundos, memoria_pico_bytes, estadisticas, resultado de la última llamada)
+    """
+    segundos = float("inf")
+    for _ in range(repeticiones):
+        gc.collect()
+        estadisticas_repeticion = Estadisticas()
+        t = time.perf_counter()
+        resultado = funcion(*args, estadisticas=estadisticas_repeticion)
+        transcurrido = time.perf_counter() - t
+        if transcurrido < segundos:
+            segundos = transcurrido
+            estadisticas = estadisticas_repeticion
+
+    del resultado
+    gc.collect()
+    tracemalloc.start()
+    try:
+        resultado = funcion(*args)
+        _, memoria_pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return segundos, memoria_pico, estadisticas, resultado
+
+
+# Función para medir el arranque en frío.
+def medir_arranque(comando=COMANDO_ARRANQUE, repeticiones=5):
+    """Función que mide el tiempo de arranque en frío de un comando de Python
+
+    Cada repetición es un intérprete nuevo, así que el tiempo incluye el arranque de
+    Python y la carga de todos los módulos (numpy, y matplotlib si se llegara a importar
+    sin pedir dibujar), no solo la búsqueda.
+
+    Args:
+        comando (tuple, optional): Argumentos para el intérprete, relativos al directorio del proyecto
+        repeticiones (int, optional): Número de repeticiones
+
+    Returns:
+        float: Mínimo de los segundos de pared de las repeticiones
+    """
+    segundos = float("inf")
+    for _ in range(repeticiones):
+        t = time.perf_counter()
+        subprocess.run([sys.executable, *comando], cwd=DIRECTORIO, check=True, stdout=subprocess.DEVNULL)
+        segundos = min(segundos, time.perf_counter() - t)
+    return segundos
+
+
+def _metadatos():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+    }
+
+
+# Función principal del benchmark.
+def ejecutar_benchmark(tipos=TIPOS, tamanos=TAMANOS, semillas=(0,), algoritmos=tuple(ALGORITMOS),
+                       repeticiones=3, progreso=None, terreno=0, arranque=True):
+    """Función que genera los laberintos y mide cada algoritmo sobre cada uno
+
+    Args:
+        tipos (tuple, optional): Tipos de laberinto (ver generador.TIPOS)
+        tamanos (tuple, optional): Tamaños N de los laberintos
+        semillas (tuple, optional): Semillas del generador
+        algoritmos (tuple, optional): Llaves de ALGORITMOS a medir
+        repeticiones (int, optional): Repeticiones por medición de tiempo
+        progreso (callable, optional): Se llama con cada resultado en cuanto se obtiene
+        terreno (float, optional): Proporción de celdas con terreno de costo variable; los
+            algoritmos de SOLO_COSTO_UNIFORME se omiten en esos casos
+        arranque (bool, optional): Si es True agrega el caso "arranque/main.py" con el
+            tiempo de arranque en frío (ver medir_arranque)
+
+    Cada algoritmo recibe el IndiceComponentes del laberinto, así que los casos sin
+    solución miden el rechazo inmediato; sin el índice explorarían toda la componente
+    del inicio.
+
+    Returns:
+        dict: {"metadatos": {...}, "resultados": [...]} con un resultado por caso y
+              algoritmo (llaves caso, tipo, n, semilla, algoritmo, segundos,
+              memoria_pico_bytes, nodos_expandidos, longitud, costo con terreno, y los
+              contadores y tiempos por fase de Estadisticas.como_dict); el caso de
+              arranque solo tiene caso, algoritmo y segundos
+    """
+    resultados = []
+
+    for tipo in tipos:
+        for n in tamanos:
+            for semilla in semillas:
+                laberinto = generar_laberinto(n, tipo, semilla)
+                if terreno:
+                    agregar_terreno(laberinto, proporcion=terreno, semilla=semilla)
+                inicio, meta = encontrar_puntos(laberinto, n)
+                grafo = matriz_a_grafo_compacto(laberinto, n)
+                # Se construye una vez por laberinto, fuera de la medición, como el grafo.
+                componentes = IndiceComponentes(grafo)
+                caso = f"{tipo}+terreno" if terreno else tipo
+
+                for nombre in algoritmos:
+                    if terreno and nombre in SOLO_COSTO_UNIFORME:
+                        continue
+                    segundos, memoria_pico, estadisticas, (camino, nodos_expandidos) = medir(
+                        partial(ALGORITMOS[nombre], componentes=componentes), grafo, inicio, meta,
+                        repeticiones=repeticiones)
+
+                    resultado = {
+                        "caso": f"{caso}/{n}/{semilla}/{nombre}",
+                        "tipo": tipo,
+                        "n": n,
+                        "semilla": semilla,
+                        "algoritmo": nombre,
+                        "segundos": segundos,
+                        "memoria_pico_bytes": memoria_pico,
+                        "nodos_expandidos": nodos_expandidos,
+                        "longitud": len(camino) if camino else None,
+                    }
+                    if terreno:
+                        resultado["costo"] = sum(grafo.costo(c) for c in camino[1:]) if camino else None
+                    for llave, valor in estadisticas.como_dict().items():
+                        resultado.setdefault(llave, valor)
+                    resultados.append(resultado)
+                    if progreso is not None:
+                        progreso(resultado)
+
+    if arranque:
+        resultado = {"caso": "arranque/main.py", "algoritmo": "arranque",
+                     "segundos": medir_arranque(repeticiones=max(repeticiones, 3))}
+        resultados.append(resultado)
+        if progreso is not None:
+            progreso(resultado)
+
+    return {"metadatos": _metadatos(), "resultados": resultados}
+
+
+# Función para comparar contra una línea base.
+def comparar_resultados(base, nuevo, tolerancia_tiempo=TOLERANCIA_TIEMPO,
+                        tolerancia_memoria=TOLERANCIA_MEMORIA, piso_segundos=PISO_SEGUNDOS):
+    """Función que compara dos ejecuciones del benchmark caso por caso
+
+    Se marca una regresión cuando el tiempo o el pico de memoria crecen más que la
+    tolerancia relativa, cuando aumentan los nodos expandidos o cuando cambia la
+    longitud (o el costo) del camino. Los casos que solo están en una de las dos
+    ejecuciones se ignoran.
+
+    Args:
+        base (dict): Resultado de ejecutar_benchmark usado como referencia
+        nuevo (dict): Resultado de ejecutar_benchmark a evaluar
+        tolerancia_tiempo (float, optional): Aumento relativo de tiempo permitido
+        tolerancia_memoria (float, optional): Aumento relativo de memoria permitido
+        piso_segundos (float, optional): Tiempo por debajo del cual no se comparan tiempos
+
+    Returns:
+        tuple: (filas, regresiones) donde filas tiene una entrada por caso común con las
+               llaves caso, metrica, base, nuevo y cambio, y regresiones es la sublista de
+               filas marcadas
+    """
+    por_caso = {r["caso"]: r for r in base["resultados"]}
+    filas, regresiones = [], []
+
+    for r in nuevo["resultados"]:
+        b = por_caso.get(r["caso"])
+        if b is None:
+            continue
+
+        for metrica in ("segundos", "memoria_pico_bytes", "nodos_expandidos", "longitud", "costo"):
+            antes, despues = b.get(metrica), r.get(metrica)
+            if antes is None or despues is None:
+                continue
+
+            cambio = (despues - antes) / antes if antes else 0.0
+            if metrica == "segundos":
+                regresion = cambio > tolerancia_tiempo and max(antes, despues) >= piso_segundos
+            elif metrica == "memoria_pico_bytes":
+                regresion = cambio > tolerancia_memoria
+            elif metrica == "nodos_expandidos":
+                regresion = despues > antes
+            else:
+                regresion = despues != antes
+
+            fila = {"caso": r["caso"], "metrica": metrica, "base": antes, "nuevo": despues, "cambio": cambio}
+            filas.append(fila)
+            if regresion:
+                regresiones.append(fila)
+
+    return filas, regresiones
+
+
+def _imprimir_resultado(resultado):
+    if "memoria_pico_bytes" not in resultado:
+        print(f"{resultado['caso']:<28} {resultado['segundos'] * 1000:>10.2f} ms", flush=True)
+        return
+    longitud = resultado["longitud"] if resultado["longitud"] is not None else "-"
+    print(f"{resultado['caso']:<28} {resultado['segundos'] * 1000:>10.2f} ms "
+          f"{resultado['memoria_pico_bytes'] / 2**20:>9.2f} MiB "
+          f"{resultado['nodos_expandidos']:>10} exp {longitud:>8} long", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de los algoritmos de búsqueda.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    ejecutar = sub.add_parser("ejecutar", help="mide los algoritmos y guarda los resultados en JSON")
+    ejecutar.add_argument("-o", "--salida", default="benchmark.json")
+    ejecutar.add_argument("-t", "--tipos", nargs="+", choices=TIPOS, default=list(TIPOS))
+    ejecutar.add_argument("-n", "--tamanos", nargs="+", type=int, default=list(TAMANOS))
+    ejecutar.add_argument("-s", "--semillas", nargs="+", type=int, default=[0])
+    ejecutar.add_argument("-a", "--algoritmos", nargs="+", choices=list(ALGORITMOS), default=list(ALGORITMOS))
+    ejecutar.add_argument("-r", "--repeticiones", type=int, default=3)
+    ejecutar.add_argument("--terreno", type=float, default=0,
+                          help="proporción de celdas libres con terreno de costo variable")
+    ejecutar.add_argument("--sin-arranque", action="store_true",
+                          help="no mide el arranque en frío de main.py")
+    ejecutar.add_argument("--base", help="compara al terminar contra esta línea base")
+
+    comparar = sub.add_parser("comparar", help="compara dos ejecuciones y marca las regresiones")
+    comparar.add_argument("base")
+    comparar.add_argument("nuevo")
+
+    for p in (ejecutar, comparar):
+        p.add_argument("--tolerancia-tiempo", type=float, default=TOLERANCIA_TIEMPO)
+        p.add_argument("--tolerancia-memoria", type=float, default=TOLERANCIA_MEMORIA)
+
+    args = parser.parse_args(argv)
+
+    if args.comando == "ejecutar":
+        nuevo = ejecutar_benchmark(args.tipos, args.tamanos, args.semillas, args.algoritmos,
+                                   args.repeticiones, progreso=_imprimir_resultado, terreno=args.terreno,
+                                   arranque=not args.sin_arranque)
+        with open(args.salida, "w") as f:
+            json.dump(nuevo, f, indent=2)
+        if args.base is None:
+            return 0
+        with open(args.base) as f:
+            base = json.load(f)
+    else:
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.nuevo) as f:
+            nuevo = json.load(f)
+
+    _, regresiones = comparar_resultados(base, nuevo, args.tolerancia_tiempo, args.tolerancia_memoria)
+
+    for fila in regresiones:
+        print(f"REGRESIÓN {fila['caso']:<28} {fila['metrica']:<20} "
+              f"{fila['base']} → {fila['nuevo']} ({fila['cambio']:+.1%})")
+    print(f"{len(regresiones)} regresiones")
+
+    # Código de salida distinto de cero para que un script o CI detecte las regresiones.
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
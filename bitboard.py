@@ -0,0 +1,180 @@
+# bitboard.py
+
+import numpy as np
+
+from estadisticas import registrar_fase
+from grafo import BIT_LIBRE, MOVIMIENTOS, GrafoMalla
+
+
+class TableroBits:
+    """Celdas libres del laberinto empaquetadas en un solo entero de Python, un bit por celda.
+
+    La celda (i, j) es el bit i * ancho + j, con ancho = columnas + 1: cada fila lleva
+    una columna de relleno en cero, así que los desplazamientos de un bit que se salen
+    de una fila caen en el relleno y la máscara de libres los borra. Expandir un
+    conjunto de celdas a sus vecinos cuesta cuatro desplazamientos, tres OR y un AND
+    sobre enteros de ~filas * columnas / 64 palabras, sin recorrer celda por celda.
+
+    Como bfs, cuenta pasos e ignora los costos del terreno.
+    """
+
+    def __init__(self, fuente):
+        """
+        Args:
+            fuente (List | np.ndarray | GrafoMalla): Matriz del laberinto o su grafo compacto
+        """
+        if isinstance(fuente, GrafoMalla):
+            self.filas, self.columnas = fuente.filas, fuente.columnas
+            libre = (fuente.mascaras.reshape(self.filas, self.columnas) & BIT_LIBRE) != 0
+        else:
+            libre = np.asarray(fuente) != 1
+            self.filas, self.columnas = libre.shape
+        self.ancho = self.columnas + 1
+
+        bits = np.packbits(np.pad(libre, ((0, 0), (0, 1))).ravel(), bitorder="little")
+        self.libre = int.from_bytes(bits.tobytes(), "little")
+        # Desplazamiento del bit de cada vecino, en el orden de MOVIMIENTOS.
+        self.desplazamientos = tuple(di * self.ancho + dj for di, dj in MOVIMIENTOS)
+
+    def bit(self, celda):
+        """Posición del bit de una celda."""
+        return celda[0] * self.ancho + celda[1]
+
+    def celda(self, bit):
+        """Celda (i, j) de la posición de un bit."""
+        return divmod(bit, self.ancho)
+
+    def es_libre(self, celda):
+        i, j = celda
+        return 0 <= i < self.filas and 0 <= j < self.columnas and self.libre >> self.bit(celda) & 1 == 1
+
+    def expandir(self, conjunto):
+        """Celdas libres vecinas de alguna celda del conjunto (un entero con un bit por celda)."""
+        ancho = self.ancho
+        return ((conjunto << 1) | (conjunto >> 1) | (conjunto << ancho) | (conjunto >> ancho)) & self.libre
+
+
+# Función de búsqueda en anchura por capas de bits.
+@registrar_fase("busqueda")
+def bfs_bits(fuente, inicio, meta, reconstruir=False, componentes=None, estadisticas=None):
+    """Búsqueda en anchura bit-paralela: cada capa del BFS se obtiene de la anterior con
+    operaciones sobre el tablero completo (TableroBits.expandir), en O(filas * columnas / 64)
+    operaciones de palabra por capa
+
+    Conviene para saber si hay solución o la longitud del camino más corto en mallas
+    grandes con caminos cortos en capas (salas y laberintos trenzados); en laberintos
+    perfectos, con decenas de miles de capas, bfs puede ser más rápido.
+
+    Para reconstruir el camino no se guardan todas las capas: se guardan puntos de
+    control (frontera y visitados) cada `intervalo` capas, y el intervalo se duplica
+    (descartando uno de cada dos puntos) cuando hay más del doble de puntos que el
+    intervalo, así que se guardan O(√distancia) tableros. Al retroceder desde la meta,
+    cada tramo entre dos puntos de control se vuelve a calcular una vez y en cada capa
+    se elige el primer vecino (en el orden de MOVIMIENTOS) visitado en la capa anterior.
+
+    Args:
+        fuente (List | np.ndarray | GrafoMalla | TableroBits): Matriz del laberinto, su
+            grafo compacto o un tablero ya empaquetado (para reutilizarlo entre consultas)
+        inicio (tuple): Punto de inicio en el laberinto
+        meta (tuple): Punto de meta en el laberinto
+        reconstruir (bool, optional): Si es True también se regresa el camino
+        componentes (IndiceComponentes, optional): Índice de componentes conexas; si inicio y
+            meta están en componentes distintas se regresa sin empaquetar ni recorrer el tablero
+            (sin el índice se recorren todas las capas alcanzables desde el inicio)
+        estadisticas (Estadisticas, optional): Objeto donde se acumulan los contadores y tiempos
+
+    Returns:
+        tuple: (distancia, camino, nodos_expandidos) donde distancia es el número de pasos
+                (None si no hay camino), camino es la lista de celdas (None si no se pidió
+                o no hay camino) y nodos_expandidos es el número de celdas visitadas
+    """
+    if componentes is not None and not componentes.conectados(inicio, meta):
+        if estadisticas is not None:
+            estadisticas.registrar_busqueda(0, 0, 0, 0)
+        return None, None, 0
+
+    tablero = fuente if isinstance(fuente, TableroBits) else TableroBits(fuente)
+    if not (tablero.es_libre(inicio) and tablero.es_libre(meta)):
+        if estadisticas is not None:
+            estadisticas.registrar_busqueda(0, 0, 0, 0)
+        return None, None, 0
+
+    expandir = tablero.expandir
+    objetivo = 1 << tablero.bit(meta)
+    frontera = visitados = 1 << tablero.bit(inicio)
+    distancia = 0
+    frontera_maxima = 1
+    # Puntos de control (distancia, frontera, visitados), en múltiplos del intervalo.
+    controles = [(0, frontera, visitados)]
+    intervalo = 1
+
+    while not frontera & objetivo:
+        frontera = expandir(frontera) & ~visitados
+        if not frontera:
+            break
+        visitados |= frontera
+        distancia += 1
+        if estadisticas is not None:
+            frontera_maxima = max(frontera_maxima, frontera.bit_count())
+        if reconstruir and distancia % intervalo == 0:
+            controles.append((distancia, frontera, visitados))
+            if len(controles) > 2 * intervalo:
+                controles = controles[::2]
+                intervalo *= 2
+
+    nodos_expandidos = visitados.bit_count()
+    if estadisticas is not None:
+        estadisticas.registrar_busqueda(nodos_expandidos, nodos_expandidos, 0, frontera_maxima)
+    if not frontera:
+        return None, None, nodos_expandidos
+    if not reconstruir:
+        return distancia, None, nodos_expandidos
+
+    # Retroceso desde la meta: en la capa d se busca un vecino visitado hasta la capa d - 1
+    # (que por ser vecino está exactamente a distancia d - 1).
+    ancho = tablero.ancho
+    bit = tablero.bit(meta)
+    camino = [meta]
+    actual = distancia
+    for desde, frontera, visitados in reversed(controles):
+        if actual <= desde:
+            continue
+        capas = [visitados]
+        while desde + len(capas) < actual:
+            frontera = expandir(frontera) & ~visitados
+            visitados |= frontera
+            capas.append(visitados)
+
+        while actual > desde:
+            # Un solo desplazamiento del tablero por capa: los cuatro vecinos caen en la
+            # ventana de bits que empieza una fila arriba de la celda.
+            base = max(bit - ancho, 0)
+            ventana = capas[actual - 1 - desde] >> base
+            for desplazamiento in tablero.desplazamientos:
+                vecino = bit + desplazamiento
+                if vecino >= 0 and ventana >> (vecino - base) & 1:
+                    break
+            else:
+                raise AssertionError(f"bfs_bits: {tablero.celda(bit)} no tiene vecino en la capa {actual - 1}")
+            bit = vecino
+            camino.append(tablero.celda(bit))
+            actual -= 1
+
+    camino.reverse()
+    return distancia, camino, nodos_expandidos
+
+
+# Función que indica si el laberinto tiene solución.
+def alcanzable(fuente, inicio, meta):
+    """Función que indica si existe un camino entre inicio y meta (con bfs_bits)
+
+    Args:
+        fuente (List | np.ndarray | GrafoMalla | TableroBits): Matriz del laberinto, su grafo
+            compacto o un tablero ya empaquetado
+        inicio (tuple): Punto de inicio en el laberinto
+        meta (tuple): Punto de meta en el laberinto
+
+    Returns:
+        bool: True si la meta es alcanzable desde el inicio
+    """
+    return bfs_bits(fuente, inicio, meta)[0] is not None
@@ -0,0 +1,256 @@
+# cache_macro.py
+
+import hashlib
+import os
+import tempfile
+import zipfile
+from array import array
+
+import numpy as np
+
+from algoritmos import construir_macro_grafo, sin_recolector
+from corredores import Corredores
+
+# Directorio por defecto de la caché y tamaño máximo que puede ocupar en disco.
+DIRECTORIO_CACHE = ".cache_macro"
+LIMITE_BYTES = 256 * 1024 * 1024
+
+_EXTENSION = ".npz"
+
+
+# Función para calcular la clave de un laberinto en la caché.
+def clave_laberinto(laberinto, *parametros):
+    """Función que calcula la clave de caché de un laberinto a partir de su contenido
+
+    Args:
+        laberinto (List | np.ndarray): Matriz que representa el laberinto
+        *parametros: Valores de los que depende lo que se guarda, por ejemplo el inicio y
+            la meta del macro-grafo
+
+    Returns:
+        str: Hash hexadecimal del tipo de las celdas, las dimensiones, las celdas y los parámetros
+    """
+    matriz = np.asarray(laberinto)
+    if matriz.dtype != np.uint8:
+        # Los valores de terreno no tienen tope: solo se reducen a un byte si caben, para
+        # que el mismo laberinto en texto y en .lab comparta la clave sin truncar valores.
+        matriz = matriz.astype(np.int64, copy=False)
+        if not matriz.size or (matriz.min() >= 0 and matriz.max() <= 255):
+            matriz = matriz.astype(np.uint8)
+    matriz = np.ascontiguousarray(matriz)
+    h = hashlib.blake2b(digest_size=20)
+    h.update(matriz.dtype.str.encode())
+    h.update(np.array(matriz.shape, dtype=np.int64).tobytes())
+    h.update(repr(parametros).encode())
+    h.update(memoryview(matriz).cast("B"))
+    return h.hexdigest()
+
+
+# Función para guardar el macro-grafo en la caché.
+def guardar_macro_grafo(clave, macro_grafo, nodos_decision, corredores,
+                        directorio=DIRECTORIO_CACHE, limite_bytes=LIMITE_BYTES):
+    """Función que guarda el macro-grafo en la caché en forma de arreglos compactos
+
+    Los nodos de decisión se guardan como un arreglo de coordenadas, las aristas como
+    índices a ese arreglo con su costo, y las celdas de los corredores tal como están en
+    el búfer de Corredores (cada corredor una vez), con el tramo (inicio, fin, paso) de
+    cada arista. Después de escribir se aplica la política de desalojo.
+
+    Args:
+        clave (str): Clave calculada con clave_laberinto
+        macro_grafo (dict): Macro-grafo {nodo_decision: [(vecino, peso), ...]}
+        nodos_decision (set): Conjunto de nodos de decisión
+        corredores (Mapping): Corredores {(origen, destino): pasos}
+        directorio (str, optional): Directorio de la caché
+        limite_bytes (int, optional): Tamaño máximo de la caché en disco
+    """
+    if not isinstance(corredores, Corredores):
+        compactos = Corredores()
+        compactos.update(corredores)
+        corredores = compactos
+    tramos = corredores.tramos()
+
+    nodos = list(nodos_decision)
+    posicion = {nodo: k for k, nodo in enumerate(nodos)}
+
+    origenes, destinos, costos, rangos = [], [], [], []
+    for origen in nodos:
+        for destino, costo in macro_grafo[origen]:
+            origenes.append(posicion[origen])
+            destinos.append(posicion[destino])
+            costos.append(costo)
+            # El tramo no incluye el destino, que ya está en los nodos.
+            tramo = tramos[(origen, destino)]
+            rangos.append((tramo.start, tramo.stop, tramo.step))
+
+    guardar_arreglos(
+        clave,
+        {
+            "nodos": np.array(nodos, dtype=np.int32).reshape(-1, 2),
+            "origenes": np.array(origenes, dtype=np.int32),
+            "destinos": np.array(destinos, dtype=np.int32),
+            "costos": np.array(costos, dtype=np.int32),
+            "tramos": np.array(rangos, dtype=np.int64).reshape(-1, 3),
+            "celdas": np.frombuffer(corredores.celdas, dtype=np.int32).reshape(-1, 2),
+        },
+        directorio,
+        limite_bytes,
+    )
+
+
+# Función para cargar el macro-grafo de la caché.
+def cargar_macro_grafo(clave, directorio=DIRECTORIO_CACHE):
+    """Función que carga un macro-grafo de la caché
+
+    Args:
+        clave (str): Clave calculada con clave_laberinto
+        directorio (str, optional): Directorio de la caché
+
+    Returns:
+        tuple: (macro_grafo, nodos_decision, corredores), o None si la clave no está en la caché
+    """
+    arreglos = cargar_arreglos(clave, directorio)
+    if arreglos is None:
+        return None
+
+    with sin_recolector():
+        nodos = list(zip(arreglos["nodos"][:, 0].tolist(), arreglos["nodos"][:, 1].tolist()))
+        if "tramos" in arreglos:
+            rangos = [range(*tramo) for tramo in arreglos["tramos"].tolist()]
+        else:
+            # Formato anterior: los corredores de cada arista uno tras otro, con sus desplazamientos.
+            desplazamientos = arreglos["desplazamientos"].tolist()
+            rangos = [range(a, b) for a, b in zip(desplazamientos, desplazamientos[1:])]
+
+        macro_grafo = {nodo: [] for nodo in nodos}
+        tramos = {}
+        for o, d, costo, tramo in zip(arreglos["origenes"].tolist(), arreglos["destinos"].tolist(),
+                                      arreglos["costos"].tolist(), rangos):
+            origen, destino = nodos[o], nodos[d]
+            macro_grafo[origen].append((destino, costo))
+            tramos[(origen, destino)] = tramo
+
+    celdas = array("i", np.ascontiguousarray(arreglos["celdas"], dtype=np.int32).tobytes())
+    return macro_grafo, set(nodos), Corredores(celdas, tramos)
+
+
+# Funciones genéricas para guardar y cargar arreglos en la caché.
+def guardar_arreglos(clave, arreglos, directorio=DIRECTORIO_CACHE, limite_bytes=LIMITE_BYTES):
+    """Función que guarda un conjunto de arreglos NumPy en la caché y aplica la política de desalojo
+
+    Args:
+        clave (str): Clave de la entrada
+        arreglos (dict): Diccionario {nombre: np.ndarray}
+        directorio (str, optional): Directorio de la caché
+        limite_bytes (int, optional): Tamaño máximo de la caché en disco
+    """
+    os.makedirs(directorio, exist_ok=True)
+    # Escritura atómica: otro proceso nunca ve un archivo a medio escribir.
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            np.savez(f, **arreglos)
+        os.replace(temporal, _ruta_entrada(directorio, clave))
+    except BaseException:
+        # Sin esto, un error (disco lleno, interrupción) deja el temporal en la caché.
+        try:
+            os.unlink(temporal)
+        except OSError:
+            pass
+        raise
+
+    desalojar(directorio, limite_bytes)
+
+
+def cargar_arreglos(clave, directorio=DIRECTORIO_CACHE):
+    """Función que carga los arreglos de una entrada de la caché y la marca como usada
+
+    Args:
+        clave (str): Clave de la entrada
+        directorio (str, optional): Directorio de la caché
+
+    Returns:
+        dict: Diccionario {nombre: np.ndarray}, o None si la clave no está en la caché
+    """
+    ruta = _ruta_entrada(directorio, clave)
+    try:
+        with np.load(ruta) as datos:
+            arreglos = {nombre: datos[nombre] for nombre in datos.files}
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        # Entrada dañada (por ejemplo, truncada): se borra para que se vuelva a construir.
+        try:
+            os.unlink(ruta)
+        except OSError:
+            pass
+        return None
+
+    # Marcar la entrada como usada recientemente para la política de desalojo (LRU).
+    try:
+        os.utime(ruta)
+    except OSError:
+        pass
+
+    return arreglos
+
+
+# Función para limitar el tamaño de la caché.
+def desalojar(directorio=DIRECTORIO_CACHE, limite_bytes=LIMITE_BYTES):
+    """Función que borra las entradas usadas hace más tiempo hasta que la caché
+    ocupa como máximo limite_bytes
+
+    Args:
+        directorio (str, optional): Directorio de la caché
+        limite_bytes (int, optional): Tamaño máximo de la caché en disco
+    """
+    entradas = []
+    try:
+        with os.scandir(directorio) as it:
+            for entrada in it:
+                if entrada.name.endswith(_EXTENSION) and entrada.is_file():
+                    info = entrada.stat()
+                    entradas.append((info.st_mtime, info.st_size, entrada.path))
+    except FileNotFoundError:
+        return
+
+    total = sum(tamano for _, tamano, _ in entradas)
+    for _, tamano, ruta in sorted(entradas):
+        if total <= limite_bytes:
+            break
+        try:
+            os.remove(ruta)
+        except FileNotFoundError:
+            pass
+        total -= tamano
+
+
+# Función que construye el macro-grafo usando la caché.
+def construir_macro_grafo_en_cache(laberinto, grafo, inicio, meta,
+                                   directorio=DIRECTORIO_CACHE, limite_bytes=LIMITE_BYTES):
+    """Función que regresa el macro-grafo desde la caché, o lo construye y lo guarda
+    si el laberinto no ha sido procesado antes
+
+    Args:
+        laberinto (List | np.ndarray): Matriz que representa el laberinto
+        grafo (dict | GrafoMalla): Grafo original del laberinto
+        inicio (tuple): Coordenada del punto de inicio
+        meta (tuple): Coordenada del punto de meta
+        directorio (str, optional): Directorio de la caché
+        limite_bytes (int, optional): Tamaño máximo de la caché en disco
+
+    Returns:
+        tuple: (macro_grafo, nodos_decision, corredores), igual que construir_macro_grafo
+    """
+    clave = clave_laberinto(laberinto, inicio, meta)
+
+    resultado = cargar_macro_grafo(clave, directorio)
+    if resultado is None:
+        resultado = construir_macro_grafo(grafo, inicio, meta)
+        guardar_macro_grafo(clave, *resultado, directorio=directorio, limite_bytes=limite_bytes)
+
+    return resultado
+
+
+def _ruta_entrada(directorio, clave):
+    return os.path.join(directorio, clave + _EXTENSION)
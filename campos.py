@@ -0,0 +1,185 @@
+# campos.py
+
+import numpy as np
+
+from grafo import BIT_LIBRE, MOVIMIENTOS, GrafoMalla
+
+# Valor del campo para las celdas que no alcanzan ninguna meta (o que son pared).
+INALCANZABLE = -1
+
+
+def _libre_con_borde(fuente):
+    """Celdas libres con un borde de paredes, aplanadas, y las dimensiones de la malla."""
+    if isinstance(fuente, GrafoMalla):
+        filas, columnas = fuente.filas, fuente.columnas
+        libre = (fuente.mascaras.reshape(filas, columnas) & BIT_LIBRE) != 0
+    else:
+        libre = np.asarray(fuente) != 1
+        filas, columnas = libre.shape
+    return np.pad(libre, 1).ravel(), filas, columnas
+
+
+class CampoDistancias:
+    """Distancia exacta de cada celda a la meta más cercana, calculada una sola vez.
+
+    El campo se calcula con un BFS por frentes de onda: en cada paso todo el frente se
+    expande a la vez con operaciones sobre arreglos de índices. Después, el camino de
+    cualquier agente se obtiene por descenso voraz (en cada paso, un vecino a distancia
+    una unidad menor), y el campo sirve como heurística exacta para A*.
+
+    El campo cuenta pasos e ignora el terreno; con costos sigue siendo una heurística
+    admisible (cada paso cuesta al menos 1), pero ya no exacta.
+    """
+
+    def __init__(self, fuente, metas):
+        """
+        Args:
+            fuente (List | np.ndarray | GrafoMalla): Matriz del laberinto o su grafo compacto
+            metas (tuple | list): Una meta o una lista de metas; el frente de onda parte de
+                todas a la vez
+        """
+        if len(metas) == 2 and all(isinstance(x, (int, np.integer)) for x in metas):
+            metas = [metas]
+
+        libre, self.filas, self.columnas = _libre_con_borde(fuente)
+        ancho = self.ancho = self.columnas + 2
+        self.metas = [tuple(meta) for meta in metas]
+        self._desplazamientos = np.array([di * ancho + dj for di, dj in MOVIMIENTOS], dtype=np.int64)
+
+        distancia = np.full(len(libre), INALCANZABLE, dtype=np.int32)
+        frente = np.array([self._id(meta) for meta in self.metas if self._dentro(meta)], dtype=np.int64)
+        frente = np.unique(frente[libre[frente]])
+        distancia[frente] = 0
+
+        paso = 0
+        while len(frente):
+            paso += 1
+            candidatos = (frente[:, None] + self._desplazamientos).ravel()
+            candidatos = candidatos[libre[candidatos] & (distancia[candidatos] == INALCANZABLE)]
+            frente = np.unique(candidatos)
+            distancia[frente] = paso
+
+        self._distancia = distancia
+        # Vista de memoria: indexarla desde Python es mucho más rápido que indexar NumPy.
+        self._plano = memoryview(distancia)
+        self.pasos = paso - 1
+
+    def _id(self, celda):
+        return (celda[0] + 1) * self.ancho + celda[1] + 1
+
+    def _celda(self, k):
+        i, j = divmod(k, self.ancho)
+        return i - 1, j - 1
+
+    def _dentro(self, celda):
+        return 0 <= celda[0] < self.filas and 0 <= celda[1] < self.columnas
+
+    @property
+    def distancias(self):
+        """Matriz filas x columnas (int32) con la distancia a la meta más cercana (INALCANZABLE si no hay camino)."""
+        return self._distancia.reshape(self.filas + 2, self.ancho)[1:-1, 1:-1]
+
+    def distancia(self, celda):
+        """Distancia de una celda a la meta más cercana, o INALCANZABLE."""
+        if not self._dentro(celda):
+            return INALCANZABLE
+        return self._plano[self._id(celda)]
+
+    def heuristica(self, nodo, meta):
+        """Heurística exacta para A* hacia cualquiera de las metas del campo.
+
+        La distancia a la meta más cercana es una cota inferior (exacta si solo hay una
+        meta) de la distancia a la meta buscada, así que es admisible y consistente
+        siempre que esa meta sea una de las del campo.
+
+        Args:
+            nodo (tuple): Coordenadas del nodo actual
+            meta (tuple): Coordenadas de la meta (debe ser una de las metas del campo)
+
+        Returns:
+            float: Distancia del nodo a la meta más cercana (infinito si no la alcanza)
+        """
+        d = self._plano[self._id(nodo)]
+        return d if d >= 0 else float("inf")
+
+    def camino(self, desde):
+        """Camino más corto desde una celda hasta la meta más cercana por descenso voraz.
+
+        Args:
+            desde (tuple): Celda de partida
+
+        Returns:
+            list: Celdas desde `desde` hasta una meta, o None si no alcanza ninguna
+        """
+        if self.distancia(desde) < 0:
+            return None
+
+        plano = self._plano
+        desplazamientos = self._desplazamientos.tolist()
+        k = self._id(desde)
+        camino = [k]
+        d = plano[k]
+        while d > 0:
+            # El primer vecino (en el orden de MOVIMIENTOS) que está un paso más cerca.
+            for desplazamiento in desplazamientos:
+                if plano[k + desplazamiento] == d - 1:
+                    k += desplazamiento
+                    break
+            camino.append(k)
+            d -= 1
+
+        return [self._celda(k) for k in camino]
+
+    def caminos(self, agentes):
+        """Caminos de muchos agentes a la vez: todos descienden un paso por iteración.
+
+        Elige los mismos vecinos que camino(), así que los resultados son idénticos.
+
+        Args:
+            agentes (list): Celdas de partida de los agentes
+
+        Returns:
+            list: Un camino por agente (None para los que no alcanzan ninguna meta)
+        """
+        if not agentes:
+            return []
+
+        posiciones = np.array([self._id(a) if self._dentro(a) else 0 for a in agentes], dtype=np.int64)
+        longitudes = self._distancia[posiciones]
+        distancia = np.where(self._distancia >= 0, self._distancia, np.iinfo(np.int32).max)
+
+        historial = [posiciones]
+        for _ in range(int(longitudes.max(initial=0))):
+            vecinos = posiciones[:, None] + self._desplazamientos
+            # argmin elige el primer vecino con la distancia mínima, igual que camino().
+            eleccion = np.argmin(distancia[vecinos], axis=1)
+            siguientes = vecinos[np.arange(len(posiciones)), eleccion]
+            posiciones = np.where(self._distancia[posiciones] > 0, siguientes, posiciones)
+            historial.append(posiciones)
+
+        historial = np.stack(historial)
+        filas, columnas = np.divmod(historial, self.ancho)
+        filas -= 1
+        columnas -= 1
+
+        resultado = []
+        for a, longitud in enumerate(longitudes.tolist()):
+            if longitud < 0:
+                resultado.append(None)
+            else:
+                resultado.append(list(zip(filas[:longitud + 1, a].tolist(), columnas[:longitud + 1, a].tolist())))
+        return resultado
+
+
+# Función para calcular el campo de distancias.
+def campo_distancias(fuente, metas):
+    """Función que calcula el campo de distancias a una o varias metas
+
+    Args:
+        fuente (List | np.ndarray | GrafoMalla): Matriz del laberinto o su grafo compacto
+        metas (tuple | list): Una meta o una lista de metas
+
+    Returns:
+        CampoDistancias: Campo con las distancias, el descenso voraz y la heurística exacta
+    """
+    return CampoDistancias(fuente, metas)
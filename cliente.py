@@ -0,0 +1,167 @@
+# cliente.py
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+from servidor import RUTA_SOCKET, percentiles
+
+# Límite de una línea de respuesta (las que traen el camino completo pueden ser largas).
+LIMITE_LINEA = 64 * 1024 * 1024
+
+
+class ClienteLaberintos:
+    """Cliente del servidor de laberintos que mantiene muchas peticiones en vuelo.
+
+    Cada petición lleva un id y su respuesta se entrega al futuro que la espera, así que
+    varias corrutinas pueden consultar a la vez sobre una misma conexión.
+    """
+
+    def __init__(self, lector, escritor):
+        self._lector = lector
+        self._escritor = escritor
+        self._ids = itertools.count()
+        self._esperando = {}
+        self._recibir = asyncio.create_task(self._leer_respuestas())
+
+    @classmethod
+    async def conectar(cls, ruta_socket=RUTA_SOCKET, puerto=None):
+        """Abre una conexión con el servidor.
+
+        Args:
+            ruta_socket (str, optional): Ruta del socket Unix
+            puerto (int, optional): Si se indica, se conecta a 127.0.0.1 en ese puerto
+
+        Returns:
+            ClienteLaberintos: Cliente conectado
+        """
+        if puerto is not None:
+            lector, escritor = await asyncio.open_connection("127.0.0.1", puerto, limit=LIMITE_LINEA)
+        else:
+            lector, escritor = await asyncio.open_unix_connection(ruta_socket, limit=LIMITE_LINEA)
+        return cls(lector, escritor)
+
+    async def _leer_respuestas(self):
+        while linea := await self._lector.readline():
+            respuesta = json.loads(linea)
+            futuro = self._esperando.pop(respuesta.get("id"), None)
+            if futuro is not None and not futuro.done():
+                futuro.set_result(respuesta)
+
+        for futuro in self._esperando.values():
+            if not futuro.done():
+                futuro.set_exception(ConnectionError("el servidor cerró la conexión"))
+
+    async def pedir(self, peticion):
+        """Envía una petición y espera su respuesta.
+
+        Args:
+            peticion (dict): Petición sin id (se le asigna uno)
+
+        Returns:
+            dict: Respuesta del servidor
+        """
+        identificador = next(self._ids)
+        futuro = asyncio.get_running_loop().create_future()
+        self._esperando[identificador] = futuro
+        self._escritor.write((json.dumps({**peticion, "id": identificador}) + "\n").encode())
+        await self._escritor.drain()
+        return await futuro
+
+    async def consultar(self, laberinto, inicio, meta, plazo=None, camino=False):
+        """Consulta el camino entre inicio y meta.
+
+        Args:
+            laberinto (str): Nombre del laberinto en el servidor
+            inicio (tuple): Punto de inicio
+            meta (tuple): Punto de meta
+            plazo (float, optional): Segundos disponibles para la búsqueda (A* anytime)
+            camino (bool, optional): Si es True, la respuesta incluye el camino completo
+
+        Returns:
+            dict: Respuesta con longitud, nodos_expandidos y segundos (o error)
+        """
+        peticion = {"laberinto": laberinto, "inicio": list(inicio), "meta": list(meta), "camino": camino}
+        if plazo is not None:
+            peticion["plazo"] = plazo
+        return await self.pedir(peticion)
+
+    async def cerrar(self):
+        self._escritor.close()
+        await self._escritor.wait_closed()
+        self._recibir.cancel()
+
+
+# Función para medir el rendimiento del servidor.
+async def generar_carga(laberinto, consultas=1000, concurrencia=32, ruta_socket=RUTA_SOCKET, puerto=None,
+                        plazo=None, semilla=0):
+    """Función que envía consultas con puntos al azar y mide el rendimiento del servidor
+
+    Se mantienen `concurrencia` consultas en vuelo sobre una sola conexión; cada vez que
+    una termina se envía la siguiente.
+
+    Args:
+        laberinto (str): Nombre del laberinto en el servidor
+        consultas (int, optional): Número total de consultas
+        concurrencia (int, optional): Consultas en vuelo a la vez
+        ruta_socket (str, optional): Ruta del socket Unix
+        puerto (int, optional): Si se indica, se conecta a 127.0.0.1 en ese puerto
+        plazo (float, optional): Segundos disponibles por búsqueda (A* anytime)
+        semilla (int, optional): Semilla para elegir los puntos
+
+    Returns:
+        dict: Consultas, errores, segundos, consultas por segundo, percentiles de latencia
+              vistos por el cliente y estadísticas del servidor
+    """
+    cliente = await ClienteLaberintos.conectar(ruta_socket, puerto)
+    try:
+        muestra = await cliente.pedir({"comando": "muestra", "laberinto": laberinto,
+                                       "cantidad": 2 * consultas, "semilla": semilla})
+        if "error" in muestra:
+            raise ValueError(muestra["error"])
+        puntos = iter(zip(muestra["celdas"][::2], muestra["celdas"][1::2]))
+        latencias = []
+        errores = 0
+
+        async def trabajador():
+            nonlocal errores
+            for inicio, meta in puntos:
+                t = time.perf_counter()
+                respuesta = await cliente.consultar(laberinto, inicio, meta, plazo)
+                latencias.append(time.perf_counter() - t)
+                errores += "error" in respuesta
+
+        t = time.perf_counter()
+        await asyncio.gather(*(trabajador() for _ in range(concurrencia)))
+        segundos = time.perf_counter() - t
+
+        servidor = await cliente.pedir({"comando": "estadisticas"})
+    finally:
+        await cliente.cerrar()
+
+    return {
+        "consultas": len(latencias),
+        "errores": errores,
+        "segundos": segundos,
+        "consultas_por_segundo": len(latencias) / segundos if segundos > 0 else None,
+        "latencia": percentiles(latencias),
+        "servidor": {llave: valor for llave, valor in servidor.items() if llave not in ("id", "comando")},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cliente y generador de carga del servidor de laberintos.")
+    parser.add_argument("laberinto", help="nombre del laberinto en el servidor (archivo sin extensión)")
+    parser.add_argument("--socket", default=RUTA_SOCKET, help="ruta del socket Unix")
+    parser.add_argument("-p", "--puerto", type=int, help="conectarse a 127.0.0.1 en este puerto")
+    parser.add_argument("-n", "--consultas", type=int, default=1000)
+    parser.add_argument("-c", "--concurrencia", type=int, default=32)
+    parser.add_argument("--plazo", type=float, help="segundos por búsqueda (A* anytime)")
+    parser.add_argument("-s", "--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    resultado = asyncio.run(generar_carga(args.laberinto, args.consultas, args.concurrencia, args.socket,
+                                          args.puerto, args.plazo, args.semilla))
+    print(json.dumps(resultado, indent=2))
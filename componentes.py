@@ -0,0 +1,249 @@
+# componentes.py
+
+from collections import deque
+
+import numpy as np
+
+from grafo import BIT_LIBRE, MOVIMIENTOS, GrafoMalla
+
+# Etiqueta de las paredes y de los nodos que no están en el grafo.
+SIN_COMPONENTE = -1
+
+
+def _etiquetar_malla(grafo):
+    """Etiqueta de componente (0..k-1) de cada celda del GrafoMalla, SIN_COMPONENTE en paredes.
+
+    Unión-búsqueda vectorizada sobre las aristas de la malla: en cada ronda la raíz mayor
+    de cada arista se engancha a la menor (np.minimum.at) y después se saltan punteros
+    hasta que todas las celdas apuntan a su raíz. Las aristas ya resueltas se descartan.
+    """
+    columnas = grafo.columnas
+    mascaras = grafo.mascaras
+    # Cada arista se toma una sola vez: hacia abajo (bit 1) y hacia la derecha (bit 3).
+    abajo = np.flatnonzero(mascaras & 2)
+    derecha = np.flatnonzero(mascaras & 8)
+    u = np.concatenate((abajo, derecha))
+    v = np.concatenate((abajo + columnas, derecha + 1))
+
+    padre = np.arange(len(mascaras))
+    while len(u):
+        pu, pv = padre[u], padre[v]
+        distintas = pu != pv
+        u, v, pu, pv = u[distintas], v[distintas], pu[distintas], pv[distintas]
+        if not len(u):
+            break
+        np.minimum.at(padre, np.maximum(pu, pv), np.minimum(pu, pv))
+        while True:
+            abuelo = padre[padre]
+            if np.array_equal(abuelo, padre):
+                break
+            padre = abuelo
+
+    etiquetas = np.full(len(mascaras), SIN_COMPONENTE, dtype=np.int32)
+    libres = np.flatnonzero(mascaras & BIT_LIBRE)
+    _, etiquetas[libres] = np.unique(padre[libres], return_inverse=True)
+    return etiquetas
+
+
+def _etiquetar_diccionario(grafo):
+    """Etiqueta de componente de cada nodo de un grafo de adyacencia, con un BFS por componente."""
+    etiquetas = {}
+    siguiente = 0
+    for nodo in grafo:
+        if nodo in etiquetas:
+            continue
+        etiquetas[nodo] = siguiente
+        cola = deque([nodo])
+        while cola:
+            for vecino, _ in grafo.get(cola.popleft(), ()):
+                if vecino not in etiquetas:
+                    etiquetas[vecino] = siguiente
+                    cola.append(vecino)
+        siguiente += 1
+    return etiquetas, siguiente
+
+
+class IndiceComponentes:
+    """Componente conexa de cada nodo, para rechazar en O(1) las consultas sin solución.
+
+    Sin el índice, una búsqueda entre dos puntos desconectados explora toda la
+    componente del inicio antes de regresar None. Las búsquedas de algoritmos.py
+    reciben el índice en `componentes` y lo revisan antes de empezar.
+
+    Funciona con el GrafoMalla (una etiqueta int32 por celda), con el diccionario de
+    matriz_a_grafo y con el macro-grafo, cuyos nodos son celdas de la misma componente
+    que en la malla. Supone aristas en ambos sentidos, como todos los grafos del proyecto.
+
+    Para seguir al día cuando las celdas cambian (actualizar), las etiquetas se unen con
+    unión-búsqueda al liberar una celda, y al convertir una celda en pared se lanzan BFS
+    intercalados desde sus vecinos: los que se encuentran siguen en la misma componente y
+    los que se agotan solos son una componente nueva. El costo depende del tamaño de las
+    partes que se separan (sin contar la mayor), no del laberinto.
+    """
+
+    def __init__(self, grafo):
+        """
+        Args:
+            grafo (dict | GrafoMalla): Grafo del laberinto (o macro-grafo) a indexar
+        """
+        self.grafo = grafo
+        self._malla = isinstance(grafo, GrafoMalla)
+        if self._malla:
+            self._arreglo = _etiquetar_malla(grafo)
+            # Vista de memoria: indexarla desde Python es mucho más rápido que indexar NumPy.
+            self._etiquetas = memoryview(self._arreglo)
+            self._leer = self._etiquetas.__getitem__
+            self._vecinos = grafo.vecinos_id
+            self.numero = int(self._arreglo.max()) + 1 if len(self._arreglo) else 0
+        else:
+            self._etiquetas, self.numero = _etiquetar_diccionario(grafo)
+            self._leer = lambda nodo: self._etiquetas.get(nodo, SIN_COMPONENTE)
+            self._vecinos = lambda nodo: [vecino for vecino, _ in grafo.get(nodo, ())]
+        # Unión-búsqueda sobre las etiquetas: padre[etiqueta] (las raíces son su propio padre).
+        self._padre = list(range(self.numero))
+
+    def _clave(self, nodo):
+        """Índice del nodo en las etiquetas (id de celda en la malla), o None fuera de la malla."""
+        if not self._malla:
+            return nodo
+        i, j = nodo
+        if 0 <= i < self.grafo.filas and 0 <= j < self.grafo.columnas:
+            return i * self.grafo.columnas + j
+        return None
+
+    def _raiz(self, etiqueta):
+        padre = self._padre
+        while padre[etiqueta] != etiqueta:
+            padre[etiqueta] = padre[padre[etiqueta]]
+            etiqueta = padre[etiqueta]
+        return etiqueta
+
+    def _nueva_etiqueta(self):
+        self._padre.append(len(self._padre))
+        return len(self._padre) - 1
+
+    def componente(self, nodo):
+        """Regresa la etiqueta de la componente de un nodo (SIN_COMPONENTE si es pared o no está)."""
+        clave = self._clave(nodo)
+        etiqueta = SIN_COMPONENTE if clave is None else self._leer(clave)
+        return SIN_COMPONENTE if etiqueta == SIN_COMPONENTE else self._raiz(etiqueta)
+
+    def conectados(self, inicio, meta):
+        """Indica si existe un camino entre dos nodos (False si alguno es pared o no está en el grafo)."""
+        componente = self.componente(inicio)
+        return componente != SIN_COMPONENTE and componente == self.componente(meta)
+
+    # ─ Actualizaciones incrementales ─
+
+    def actualizar(self, celdas):
+        """Pone al día las etiquetas después de alternar celdas en el grafo (ver alternar_celda).
+
+        Primero se retiran las celdas que quedaron como pared, separando sus componentes
+        si hace falta, y después se agregan las que quedaron libres, uniendo las
+        componentes de sus vecinos.
+
+        Args:
+            celdas (iterable): Coordenadas de las celdas alternadas (el grafo ya tiene su estado nuevo)
+        """
+        retiradas, agregadas = [], []
+        for celda in set(celdas):
+            clave = self._clave(celda)
+            if clave is None:
+                continue
+            libre = celda in self.grafo
+            etiqueta = self._leer(clave)
+            if etiqueta != SIN_COMPONENTE and not libre:
+                retiradas.append((celda, clave, self._raiz(etiqueta)))
+            elif libre and etiqueta == SIN_COMPONENTE:
+                agregadas.append(clave)
+
+        # 1. Retirar: las vecinas que siguen libres son las semillas de la separación,
+        # agrupadas por la componente a la que pertenecían.
+        for _, clave, _ in retiradas:
+            self._etiquetas[clave] = SIN_COMPONENTE
+        semillas = {}
+        for celda, _, raiz in retiradas:
+            for di, dj in MOVIMIENTOS:
+                vecina = self._clave((celda[0] + di, celda[1] + dj))
+                if vecina is not None and self._leer(vecina) != SIN_COMPONENTE:
+                    semillas.setdefault(raiz, set()).add(vecina)
+        # Una componente sin semillas perdió todas sus celdas.
+        self.numero -= len({raiz for _, _, raiz in retiradas} - semillas.keys())
+        for vecinas in semillas.values():
+            if len(vecinas) > 1:
+                self._separar(list(vecinas))
+
+        # 2. Agregar: la celda nueva une las componentes de sus vecinas.
+        for clave in agregadas:
+            raices = {self._raiz(self._leer(vecina)) for vecina in self._vecinos(clave)
+                      if self._leer(vecina) != SIN_COMPONENTE}
+            if not raices:
+                self._etiquetas[clave] = self._nueva_etiqueta()
+                self.numero += 1
+                continue
+            raiz = min(raices)
+            for otra in raices - {raiz}:
+                self._padre[otra] = raiz
+            self.numero -= len(raices) - 1
+            self._etiquetas[clave] = raiz
+
+    def _separar(self, semillas):
+        """Reparte en sus partes nuevas la componente de unas semillas que quizá ya no están conectadas.
+
+        Se lanza un BFS desde cada semilla y en cada ronda cada búsqueda abierta avanza un
+        nodo. Dos búsquedas que se tocan se unen (están en la misma parte); una que se
+        agota es una parte cerrada. Al quedar a lo más una búsqueda abierta se termina: esa
+        parte (o, si todas se cerraron, la mayor) conserva la etiqueta y las demás reciben
+        una nueva, así que solo se recorren las partes que se separan.
+
+        Args:
+            semillas (list): Claves de nodos libres de una misma componente anterior
+        """
+        grupo = list(range(len(semillas)))
+        duenos = {semilla: g for g, semilla in enumerate(semillas)}
+        colas = [deque([semilla]) for semilla in semillas]
+        miembros = [[semilla] for semilla in semillas]
+        abiertas = set(range(len(semillas)))
+        cerradas = []
+
+        def raiz(g):
+            while grupo[g] != g:
+                grupo[g] = grupo[grupo[g]]
+                g = grupo[g]
+            return g
+
+        while len(abiertas) > 1:
+            for g in list(abiertas):
+                if g not in abiertas:
+                    continue
+                for vecino in self._vecinos(colas[g].popleft()):
+                    if self._leer(vecino) == SIN_COMPONENTE:
+                        continue
+                    otro = duenos.get(vecino)
+                    if otro is None:
+                        duenos[vecino] = g
+                        colas[g].append(vecino)
+                        miembros[g].append(vecino)
+                        continue
+                    otro = raiz(otro)
+                    if otro == g:
+                        continue
+                    # Las búsquedas se tocaron: la menor se une a la mayor.
+                    if len(miembros[g]) < len(miembros[otro]):
+                        g, otro = otro, g
+                    grupo[otro] = g
+                    colas[g].extend(colas[otro])
+                    miembros[g].extend(miembros[otro])
+                    colas[otro] = miembros[otro] = None
+                    abiertas.discard(otro)
+                if not colas[g]:
+                    abiertas.discard(g)
+                    cerradas.append(g)
+
+        if not abiertas:
+            cerradas.remove(max(cerradas, key=lambda g: len(miembros[g])))
+        for g in cerradas:
+            etiqueta = self._nueva_etiqueta()
+            for clave in miembros[g]:
+                self._etiquetas[clave] = etiqueta
+        self.numero += len(cerradas)
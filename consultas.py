@@ -0,0 +1,417 @@
+# consultas.py
+
+from collections import ChainMap
+from collections.abc import Mapping
+
+import numpy as np
+
+from algoritmos import (
+    heuristica,
+    construir_macro_grafo,
+    explorar_corredor,
+    explorar_aristas,
+    a_estrella_macro,
+    a_estrella_macro_anytime,
+    reconstruir_ruta_completa
+)
+from componentes import IndiceComponentes
+from contraccion import LIMITE_TESTIGOS, JerarquiaContraccion
+from grafo import (
+    MOVIMIENTOS,
+    GrafoMalla,
+    alternar_celda,
+    costo_entrada,
+    matriz_a_grafo,
+    matriz_a_grafo_compacto
+)
+
+
+class _ConTemporales:
+    """Conjunto de nodos de decisión más los nodos temporales de una consulta, sin copiar el conjunto base."""
+
+    def __init__(self, base, temporales):
+        self.base = base
+        self.temporales = temporales
+
+    def __contains__(self, nodo):
+        return nodo in self.temporales or nodo in self.base
+
+
+class _MacroGrafoConTemporales(Mapping):
+    """Vista del macro-grafo con las aristas de los nodos temporales de una consulta.
+
+    El macro-grafo base no se modifica, así que varias consultas pueden usarlo a la vez.
+    """
+
+    def __init__(self, base, extras):
+        self.base = base
+        self.extras = extras
+
+    def __getitem__(self, nodo):
+        extras = self.extras.get(nodo)
+        if extras is None:
+            return self.base[nodo]
+        return self.base.get(nodo, []) + extras
+
+    def __iter__(self):
+        yield from self.base
+        for nodo in self.extras:
+            if nodo not in self.base:
+                yield nodo
+
+    def __len__(self):
+        return len(self.base) + sum(1 for nodo in self.extras if nodo not in self.base)
+
+
+class MotorConsultas:
+    """Motor para responder muchas consultas inicio/meta sobre un mismo laberinto.
+
+    El macro-grafo se construye una sola vez sin forzar el inicio ni la meta como nodos
+    de decisión. En cada consulta, los puntos que caen dentro de un corredor se insertan
+    como nodos temporales unidos a los extremos de su corredor (o entre sí, si comparten
+    corredor); estas aristas viven en una vista aparte y se descartan al terminar.
+
+    Un índice de componentes conexas (componentes.py), que se mantiene al día al
+    alternar celdas, rechaza de inmediato las consultas entre puntos desconectados.
+    """
+
+    def __init__(self, grafo, macro=None, laberinto=None):
+        """
+        Args:
+            grafo (dict | GrafoMalla): Grafo original del laberinto
+            macro (tuple, optional): (macro_grafo, nodos_decision, corredores) ya construido
+                con inicio y meta en None, por ejemplo desde cache_macro
+            laberinto (List | np.ndarray, optional): Matriz del laberinto; si se indica, se
+                mantiene al día al alternar celdas. Una matriz de solo lectura (como la
+                memoria mapeada de un .lab) se copia
+        """
+        self.grafo = grafo
+        # El inicio y la meta del encabezado de un .lab se toman antes de copiar la matriz.
+        self._puntos = {getattr(laberinto, "inicio", None), getattr(laberinto, "meta", None)} - {None}
+        if isinstance(laberinto, np.ndarray) and not laberinto.flags.writeable:
+            laberinto = np.array(laberinto)
+        self.laberinto = laberinto
+        if macro is None:
+            macro = construir_macro_grafo(grafo, None, None)
+        self.macro_grafo, self.nodos_decision, self.corredores = macro
+        self.componentes = IndiceComponentes(grafo)
+        self.jerarquia = None
+
+    def preparar_consulta(self, inicio, meta):
+        """Inserta el inicio y la meta como nodos temporales del macro-grafo.
+
+        Args:
+            inicio (tuple): Punto de inicio de la consulta
+            meta (tuple): Punto de meta de la consulta
+
+        Returns:
+            tuple: (macro_grafo, corredores) con las vistas que incluyen los nodos temporales
+        """
+        temporales = {p for p in (inicio, meta) if p not in self.nodos_decision}
+        if not temporales:
+            return self.macro_grafo, self.corredores
+
+        # Los temporales cuentan como nodos de decisión al recorrer los corredores, así
+        # que si inicio y meta comparten corredor el recorrido se detiene en el otro punto.
+        nodos = _ConTemporales(self.nodos_decision, temporales)
+        aristas = {}
+        corredores = {}
+
+        for punto in temporales:
+            for primer_paso, peso in self.grafo[punto]:
+                destino, costo, pasos = explorar_corredor(self.grafo, punto, primer_paso, nodos, peso)
+                if destino == punto:
+                    continue
+
+                # Arista en ambos sentidos; el corredor inverso son los mismos pasos al revés,
+                # que entran a las mismas celdas salvo el destino, y entran además al punto.
+                costo_inverso = costo - costo_entrada(self.grafo, destino) + costo_entrada(self.grafo, punto)
+                for origen, fin, celdas, costo_arista in ((punto, destino, pasos, costo),
+                                                         (destino, punto, pasos[-2::-1] + [punto], costo_inverso)):
+                    if (origen, fin) not in aristas or costo_arista < aristas[(origen, fin)]:
+                        aristas[(origen, fin)] = costo_arista
+                        corredores[(origen, fin)] = celdas
+
+        extras = {}
+        for (origen, fin), costo in aristas.items():
+            extras.setdefault(origen, []).append((fin, costo))
+
+        return _MacroGrafoConTemporales(self.macro_grafo, extras), ChainMap(corredores, self.corredores)
+
+    def consultar(self, inicio, meta, funcion_heuristica=heuristica, perezosa=False, estadisticas=None):
+        """Busca el camino entre inicio y meta con A* sobre el macro-grafo compartido.
+
+        Args:
+            inicio (tuple): Punto de inicio de la consulta
+            meta (tuple): Punto de meta de la consulta
+            funcion_heuristica (callable, optional): Heurística (nodo, meta) → int
+            perezosa (bool, optional): Regresar el camino como RutaPerezosa (ver reconstruir_ruta_completa)
+            estadisticas (Estadisticas, optional): Objeto donde se acumulan los contadores y
+                los tiempos de las fases "preparacion", "busqueda" y "reconstruccion"
+
+        Returns:
+            tuple: (camino, nodos_expandidos) donde camino es la ruta completa celda a
+                    celda, o None si no hay solución o algún punto es pared
+        """
+        # Puntos en componentes distintas (o en una pared): sin solución y sin buscar.
+        if not self.componentes.conectados(inicio, meta):
+            return None, 0
+
+        if estadisticas is None:
+            macro_grafo, corredores = self.preparar_consulta(inicio, meta)
+        else:
+            with estadisticas.fase("preparacion"):
+                macro_grafo, corredores = self.preparar_consulta(inicio, meta)
+        ruta_compacta, nodos_expandidos = a_estrella_macro(macro_grafo, inicio, meta, funcion_heuristica,
+                                                           estadisticas=estadisticas)
+
+        camino = reconstruir_ruta_completa(ruta_compacta, corredores, perezosa, estadisticas=estadisticas)
+        return camino, nodos_expandidos
+
+    def consultar_con_plazo(self, inicio, meta, plazo=None, max_expansiones=None, funcion_heuristica=heuristica,
+                            perezosa=False, estadisticas=None):
+        """Busca el camino entre inicio y meta con A* anytime, sin pasarse del plazo.
+
+        Args:
+            inicio (tuple): Punto de inicio de la consulta
+            meta (tuple): Punto de meta de la consulta
+            plazo (float, optional): Segundos disponibles para la búsqueda (sin contar la
+                preparación ni la reconstrucción)
+            max_expansiones (int, optional): Número máximo de nodos expandidos
+            funcion_heuristica (callable, optional): Heurística admisible (nodo, meta) → int
+            perezosa (bool, optional): Regresar el camino como RutaPerezosa
+            estadisticas (Estadisticas, optional): Objeto donde se acumulan los contadores y tiempos
+
+        Returns:
+            tuple: (camino, nodos_expandidos, cota, optimo) como a_estrella_anytime, con el
+                    camino celda a celda
+        """
+        if not self.componentes.conectados(inicio, meta):
+            return None, 0, float("inf"), True
+
+        if estadisticas is None:
+            macro_grafo, corredores = self.preparar_consulta(inicio, meta)
+        else:
+            with estadisticas.fase("preparacion"):
+                macro_grafo, corredores = self.preparar_consulta(inicio, meta)
+        ruta_compacta, nodos_expandidos, cota, optimo = a_estrella_macro_anytime(
+            macro_grafo, inicio, meta, plazo, max_expansiones, funcion_heuristica, estadisticas=estadisticas)
+
+        camino = reconstruir_ruta_completa(ruta_compacta, corredores, perezosa, estadisticas=estadisticas)
+        return camino, nodos_expandidos, cota, optimo
+
+    # ─ Jerarquía de contracción ─
+
+    def contraer(self, limite_testigos=LIMITE_TESTIGOS):
+        """Construye la jerarquía de contracción del macro-grafo compartido.
+
+        La jerarquía no se actualiza de forma incremental: alternar_celdas la descarta y
+        hay que volver a llamar a este método.
+
+        Args:
+            limite_testigos (int, optional): Nodos asentados como máximo por búsqueda de testigos
+
+        Returns:
+            JerarquiaContraccion: La jerarquía construida
+        """
+        self.jerarquia = JerarquiaContraccion(self.macro_grafo, limite_testigos)
+        return self.jerarquia
+
+    def consultar_jerarquia(self, inicio, meta):
+        """Busca el camino entre inicio y meta con la jerarquía de contracción.
+
+        Un punto que cae dentro de un corredor no es nodo de la jerarquía: la búsqueda
+        arranca desde los extremos de su corredor con la distancia hasta ellos como costo
+        inicial, usando las aristas temporales de preparar_consulta.
+
+        Args:
+            inicio (tuple): Punto de inicio de la consulta
+            meta (tuple): Punto de meta de la consulta
+
+        Returns:
+            tuple: (camino, nodos_expandidos) igual que consultar
+        """
+        if self.jerarquia is None:
+            self.contraer()
+        if not self.componentes.conectados(inicio, meta):
+            return None, 0
+        if inicio == meta:
+            return [inicio], 0
+
+        macro_grafo, corredores = self.preparar_consulta(inicio, meta)
+        extras = macro_grafo.extras if isinstance(macro_grafo, _MacroGrafoConTemporales) else {}
+
+        semillas_inicio = [(inicio, 0)]
+        if inicio not in self.nodos_decision:
+            semillas_inicio = extras.get(inicio, [])
+        semillas_meta = [(meta, 0)]
+        if meta not in self.nodos_decision:
+            # Aristas que llegan a la meta temporal, desde los extremos de su corredor.
+            semillas_meta = [(origen, costo) for origen, aristas in extras.items()
+                             for destino, costo in aristas if destino == meta and origen != inicio]
+
+        # Si inicio y meta comparten corredor, el tramo directo es un candidato más.
+        directo = min((costo for destino, costo in extras.get(inicio, []) if destino == meta),
+                      default=float("inf"))
+
+        _, ruta, nodos_expandidos = self.jerarquia.buscar(semillas_inicio, semillas_meta, directo)
+        if ruta is None:
+            ruta = [inicio, meta] if directo < float("inf") else None
+        else:
+            if ruta[0] != inicio:
+                ruta.insert(0, inicio)
+            if ruta[-1] != meta:
+                ruta.append(meta)
+
+        return reconstruir_ruta_completa(ruta, corredores), nodos_expandidos
+
+    # ─ Actualizaciones incrementales ─
+
+    def _extremos_corredor(self, celda):
+        """Regresa los nodos de decisión en los que termina el corredor que pasa por una celda."""
+        # La celda cuenta como nodo para que un ciclo sin nodos de decisión también termine.
+        nodos = _ConTemporales(self.nodos_decision, {celda})
+        extremos = set()
+        for primer_paso, _ in self.grafo[celda]:
+            destino, _, _ = explorar_corredor(self.grafo, celda, primer_paso, nodos)
+            if destino != celda:
+                extremos.add(destino)
+        return extremos
+
+    def alternar_celdas(self, celdas):
+        """Convierte paredes en celdas libres y celdas libres en paredes, actualizando solo
+        la parte afectada de la adyacencia, los nodos de decisión, las macro-aristas y los corredores.
+
+        Solo las celdas alternadas y sus vecinas pueden cambiar de grado. Antes del cambio
+        se buscan los nodos de decisión cuyos corredores tocan esa zona; después, esos nodos
+        y los nuevos nodos de decisión vuelven a explorar sus corredores. El costo depende
+        de la longitud de los corredores afectados y no del tamaño del laberinto. El índice
+        de componentes se actualiza también (ver IndiceComponentes.actualizar).
+
+        Si se tiene la matriz, se actualiza con el mismo estado que el grafo: una celda
+        que queda libre vale 0 (sin terreno, igual que en alternar_celda) y una que queda
+        como pared vale 1. El inicio y la meta no se pueden alternar (ValueError, sin
+        cambiar nada), porque la matriz perdería su valor 2 o 3.
+
+        Args:
+            celdas (iterable): Coordenadas de las celdas a alternar
+        """
+        celdas = set(celdas)
+        if self.laberinto is not None:
+            for i, j in celdas:
+                if not (0 <= i < len(self.laberinto) and 0 <= j < len(self.laberinto[i])):
+                    raise KeyError((i, j))
+                if (i, j) in self._puntos or self.laberinto[i][j] in (2, 3):
+                    raise ValueError(f"no se puede alternar el inicio o la meta: {(i, j)}")
+        afectadas = set(celdas)
+        self.jerarquia = None
+        for i, j in celdas:
+            afectadas.update((i + dx, j + dy) for dx, dy in MOVIMIENTOS)
+
+        # 1. Nodos cuyas aristas salientes pueden cambiar, según el estado anterior.
+        revisar = set()
+        decision_antes = set()
+        for celda in afectadas:
+            if celda not in self.grafo:
+                continue
+            if celda in self.nodos_decision:
+                decision_antes.add(celda)
+                revisar.add(celda)
+                revisar.update(v for v, _ in self.macro_grafo[celda])
+            else:
+                revisar.update(self._extremos_corredor(celda))
+
+        # 2. Aplicar el cambio a la matriz (si se tiene), al grafo y a las componentes. La
+        # matriz va primero: si no se puede escribir, el grafo todavía no ha cambiado.
+        if self.laberinto is not None:
+            for i, j in celdas:
+                self.laberinto[i][j] = 1 if (i, j) in self.grafo else 0
+        for celda in celdas:
+            alternar_celda(self.grafo, celda)
+        self.componentes.actualizar(celdas)
+
+        # 3. Nuevo estado de decisión de las celdas afectadas.
+        decision_despues = {celda for celda in afectadas
+                            if celda in self.grafo and len(self.grafo[celda]) != 2}
+
+        for nodo in decision_antes - decision_despues:
+            for destino, _ in self.macro_grafo.pop(nodo):
+                self.corredores.pop((nodo, destino), None)
+            self.nodos_decision.discard(nodo)
+
+        for nodo in decision_despues - decision_antes:
+            self.nodos_decision.add(nodo)
+            self.macro_grafo[nodo] = []
+
+        # 4. Volver a explorar los corredores de los nodos afectados. Las aristas que llegan
+        # a ellos desde nodos no afectados no pasan por la zona modificada y siguen siendo válidas.
+        revisar = (revisar | decision_despues) & self.nodos_decision
+        for nodo in revisar:
+            for destino, _ in self.macro_grafo[nodo]:
+                self.corredores.pop((nodo, destino), None)
+
+            aristas = explorar_aristas(self.grafo, nodo, self.nodos_decision)
+            self.macro_grafo[nodo] = [(destino, costo) for destino, (costo, _) in aristas.items()]
+            for destino, (_, pasos) in aristas.items():
+                self.corredores[(nodo, destino)] = pasos
+
+    def verificar_consistencia(self):
+        """Compara el estado actualizado de forma incremental con una reconstrucción completa.
+
+        Entre dos nodos unidos por varios corredores de igual longitud cualquiera es válido,
+        así que los corredores se comparan por longitud y por ser caminos válidos.
+
+        Returns:
+            list: Descripción de cada diferencia encontrada (vacía si todo coincide)
+        """
+        errores = []
+
+        if self.laberinto is not None:
+            n = len(self.laberinto)
+            if isinstance(self.grafo, GrafoMalla):
+                grafo_completo = matriz_a_grafo_compacto(self.laberinto, n)
+            else:
+                grafo_completo = matriz_a_grafo(self.laberinto, n)
+            if dict(grafo_completo) != dict(self.grafo):
+                errores.append("La adyacencia no coincide con la matriz del laberinto")
+
+        # Las etiquetas pueden diferir; lo que debe coincidir es la partición en componentes.
+        componentes = IndiceComponentes(self.grafo)
+        equivalencia = {}
+        for nodo in self.grafo:
+            par = (self.componentes.componente(nodo), componentes.componente(nodo))
+            if equivalencia.setdefault(par[0], par[1]) != par[1]:
+                errores.append(f"Componentes: {nodo} está en una componente distinta a la esperada")
+                break
+        if len(set(equivalencia.values())) != len(equivalencia) or self.componentes.numero != componentes.numero:
+            errores.append(f"Componentes: {self.componentes.numero} en lugar de {componentes.numero}")
+
+        macro_grafo, nodos_decision, corredores = construir_macro_grafo(self.grafo, None, None)
+
+        if nodos_decision != self.nodos_decision:
+            errores.append(f"Nodos de decisión: sobran {sorted(self.nodos_decision - nodos_decision)}, "
+                           f"faltan {sorted(nodos_decision - self.nodos_decision)}")
+
+        for nodo in nodos_decision & self.nodos_decision:
+            if sorted(macro_grafo[nodo]) != sorted(self.macro_grafo[nodo]):
+                errores.append(f"Macro-aristas de {nodo}: {sorted(self.macro_grafo[nodo])} "
+                               f"en lugar de {sorted(macro_grafo[nodo])}")
+
+        if corredores.keys() != self.corredores.keys():
+            errores.append(f"Corredores: sobran {sorted(self.corredores.keys() - corredores.keys())}, "
+                           f"faltan {sorted(corredores.keys() - self.corredores.keys())}")
+
+        for (origen, destino), pasos in self.corredores.items():
+            anterior = origen
+            for celda in pasos:
+                if celda not in {v for v, _ in self.grafo.get(anterior, [])}:
+                    errores.append(f"Corredor {(origen, destino)}: paso inválido {anterior} → {celda}")
+                    break
+                anterior = celda
+            if anterior != destino:
+                errores.append(f"Corredor {(origen, destino)}: termina en {anterior}")
+            esperado = corredores.get((origen, destino))
+            if esperado is not None and len(esperado) != len(pasos):
+                errores.append(f"Corredor {(origen, destino)}: longitud {len(pasos)} en lugar de {len(esperado)}")
+
+        return errores
@@ -0,0 +1,308 @@
+# contraccion.py
+
+import heapq
+import time
+
+from algoritmos import a_estrella_macro, reconstruir_ruta_completa
+
+# Nodos que puede asentar como máximo una búsqueda de testigos al contraer un nodo.
+# Un límite bajo acelera el preprocesamiento a cambio de algunos atajos innecesarios
+# (que no afectan la exactitud de las consultas).
+LIMITE_TESTIGOS = 64
+
+
+class JerarquiaContraccion:
+    """Jerarquía de contracción (contraction hierarchy) sobre el macro-grafo.
+
+    Los nodos se contraen de uno en uno en el orden de su diferencia de aristas (atajos
+    que habría que agregar menos aristas que se eliminan, más los vecinos ya contraídos).
+    Al contraer v, para cada par u → v → w sin un camino testigo igual de corto que evite
+    v se agrega el atajo u → w. Una consulta es un Dijkstra bidireccional que solo sube
+    de rango, y cada atajo se desempaca recursivamente en sus dos mitades hasta llegar a
+    macro-aristas, cuyas celdas están en `corredores`.
+
+    Las aristas son dirigidas: el macro-grafo puede tener costos distintos en cada sentido.
+    """
+
+    def __init__(self, macro_grafo, limite_testigos=LIMITE_TESTIGOS):
+        """
+        Args:
+            macro_grafo (dict): Macro-grafo {nodo_decision: [(vecino, peso), ...]}
+            limite_testigos (int, optional): Nodos asentados como máximo por búsqueda de testigos
+        """
+        t = time.perf_counter()
+        self.limite_testigos = limite_testigos
+
+        # Identificadores enteros para los nodos (incluidos los que solo aparecen como destino).
+        self.nodos = list(macro_grafo)
+        self.indice = {nodo: k for k, nodo in enumerate(self.nodos)}
+        for aristas in macro_grafo.values():
+            for destino, _ in aristas:
+                if destino not in self.indice:
+                    self.indice[destino] = len(self.nodos)
+                    self.nodos.append(destino)
+
+        n = len(self.nodos)
+        salidas = [{} for _ in range(n)]
+        entradas = [{} for _ in range(n)]
+        for origen, aristas in macro_grafo.items():
+            u = self.indice[origen]
+            for destino, peso in aristas:
+                w = self.indice[destino]
+                if u != w and peso < salidas[u].get(w, float("inf")):
+                    salidas[u][w] = peso
+                    entradas[w][u] = peso
+
+        # medio[(u, w)] = v si la arista u → w es un atajo que pasa por v.
+        self.medio = {}
+        self.rango = [0] * n
+        self.atajos = 0
+        self._contraer(salidas, entradas)
+
+        self.segundos_preprocesamiento = time.perf_counter() - t
+
+    # ─ Preprocesamiento ─
+
+    def _testigo(self, salidas, contraido, origen, evitado, limite_costo):
+        """Dijkstra acotado desde origen sin pasar por el nodo evitado."""
+        distancia = {origen: 0}
+        cola = [(0, origen)]
+        asentados = 0
+        while cola and asentados < self.limite_testigos:
+            d, u = heapq.heappop(cola)
+            if d > distancia[u]:
+                continue
+            if d > limite_costo:
+                break
+            asentados += 1
+            for w, peso in salidas[u].items():
+                if w == evitado or contraido[w]:
+                    continue
+                nueva = d + peso
+                if nueva < distancia.get(w, float("inf")):
+                    distancia[w] = nueva
+                    heapq.heappush(cola, (nueva, w))
+        return distancia
+
+    def _atajos_necesarios(self, salidas, entradas, contraido, v):
+        """Regresa los atajos (u, w, costo) que hacen falta al contraer v."""
+        atajos = []
+        destinos = [(w, c) for w, c in salidas[v].items() if not contraido[w]]
+        if not destinos:
+            return atajos
+        maximo_salida = max(c for _, c in destinos)
+
+        for u, costo_uv in entradas[v].items():
+            if contraido[u]:
+                continue
+            distancia = self._testigo(salidas, contraido, u, v, costo_uv + maximo_salida)
+            for w, costo_vw in destinos:
+                if w == u:
+                    continue
+                costo = costo_uv + costo_vw
+                if distancia.get(w, float("inf")) > costo:
+                    atajos.append((u, w, costo))
+        return atajos
+
+    def _prioridad(self, salidas, entradas, contraido, vecinos_contraidos, v):
+        """Regresa (diferencia de aristas, atajos necesarios) de contraer v en este momento."""
+        atajos = self._atajos_necesarios(salidas, entradas, contraido, v)
+        eliminadas = (sum(1 for w in salidas[v] if not contraido[w]) +
+                      sum(1 for u in entradas[v] if not contraido[u]))
+        return len(atajos) - eliminadas + vecinos_contraidos[v], atajos
+
+    def _contraer(self, salidas, entradas):
+        n = len(self.nodos)
+        contraido = [False] * n
+        vecinos_contraidos = [0] * n
+
+        cola = [(self._prioridad(salidas, entradas, contraido, vecinos_contraidos, v)[0], v) for v in range(n)]
+        heapq.heapify(cola)
+
+        # Aristas hacia nodos de mayor rango: arriba[v] para la búsqueda desde el inicio y
+        # arriba_inverso[v] (aristas u → v recorridas al revés) para la búsqueda desde la meta.
+        self.arriba = [None] * n
+        self.arriba_inverso = [None] * n
+
+        siguiente_rango = 0
+        while cola:
+            _, v = heapq.heappop(cola)
+            if contraido[v]:
+                continue
+
+            # Actualización perezosa: si la prioridad cambió y ya no es la mínima, se reinserta.
+            prioridad, atajos = self._prioridad(salidas, entradas, contraido, vecinos_contraidos, v)
+            if cola and prioridad > cola[0][0]:
+                heapq.heappush(cola, (prioridad, v))
+                continue
+
+            # Los atajos calculados para la prioridad siguen siendo válidos: el grafo no ha cambiado.
+            for u, w, costo in atajos:
+                if costo < salidas[u].get(w, float("inf")):
+                    salidas[u][w] = costo
+                    entradas[w][u] = costo
+                    self.medio[(u, w)] = v
+                    self.atajos += 1
+
+            self.arriba[v] = [(w, c) for w, c in salidas[v].items() if not contraido[w]]
+            self.arriba_inverso[v] = [(u, c) for u, c in entradas[v].items() if not contraido[u]]
+
+            contraido[v] = True
+            self.rango[v] = siguiente_rango
+            siguiente_rango += 1
+            for w, _ in self.arriba[v]:
+                vecinos_contraidos[w] += 1
+            for u, _ in self.arriba_inverso[v]:
+                vecinos_contraidos[u] += 1
+
+    # ─ Consultas ─
+
+    def _desempacar(self, u, w, ruta):
+        """Agrega a la ruta los nodos de la arista u → w (sin u), desempacando atajos."""
+        pila = [(u, w)]
+        while pila:
+            a, b = pila.pop()
+            v = self.medio.get((a, b))
+            if v is None:
+                ruta.append(self.nodos[b])
+            else:
+                # Primero la mitad a → v, por eso se apila al final.
+                pila.append((v, b))
+                pila.append((a, v))
+
+    def buscar(self, semillas_inicio, semillas_meta, mejor_directo=float("inf")):
+        """Dijkstra bidireccional ascendente entre dos conjuntos de nodos semilla.
+
+        Args:
+            semillas_inicio (list): Pares (nodo, costo) desde los que parte la búsqueda hacia adelante
+            semillas_meta (list): Pares (nodo, costo) desde los que parte la búsqueda hacia atrás
+            mejor_directo (float, optional): Costo de un camino ya conocido que no pasa por la jerarquía
+
+        Returns:
+            tuple: (costo, ruta, nodos_expandidos) donde ruta es la lista de nodos del
+                   macro-grafo desde una semilla de inicio hasta una de meta (None si no
+                   hay camino más corto que mejor_directo)
+        """
+        distancias = ({}, {})
+        padres = ({}, {})
+        colas = ([], [])
+        for lado, semillas in ((0, semillas_inicio), (1, semillas_meta)):
+            for nodo, costo in semillas:
+                k = self.indice.get(nodo)
+                if k is not None and costo < distancias[lado].get(k, float("inf")):
+                    distancias[lado][k] = costo
+                    padres[lado][k] = None
+                    heapq.heappush(colas[lado], (costo, k))
+
+        aristas = (self.arriba, self.arriba_inverso)
+        mu = mejor_directo
+        encuentro = None
+        nodos_expandidos = 0
+
+        while colas[0] or colas[1]:
+            # Cada lado se detiene cuando su mínimo alcanza el mejor costo conocido.
+            lado = 0 if colas[0] and (not colas[1] or colas[0][0][0] <= colas[1][0][0]) else 1
+            d, u = heapq.heappop(colas[lado])
+            if d > distancias[lado][u]:
+                continue
+            if d >= mu:
+                colas[lado].clear()
+                continue
+            nodos_expandidos += 1
+
+            otra = distancias[1 - lado].get(u)
+            if otra is not None and d + otra < mu:
+                mu = d + otra
+                encuentro = u
+
+            propias, padre = distancias[lado], padres[lado]
+            for w, peso in aristas[lado][u]:
+                nueva = d + peso
+                if nueva < propias.get(w, float("inf")):
+                    propias[w] = nueva
+                    padre[w] = u
+                    heapq.heappush(colas[lado], (nueva, w))
+
+        if encuentro is None:
+            return mu, None, nodos_expandidos
+
+        # Cadena de nodos de la jerarquía: semilla de inicio → encuentro → semilla de meta.
+        subida = [encuentro]
+        while padres[0][subida[-1]] is not None:
+            subida.append(padres[0][subida[-1]])
+        subida.reverse()
+        bajada = [encuentro]
+        while padres[1][bajada[-1]] is not None:
+            bajada.append(padres[1][bajada[-1]])
+
+        ruta = [self.nodos[subida[0]]]
+        for a, b in zip(subida, subida[1:]):
+            self._desempacar(a, b, ruta)
+        for a, b in zip(bajada, bajada[1:]):
+            self._desempacar(a, b, ruta)
+
+        return mu, ruta, nodos_expandidos
+
+    def consultar(self, inicio, meta, corredores):
+        """Busca el camino completo entre dos nodos del macro-grafo.
+
+        Args:
+            inicio (tuple): Nodo de decisión de inicio
+            meta (tuple): Nodo de decisión de meta
+            corredores (dict): Corredores del macro-grafo, para desempacar la ruta a celdas
+
+        Returns:
+            tuple: (camino, nodos_expandidos) igual que MotorConsultas.consultar
+        """
+        _, ruta, nodos_expandidos = self.buscar([(inicio, 0)], [(meta, 0)])
+        return reconstruir_ruta_completa(ruta, corredores), nodos_expandidos
+
+
+# Función para comparar la jerarquía contra A* sobre el macro-grafo.
+def comparar_contraccion(macro_grafo, corredores, consultas, jerarquia=None):
+    """Función que mide el preprocesamiento y la latencia de las consultas con la jerarquía
+    de contracción frente a A* sobre el macro-grafo
+
+    Args:
+        macro_grafo (dict): Macro-grafo {nodo_decision: [(vecino, peso), ...]}
+        corredores (dict): Corredores del macro-grafo
+        consultas (list): Pares (inicio, meta) de nodos del macro-grafo
+        jerarquia (JerarquiaContraccion, optional): Jerarquía ya construida
+
+    Returns:
+        dict: Llaves nodos, aristas, atajos, segundos_preprocesamiento, latencia_busqueda
+              (solo la búsqueda en la jerarquía y el desempacado de atajos), latencia_jerarquia y
+              latencia_a_estrella (con la ruta completa celda a celda), en segundos promedio por
+              consulta, y expandidos_jerarquia y expandidos_a_estrella (promedios)
+    """
+    if jerarquia is None:
+        jerarquia = JerarquiaContraccion(macro_grafo)
+
+    t = time.perf_counter()
+    for inicio, meta in consultas:
+        jerarquia.buscar([(inicio, 0)], [(meta, 0)])
+    latencia_busqueda = (time.perf_counter() - t) / max(1, len(consultas))
+
+    t = time.perf_counter()
+    expandidos_jerarquia = sum(jerarquia.consultar(inicio, meta, corredores)[1] for inicio, meta in consultas)
+    latencia_jerarquia = (time.perf_counter() - t) / max(1, len(consultas))
+
+    t = time.perf_counter()
+    expandidos_a_estrella = 0
+    for inicio, meta in consultas:
+        ruta, expandidos = a_estrella_macro(macro_grafo, inicio, meta)
+        reconstruir_ruta_completa(ruta, corredores)
+        expandidos_a_estrella += expandidos
+    latencia_a_estrella = (time.perf_counter() - t) / max(1, len(consultas))
+
+    return {
+        "nodos": len(jerarquia.nodos),
+        "aristas": sum(len(aristas) for aristas in macro_grafo.values()),
+        "atajos": jerarquia.atajos,
+        "segundos_preprocesamiento": jerarquia.segundos_preprocesamiento,
+        "latencia_busqueda": latencia_busqueda,
+        "latencia_jerarquia": latencia_jerarquia,
+        "latencia_a_estrella": latencia_a_estrella,
+        "expandidos_jerarquia": expandidos_jerarquia / max(1, len(consultas)),
+        "expandidos_a_estrella": expandidos_a_estrella / max(1, len(consultas)),
+    }
@@ -0,0 +1,320 @@
+# corredores.py
+
+from array import array
+from bisect import bisect_right
+from collections.abc import MutableMapping, Sequence
+from itertools import chain, islice
+
+# Tramo vacío: la macro-arista une dos celdas vecinas y el corredor es solo el destino.
+_VACIO = range(0)
+
+
+class VistaCorredor(Sequence):
+    """Pasos de un corredor (sin el origen, con el destino) sin copiarlos.
+
+    Es una vista sobre el búfer compartido de Corredores: el tramo es un range de
+    posiciones del búfer, creciente o decreciente, así que el sentido inverso de un
+    corredor es el mismo tramo al revés. Se comporta como la lista de pasos: admite
+    len, índices, rebanadas (que sí regresan una lista), iteración y comparación.
+    """
+
+    __slots__ = ("_celdas", "_tramo", "destino")
+
+    def __init__(self, celdas, tramo, destino):
+        self._celdas = celdas
+        self._tramo = tramo
+        self.destino = destino
+
+    def __len__(self):
+        return len(self._tramo) + 1
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return list(self)[k]
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("índice fuera del corredor")
+        if k == len(self._tramo):
+            return self.destino
+        p = 2 * self._tramo[k]
+        return self._celdas[p], self._celdas[p + 1]
+
+    def __iter__(self):
+        tramo, celdas = self._tramo, self._celdas
+        if not tramo:
+            return iter((self.destino,))
+        if tramo.step > 0:
+            plano = celdas[2 * tramo.start:2 * tramo.stop]
+            return chain(zip(plano[0::2], plano[1::2]), (self.destino,))
+        plano = celdas[2 * tramo[-1]:2 * tramo[0] + 2]
+        return chain(zip(plano[-2::-2], plano[-1::-2]), (self.destino,))
+
+    def __eq__(self, otro):
+        if not isinstance(otro, (list, tuple, Sequence)) or isinstance(otro, str):
+            return NotImplemented
+        return len(self) == len(otro) and all(a == b for a, b in zip(self, otro))
+
+    def __repr__(self):
+        return f"VistaCorredor({list(self)!r})"
+
+
+class Corredores(MutableMapping):
+    """Corredores del macro-grafo en un solo búfer compartido de coordenadas.
+
+    Se usa igual que el diccionario {(origen, destino): [pasos]}, pero las celdas
+    intermedias de todos los corredores viven en un array int32 plano (i, j, i, j, ...)
+    y cada macro-arista guarda solo un range de posiciones de ese búfer. El sentido
+    inverso de un corredor reutiliza el mismo tramo recorrido al revés, así que cada
+    corredor se guarda una sola vez y con 8 bytes por celda, en lugar de dos listas de
+    tuplas.
+
+    Al reemplazar o borrar un corredor su tramo queda en el búfer sin usar. Se lleva la
+    cuenta de las celdas en uso y, cuando las que quedaron sin usar son más de la
+    fracción PROPORCION_MUERTAS del búfer, se llama a compactar(). Las vistas creadas
+    antes siguen siendo válidas: compactar() crea un búfer nuevo en lugar de mover el
+    anterior.
+    """
+
+    # Fracción del búfer sin usar a partir de la cual se compacta solo.
+    PROPORCION_MUERTAS = 0.5
+
+    def __init__(self, celdas=None, tramos=None):
+        """
+        Args:
+            celdas (array, optional): Búfer plano de coordenadas (array('i'))
+            tramos (dict, optional): {(origen, destino): range de posiciones del búfer}
+        """
+        self._celdas = array("i") if celdas is None else celdas
+        self._tramos = {} if tramos is None else tramos
+        # Aristas que usan cada tramo del búfer (un corredor y su inverso comparten uno).
+        self._usos = {}
+        self._en_uso = 0
+        for tramo in self._tramos.values():
+            self._usar(tramo)
+
+    @staticmethod
+    def _clave(tramo):
+        """Posiciones extremas de un tramo, iguales para el tramo y su inverso."""
+        return (tramo[0], tramo[-1]) if tramo.step > 0 else (tramo[-1], tramo[0])
+
+    def _usar(self, tramo):
+        if not tramo:
+            return
+        clave = self._clave(tramo)
+        if clave not in self._usos:
+            self._usos[clave] = 0
+            self._en_uso += len(tramo)
+        self._usos[clave] += 1
+
+    def _liberar(self, tramo):
+        if not tramo:
+            return
+        clave = self._clave(tramo)
+        self._usos[clave] -= 1
+        if not self._usos[clave]:
+            del self._usos[clave]
+            self._en_uso -= len(tramo)
+
+    def _compactar_si_hace_falta(self):
+        total = len(self._celdas) // 2
+        if total - self._en_uso > self.PROPORCION_MUERTAS * total:
+            self.compactar()
+
+    def __getitem__(self, arista):
+        return VistaCorredor(self._celdas, self._tramos[arista], arista[1])
+
+    def __setitem__(self, arista, pasos):
+        """Guarda los pasos de un corredor (sin el origen, con el destino).
+
+        Si el sentido inverso ya está guardado y recorre las mismas celdas, se reutiliza
+        su tramo al revés en lugar de copiarlas.
+        """
+        origen, destino = arista
+        interiores = len(pasos) - 1
+        inverso = self._tramos.get((destino, origen))
+        if inverso is not None and len(inverso) == interiores:
+            vista = VistaCorredor(self._celdas, inverso, origen)
+            if interiores == 0 or list(pasos[-2::-1]) == list(vista)[:-1]:
+                self._reemplazar(arista, inverso[::-1])
+                return
+
+        if interiores == 0:
+            self._reemplazar(arista, _VACIO)
+            return
+        desde = len(self._celdas) // 2
+        for i, j in islice(pasos, interiores):
+            self._celdas.append(i)
+            self._celdas.append(j)
+        self._reemplazar(arista, range(desde, desde + interiores))
+
+    def _reemplazar(self, arista, tramo):
+        """Asigna el tramo de una arista, liberando el anterior."""
+        self._usar(tramo)
+        anterior = self._tramos.get(arista)
+        if anterior is not None:
+            self._liberar(anterior)
+        self._tramos[arista] = tramo
+        self._compactar_si_hace_falta()
+
+    def __delitem__(self, arista):
+        self._liberar(self._tramos.pop(arista))
+        self._compactar_si_hace_falta()
+
+    def __iter__(self):
+        return iter(self._tramos)
+
+    def __len__(self):
+        return len(self._tramos)
+
+    def __contains__(self, arista):
+        return arista in self._tramos
+
+    def longitud(self, arista):
+        """Número de pasos del corredor (incluido el destino), sin crear la vista."""
+        return len(self._tramos[arista]) + 1
+
+    @property
+    def celdas(self):
+        """Búfer plano (array('i')) con las coordenadas de todos los corredores."""
+        return self._celdas
+
+    def tramos(self):
+        """Regresa {(origen, destino): range} con el tramo del búfer de cada corredor."""
+        return self._tramos
+
+    def memoria_bytes(self):
+        """Bytes que ocupa el búfer de celdas."""
+        return self._celdas.itemsize * len(self._celdas)
+
+    def compactar(self):
+        """Reescribe el búfer con solo los tramos en uso (tras muchas actualizaciones)."""
+        celdas = array("i")
+        nuevos = {}
+        por_tramo = {}
+        usos = {}
+        for arista, tramo in self._tramos.items():
+            if not tramo:
+                nuevos[arista] = _VACIO
+                continue
+            # Un tramo y su inverso se copian una sola vez.
+            clave = self._clave(tramo)
+            if clave not in por_tramo:
+                desde = len(celdas) // 2
+                celdas.extend(self._celdas[2 * clave[0]:2 * clave[1] + 2])
+                por_tramo[clave] = range(desde, desde + len(tramo))
+            base = por_tramo[clave]
+            nuevos[arista] = base if tramo.step > 0 else base[::-1]
+            usos[self._clave(base)] = self._usos[clave]
+        self._celdas = celdas
+        self._tramos = nuevos
+        self._usos = usos
+        self._en_uso = len(celdas) // 2
+
+
+class RutaPerezosa(Sequence):
+    """Ruta completa celda a celda que se expande solo al recorrerla.
+
+    Guarda la ruta compacta y las vistas de sus corredores; la longitud se conoce sin
+    expandir nada, iterar produce las celdas bajo demanda (tomar los primeros pasos no
+    toca el resto de la ruta) y comprimida() la regresa codificada por tramos rectos.
+    """
+
+    def __init__(self, ruta_compacta, corredores):
+        """
+        Args:
+            ruta_compacta (list): Nodos de decisión desde inicio hasta meta
+            corredores (Mapping): Corredores {(origen, destino): pasos}
+        """
+        self.ruta_compacta = ruta_compacta
+        self._tramos = [corredores.get((origen, destino), (destino,))
+                        for origen, destino in zip(ruta_compacta, ruta_compacta[1:])]
+        # acumulado[k] = posición en la ruta del primer paso del tramo k.
+        self._acumulado = [1]
+        for pasos in self._tramos:
+            self._acumulado.append(self._acumulado[-1] + len(pasos))
+
+    def __len__(self):
+        return self._acumulado[-1]
+
+    def __iter__(self):
+        return chain((self.ruta_compacta[0],), *self._tramos)
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            inicio, fin, paso = k.indices(len(self))
+            if paso == 1:
+                return list(islice(self, inicio, fin))
+            return list(self)[k]
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("índice fuera de la ruta")
+        if k == 0:
+            return self.ruta_compacta[0]
+        tramo = bisect_right(self._acumulado, k) - 1
+        return self._tramos[tramo][k - self._acumulado[tramo]]
+
+    def lista(self):
+        """Expande la ruta completa a una lista."""
+        return list(self)
+
+    def comprimida(self):
+        """Ruta codificada por tramos rectos (run-length).
+
+        Returns:
+            list: [(celda_inicial, (di, dj), pasos), ...]; la ruta se recupera avanzando
+                  `pasos` veces en la dirección de cada tramo desde su celda inicial
+        """
+        return comprimir_ruta(self)
+
+
+# Función para comprimir una ruta por tramos rectos.
+def comprimir_ruta(camino):
+    """Función que codifica una ruta celda a celda por tramos rectos (run-length)
+
+    Args:
+        camino (iterable): Celdas de la ruta (una lista, una RutaPerezosa o un iterador)
+
+    Returns:
+        list: [(celda_inicial, (di, dj), pasos), ...], vacía si la ruta está vacía
+    """
+    tramos = []
+    celdas = iter(camino)
+    anterior = next(celdas, None)
+    inicio, direccion, pasos = anterior, None, 0
+
+    for celda in celdas:
+        paso = (celda[0] - anterior[0], celda[1] - anterior[1])
+        if paso == direccion:
+            pasos += 1
+        else:
+            if direccion is not None:
+                tramos.append((inicio, direccion, pasos))
+            inicio, direccion, pasos = anterior, paso, 1
+        anterior = celda
+
+    if direccion is not None:
+        tramos.append((inicio, direccion, pasos))
+    elif anterior is not None:
+        # Ruta de una sola celda (inicio == meta).
+        tramos.append((anterior, (0, 0), 0))
+    return tramos
+
+
+# Función para expandir una ruta comprimida.
+def expandir_ruta(tramos):
+    """Función que recupera la ruta celda a celda a partir de sus tramos rectos
+
+    Args:
+        tramos (list): Tramos como los regresa comprimir_ruta
+
+    Returns:
+        list: Ruta celda a celda
+    """
+    if not tramos:
+        return []
+    camino = [tramos[0][0]]
+    for (i, j), (di, dj), pasos in tramos:
+        camino.extend((i + di * k, j + dj * k) for k in range(1, pasos + 1))
+    return camino
@@ -1,110 +1,156 @@
 #dibujar_laberinto.py
 
+import os
+
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.colors import ListedColormap
+from matplotlib.collections import LineCollection
+
+from grafo import VALOR_MINIMO_TERRENO
+
+
+# Colores: 0 = camino(blanco), 1 = pared(negro), 2 = inicio(verde), 3 = meta(rojo), 4 = recorrido(amarillo),
+# 5 = terreno con costo (arena).
+COLORES = [
+    "#FFFFFF",  # 0 - camino (blanco).
+    "#2C3E50",  # 1 - pared (azul oscuro/negro).
+    "#27AE60",  # 2 - inicio (verde).
+    "#E74C3C",  # 3 - meta (rojo).
+    "#F1C40F",  # 4 - recorrido (amarillo).
+    "#D2B48C"   # 5 - terreno con costo (arena).
+]
+COLOR_FLECHAS = "#E67E22"
+
+# Los mismos colores como tabla RGB para indexarla directamente con la matriz.
+PALETA = np.array([[int(c[k:k + 2], 16) for k in (1, 3, 5)] for c in COLORES], dtype=np.uint8)
+
+# Por encima de estos tamaños se omiten la cuadrícula (y las etiquetas por celda), las
+# flechas (en número de pasos del recorrido) y la figura de matplotlib completa.
+LIMITE_CUADRICULA = 100
+LIMITE_FLECHAS = 2000
+LIMITE_FIGURA = 300
+
+# Lado máximo (en píxeles) de las imágenes en modo raster.
+LADO_RASTER = 2048
 
 
 # Funciones para dibujar el laberinto y los recorridos de los algoritmos.
-def dibujar_laberinto(matriz, n):
-    laberinto = np.array(matriz)
-
-    # Colores: 0 = camino(blanco), 1 = pared(negro), 2 = inicio(verde), 3 = meta(rojo).
-    colores = ListedColormap([
-        "#FFFFFF",  # 0 - camino (blanco).
-        "#2C3E50",  # 1 - pared (azul oscuro/negro).
-        "#27AE60",  # 2 - inicio (verde).
-        "#E74C3C"   # 3 - meta (rojo).
-    ])
-
-    fig, ax = plt.subplots(figsize=(8, 8))
-    
+def _valores(matriz, camino=None):
+    """Matriz uint8 con los valores de color de cada celda, con el recorrido marcado (4)."""
+    valores = np.array(matriz, dtype=np.uint8)
+    # Las celdas con terreno (valor >= VALOR_MINIMO_TERRENO) comparten un solo color.
+    valores[valores >= VALOR_MINIMO_TERRENO] = 5
+
+    # Marcar el recorrido en el laberinto (excepto inicio y meta).
+    if camino:
+        filas, columnas = np.asarray(camino, dtype=np.int64).T
+        libres = (valores[filas, columnas] == 0) | (valores[filas, columnas] == 5)
+        valores[filas[libres], columnas[libres]] = 4
+
+    return valores
+
+
+def _guardar_raster(valores, ruta, pixeles_por_celda=None):
+    """Escribe la imagen directamente desde el arreglo RGB, sin figura ni ejes."""
+    if pixeles_por_celda is None:
+        pixeles_por_celda = max(1, min(8, LADO_RASTER // max(valores.shape)))
+
+    imagen = PALETA[valores]
+    if pixeles_por_celda > 1:
+        imagen = imagen.repeat(pixeles_por_celda, axis=0).repeat(pixeles_por_celda, axis=1)
+
+    plt.imsave(ruta, imagen)
+
+
+def _guardar_figura(valores, titulo, ruta, camino=None):
+    """Dibuja la figura con ejes, título, cuadrícula y flechas (solo para laberintos pequeños)."""
+    filas, columnas = valores.shape
+    n = max(filas, columnas)
+    # El lado mayor mide 8 pulgadas y el otro se ajusta a la proporción de la malla.
+    fig, ax = plt.subplots(figsize=(max(2, 8 * columnas / n), max(2, 8 * filas / n)))
+
     # Dibujar el laberinto.
-    ax.imshow(laberinto, cmap=colores, vmin=0, vmax=3)
-    
-    # Dibujar líneas de cuadrícula para formar celdas.
-    for i in range(n + 1):
-        ax.axhline(i - 0.5, color='black', linewidth=2)
-        ax.axvline(i - 0.5, color='black', linewidth=2)
-    
-    # Configurar ejes.
-    ax.set_xticks(range(n))
-    ax.set_yticks(range(n))
-    ax.set_xticklabels(range(n))
-    ax.set_yticklabels(range(n))
-    
-    ax.set_xlim(-0.5, n - 0.5)
-    ax.set_ylim(n - 0.5, -0.5)
-    
-    plt.title("Laberinto", fontsize=14, fontweight='bold')
+    ax.imshow(PALETA[valores], interpolation="nearest")
+
+    if n <= LIMITE_CUADRICULA:
+        # Líneas de cuadrícula para formar celdas, todas en una sola colección.
+        horizontales = [((-0.5, y), (columnas - 0.5, y)) for y in np.arange(filas + 1) - 0.5]
+        verticales = [((x, -0.5), (x, filas - 0.5)) for x in np.arange(columnas + 1) - 0.5]
+        ax.add_collection(LineCollection(horizontales + verticales, colors="black",
+                                         linewidths=min(2.0, 50 / n)))
+
+        # Configurar ejes.
+        ax.set_xticks(range(columnas))
+        ax.set_yticks(range(filas))
+        ax.set_xticklabels(range(columnas))
+        ax.set_yticklabels(range(filas))
+
+    # Flechas para mostrar la dirección del recorrido, todas en una sola llamada.
+    if camino and 1 < len(camino) <= LIMITE_FLECHAS:
+        puntos = np.asarray(camino, dtype=float)
+        y, x = puntos[:-1].T
+        dy, dx = np.diff(puntos, axis=0).T
+        ax.quiver(x, y, dx, dy, angles="xy", scale_units="xy", scale=1, color=COLOR_FLECHAS,
+                  width=min(0.004, 0.1 / n), headwidth=4, headlength=4, headaxislength=3.5)
+
+    ax.set_xlim(-0.5, columnas - 0.5)
+    ax.set_ylim(filas - 0.5, -0.5)
+
+    plt.title(titulo, fontsize=14, fontweight='bold')
     plt.tight_layout()
-    plt.savefig("laberinto.png", dpi=150, bbox_inches='tight')
-    plt.close()
+    plt.savefig(ruta, dpi=150, bbox_inches='tight')
+    plt.close(fig)
+
 
+def _usar_raster(modo, valores):
+    if modo not in ("auto", "figura", "raster"):
+        raise ValueError(f"modo desconocido: {modo}")
+    return modo == "raster" or (modo == "auto" and max(valores.shape) > LIMITE_FIGURA)
 
-def dibujar_recorrido(matriz, n, camino, nombre_algoritmo):
+
+def dibujar_laberinto(matriz, n, modo="auto", pixeles_por_celda=None):
+    """Dibuja el laberinto vacío en laberinto.png
+
+    Args:
+        matriz (List | np.ndarray): Matriz que representa el laberinto (puede ser rectangular)
+        n (int): Número de filas del laberinto (None para todas); las columnas se toman de la matriz
+        modo (str, optional): "figura" (matplotlib con ejes y cuadrícula), "raster" (la
+            imagen se escribe directo desde un arreglo RGB) o "auto" (raster si el lado
+            mayor pasa de LIMITE_FIGURA)
+        pixeles_por_celda (int, optional): Escala del modo raster; por defecto la mayor que
+            deja la imagen dentro de LADO_RASTER píxeles (hasta 8)
+    """
+    valores = _valores(matriz)[:n]
+
+    if _usar_raster(modo, valores):
+        _guardar_raster(valores, "laberinto.png", pixeles_por_celda)
+    else:
+        _guardar_figura(valores, "Laberinto", "laberinto.png")
+
+
+def dibujar_recorrido(matriz, n, camino, nombre_algoritmo, directorio=".", modo="auto", pixeles_por_celda=None):
     """Dibuja el laberinto con el recorrido del algoritmo marcado
 
     Args:
-        matriz (List): Matriz que representa el laberinto
-        n (int): Tamaño del laberinto
+        matriz (List): Matriz que representa el laberinto (puede ser rectangular)
+        n (int): Número de filas del laberinto (None para todas)
         camino (List): Lista de coordenadas del recorrido
         nombre_algoritmo (str): Nombre del algoritmo para el título y archivo
+        directorio (str, optional): Directorio donde se guarda la imagen
+        modo (str, optional): "figura", "raster" o "auto", igual que en dibujar_laberinto
+        pixeles_por_celda (int, optional): Escala del modo raster
     """
     if camino is None:
         return
-    
-    laberinto = np.array(matriz, dtype=float)
-    
-    # Colores: 0 = camino(blanco), 1 = pared(negro), 2 = inicio(verde), 3 = meta(rojo), 4 = recorrido(amarillo).
-    colores = ListedColormap([
-        "#FFFFFF",  # 0 - camino (blanco).
-        "#2C3E50",  # 1 - pared (azul oscuro/negro).
-        "#27AE60",  # 2 - inicio (verde).
-        "#E74C3C",  # 3 - meta (rojo).
-        "#F1C40F"   # 4 - recorrido (amarillo).
-    ])
-    
-    # Marcar el recorrido en el laberinto (excepto inicio y meta).
-    for coord in camino:
-        i, j = coord
-
-        # Solo marcar celdas de camino libre.
-        if laberinto[i][j] == 0:
-            laberinto[i][j] = 4
-
-    fig, ax = plt.subplots(figsize=(8, 8))
-    
-    # Dibujar el laberinto con el recorrido.
-    ax.imshow(laberinto, cmap=colores, vmin=0, vmax=4)
-    
-    # Dibujar líneas de cuadrícula para formar celdas.
-    for i in range(n + 1):
-        ax.axhline(i - 0.5, color='black', linewidth=2)
-        ax.axvline(i - 0.5, color='black', linewidth=2)
-    
-    # Dibujar flechas para mostrar la dirección del recorrido.
-    for idx in range(len(camino) - 1):
-        y1, x1 = camino[idx]
-        y2, x2 = camino[idx + 1]
-        ax.annotate('', xy=(x2, y2), xytext=(x1, y1),
-                    arrowprops=dict(arrowstyle='->', color='#E67E22', lw=2))
-    
-    # Configurar ejes.
-    ax.set_xticks(range(n))
-    ax.set_yticks(range(n))
-    ax.set_xticklabels(range(n))
-    ax.set_yticklabels(range(n))
-    
-    ax.set_xlim(-0.5, n - 0.5)
-    ax.set_ylim(n - 0.5, -0.5)
-    
-    plt.title(f"Recorrido {nombre_algoritmo}", fontsize=14, fontweight='bold')
-    plt.tight_layout()
-    
+
+    valores = _valores(matriz, camino)[:n]
+
     # Guardar con nombre basado en el algoritmo.
-    nombre_archivo = f"recorrido_{nombre_algoritmo.lower()}.png"
-    plt.savefig(nombre_archivo, dpi=150, bbox_inches='tight')
-    plt.close()
+    nombre_archivo = os.path.join(directorio, f"recorrido_{nombre_algoritmo.lower()}.png")
+
+    if _usar_raster(modo, valores):
+        _guardar_raster(valores, nombre_archivo, pixeles_por_celda)
+    else:
+        _guardar_figura(valores, f"Recorrido {nombre_algoritmo}", nombre_archivo, camino)
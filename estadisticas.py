@@ -0,0 +1,135 @@
+# estadisticas.py
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+
+
+class Estadisticas:
+    """Contadores y tiempos de una o varias búsquedas.
+
+    Se pasa a las funciones de algoritmos.py con el argumento `estadisticas`. Sin él, las
+    búsquedas solo llevan los contadores locales que ya necesitan, así que el costo de
+    tenerlas disponibles es prácticamente nulo. Los valores se acumulan entre llamadas:
+    un mismo objeto puede cubrir la tubería completa del macro-grafo o muchas consultas.
+    """
+
+    def __init__(self, al_expandir=None, medir_memoria=False):
+        """
+        Args:
+            al_expandir (callable, optional): Función nodo → None que se llama con cada
+                nodo expandido (por ejemplo, para trazar o animar la búsqueda)
+            medir_memoria (bool, optional): Si es True, cada fase mide su pico de memoria
+                con tracemalloc (lo que frena la ejecución)
+        """
+        self.al_expandir = al_expandir
+        self.medir_memoria = medir_memoria
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Pone todos los contadores y tiempos en cero."""
+        self.busquedas = 0
+        self.nodos_expandidos = 0
+        self.nodos_generados = 0
+        self.extracciones_obsoletas = 0
+        self.frontera_maxima = 0
+        self.memoria_pico_bytes = 0
+        self.memoria_fases = {}
+        self.tiempos = {}
+        # Fases abiertas con medición de memoria: [memoria al entrar, pico visto antes de
+        # que una fase anidada reiniciara el pico de tracemalloc].
+        self._abiertas = []
+
+    def registrar_busqueda(self, nodos_expandidos, nodos_generados, extracciones_obsoletas, frontera_maxima):
+        """Acumula los contadores de una búsqueda terminada.
+
+        Args:
+            nodos_expandidos (int): Nodos expandidos
+            nodos_generados (int): Nodos agregados a la frontera
+            extracciones_obsoletas (int): Entradas sacadas de la frontera que ya no eran
+                válidas (el nodo ya se había expandido o se encontró un mejor costo)
+            frontera_maxima (int): Tamaño máximo que alcanzó la frontera
+        """
+        self.busquedas += 1
+        self.nodos_expandidos += nodos_expandidos
+        self.nodos_generados += nodos_generados
+        self.extracciones_obsoletas += extracciones_obsoletas
+        self.frontera_maxima = max(self.frontera_maxima, frontera_maxima)
+
+    @contextmanager
+    def fase(self, nombre):
+        """Mide el tiempo (y, si se pidió, el pico de memoria) de un bloque y lo suma a la fase indicada.
+
+        El pico de memoria se guarda por fase (el mayor entre sus llamadas) en
+        memoria_fases. Las fases se pueden anidar: antes de que la interior reinicie el
+        pico de tracemalloc, el de la exterior se guarda en su marco, y al cerrar la
+        exterior se combinan.
+        """
+        iniciado = False
+        if self.medir_memoria:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                iniciado = True
+            base, pico = tracemalloc.get_traced_memory()
+            if self._abiertas:
+                exterior = self._abiertas[-1]
+                exterior[1] = max(exterior[1], pico)
+            tracemalloc.reset_peak()
+            marco = [base, base]
+            self._abiertas.append(marco)
+
+        t = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.tiempos[nombre] = self.tiempos.get(nombre, 0.0) + time.perf_counter() - t
+            if self.medir_memoria:
+                _, pico = tracemalloc.get_traced_memory()
+                pico = max(pico, marco[1])
+                self._abiertas.pop()
+                if self._abiertas:
+                    exterior = self._abiertas[-1]
+                    exterior[1] = max(exterior[1], pico)
+                self.memoria_fases[nombre] = max(self.memoria_fases.get(nombre, 0), pico - marco[0])
+                self.memoria_pico_bytes = max(self.memoria_pico_bytes, pico - marco[0])
+                if iniciado:
+                    tracemalloc.stop()
+
+    def como_dict(self):
+        """Regresa los valores en un diccionario plano, listo para exportar como métricas.
+
+        Returns:
+            dict: Contadores con su nombre, el tiempo de cada fase como t_<fase> y, si se
+                  midió la memoria, el pico de cada fase como memoria_<fase> (en bytes)
+        """
+        valores = {
+            "busquedas": self.busquedas,
+            "nodos_expandidos": self.nodos_expandidos,
+            "nodos_generados": self.nodos_generados,
+            "extracciones_obsoletas": self.extracciones_obsoletas,
+            "frontera_maxima": self.frontera_maxima,
+        }
+        if self.medir_memoria:
+            valores["memoria_pico_bytes"] = self.memoria_pico_bytes
+            for nombre, pico in self.memoria_fases.items():
+                valores[f"memoria_{nombre}"] = pico
+        for nombre, segundos in self.tiempos.items():
+            valores[f"t_{nombre}"] = segundos
+        return valores
+
+
+def registrar_fase(nombre):
+    """Decorador que mide la función como la fase indicada cuando recibe `estadisticas`.
+
+    Con estadisticas=None la función se llama directamente, sin medir nada.
+    """
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, estadisticas=None, **kwargs):
+            if estadisticas is None:
+                return funcion(*args, **kwargs)
+            with estadisticas.fase(nombre):
+                return funcion(*args, estadisticas=estadisticas, **kwargs)
+        return envoltura
+    return decorador
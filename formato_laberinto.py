@@ -0,0 +1,134 @@
+# formato_laberinto.py
+
+import struct
+import sys
+
+import numpy as np
+
+# Encabezado del formato binario (.lab), seguido de filas * columnas bytes (uint8) con la matriz:
+#   - firma (4 bytes) y versión (1 byte)
+#   - filas y columnas (uint32)
+#   - inicio y meta como (fila, columna) en int32, con -1 si no existen
+_ENCABEZADO = struct.Struct("<4sB3xIIiiii")
+_FIRMA = b"LABB"
+_VERSION = 1
+
+EXTENSION_BINARIA = ".lab"
+
+
+# Función para cargar el laberinto en formato de texto (valores separados por comas).
+def cargar_laberinto_txt(ruta):
+    """Función que carga un laberinto desde un archivo de texto, una fila por línea
+
+    Args:
+        ruta (str): Ruta del archivo de texto
+
+    Returns:
+        List: Matriz que representa el laberinto
+    """
+    laberinto = []
+    with open(ruta, "r") as f:
+        for linea in f:
+            linea = linea.strip()
+            if linea:
+                laberinto.append([int(x) for x in linea.split(",")])
+
+    return laberinto
+
+
+# Función para guardar el laberinto en formato de texto.
+def guardar_laberinto_txt(laberinto, ruta):
+    """Función que guarda un laberinto en formato de texto, una fila por línea
+
+    Args:
+        laberinto (List | np.ndarray): Matriz que representa el laberinto
+        ruta (str): Ruta del archivo de texto a escribir
+    """
+    with open(ruta, "w") as f:
+        for fila in laberinto:
+            f.write(",".join(str(int(x)) for x in fila) + "\n")
+
+
+# Función para guardar el laberinto en el formato binario.
+def guardar_laberinto_binario(laberinto, ruta, inicio=None, meta=None):
+    """Función que guarda el laberinto en formato binario: un encabezado con las dimensiones,
+    el inicio y la meta, seguido de un byte por celda
+
+    Args:
+        laberinto (List | np.ndarray): Matriz que representa el laberinto
+        ruta (str): Ruta del archivo binario a escribir
+        inicio (tuple, optional): Punto de inicio; si no se indica se busca en la matriz
+        meta (tuple, optional): Punto de meta; si no se indica se busca en la matriz
+    """
+    matriz = np.ascontiguousarray(laberinto, dtype=np.uint8)
+    filas, columnas = matriz.shape
+
+    if inicio is None or meta is None:
+        # Importación local para evitar una dependencia circular con grafo.py.
+        from grafo import encontrar_puntos
+        inicio_encontrado, meta_encontrada = encontrar_puntos(matriz, filas)
+        inicio = inicio if inicio is not None else inicio_encontrado
+        meta = meta if meta is not None else meta_encontrada
+
+    inicio = inicio if inicio is not None else (-1, -1)
+    meta = meta if meta is not None else (-1, -1)
+
+    with open(ruta, "wb") as f:
+        f.write(_ENCABEZADO.pack(_FIRMA, _VERSION, filas, columnas, *inicio, *meta))
+        f.write(matriz.tobytes())
+
+
+# Función para abrir el laberinto binario como memoria mapeada.
+def cargar_laberinto_binario(ruta, modo="r"):
+    """Función que abre un laberinto binario con numpy.memmap, sin leer el archivo completo
+
+    La matriz regresada tiene los atributos `inicio` y `meta` leídos del encabezado, que
+    `encontrar_puntos` usa en lugar de recorrer todas las celdas.
+
+    Args:
+        ruta (str): Ruta del archivo binario
+        modo (str, optional): Modo de numpy.memmap ("r" solo lectura, "r+" lectura/escritura, "c" copia al escribir)
+
+    Returns:
+        np.memmap: Matriz (filas x columnas, uint8) que representa el laberinto
+    """
+    with open(ruta, "rb") as f:
+        datos = f.read(_ENCABEZADO.size)
+
+    if len(datos) < _ENCABEZADO.size:
+        raise ValueError(f"{ruta}: archivo demasiado corto para ser un laberinto binario")
+
+    firma, version, filas, columnas, ii, ij, mi, mj = _ENCABEZADO.unpack(datos)
+    if firma != _FIRMA or version != _VERSION:
+        raise ValueError(f"{ruta}: no es un laberinto binario válido")
+
+    laberinto = np.memmap(ruta, dtype=np.uint8, mode=modo,
+                          offset=_ENCABEZADO.size, shape=(filas, columnas))
+    laberinto.inicio = (ii, ij) if ii >= 0 else None
+    laberinto.meta = (mi, mj) if mi >= 0 else None
+
+    return laberinto
+
+
+# Función para cargar un laberinto eligiendo el formato según la extensión.
+def cargar_laberinto(ruta):
+    """Función que carga un laberinto en formato binario (.lab) o de texto (cualquier otra extensión)
+
+    Args:
+        ruta (str): Ruta del archivo del laberinto
+
+    Returns:
+        List | np.memmap: Matriz que representa el laberinto
+    """
+    if str(ruta).endswith(EXTENSION_BINARIA):
+        return cargar_laberinto_binario(ruta)
+    return cargar_laberinto_txt(ruta)
+
+
+if __name__ == "__main__":
+    # Conversión de texto a binario: python formato_laberinto.py laberinto.txt laberinto.lab
+    if len(sys.argv) != 3:
+        print("Uso: python formato_laberinto.py <entrada.txt> <salida.lab>")
+        sys.exit(1)
+
+    guardar_laberinto_binario(cargar_laberinto_txt(sys.argv[1]), sys.argv[2])
@@ -0,0 +1,236 @@
+# generador.py
+
+import argparse
+import random
+
+import numpy as np
+
+from formato_laberinto import EXTENSION_BINARIA, guardar_laberinto_binario, guardar_laberinto_txt
+from grafo import VALOR_MINIMO_TERRENO
+
+TIPOS = ("perfecto", "trenzado", "salas")
+
+# Valores de la matriz: 0 libre, 1 pared, 2 inicio, 3 meta (y terreno con costo desde
+# VALOR_MINIMO_TERRENO).
+LIBRE, PARED, INICIO, META = 0, 1, 2, 3
+
+
+def _arbol_aleatorio(filas, columnas, rng):
+    """Árbol de expansión aleatorio de una malla de filas x columnas (DFS con retroceso iterativo).
+
+    Returns:
+        list: Aristas (a, b) entre identificadores de celda a = i * columnas + j
+    """
+    total = filas * columnas
+    visitado = bytearray(total)
+    aristas = []
+
+    actual = rng.randrange(total)
+    visitado[actual] = 1
+    pila = [actual]
+
+    while pila:
+        actual = pila[-1]
+        i, j = divmod(actual, columnas)
+        candidatos = []
+        if i > 0 and not visitado[actual - columnas]:
+            candidatos.append(actual - columnas)
+        if i < filas - 1 and not visitado[actual + columnas]:
+            candidatos.append(actual + columnas)
+        if j > 0 and not visitado[actual - 1]:
+            candidatos.append(actual - 1)
+        if j < columnas - 1 and not visitado[actual + 1]:
+            candidatos.append(actual + 1)
+
+        if not candidatos:
+            pila.pop()
+            continue
+
+        siguiente = candidatos[rng.randrange(len(candidatos))] if len(candidatos) > 1 else candidatos[0]
+        visitado[siguiente] = 1
+        aristas.append((actual, siguiente))
+        pila.append(siguiente)
+
+    return aristas
+
+
+def _laberinto_perfecto(filas, columnas, rng):
+    """Laberinto sin ciclos: las celdas están en las coordenadas pares y las paredes entre ellas."""
+    mf, mc = (filas + 1) // 2, (columnas + 1) // 2
+    laberinto = np.full((filas, columnas), PARED, dtype=np.uint8)
+    laberinto[0:filas:2, 0:columnas:2] = LIBRE
+
+    if mf * mc > 1:
+        aristas = np.array(_arbol_aleatorio(mf, mc, rng), dtype=np.int64).reshape(-1, 2)
+        a_i, a_j = np.divmod(aristas[:, 0], mc)
+        b_i, b_j = np.divmod(aristas[:, 1], mc)
+        # La pared entre dos celdas vecinas está en el punto medio de sus coordenadas.
+        laberinto[a_i + b_i, a_j + b_j] = LIBRE
+
+    return laberinto
+
+
+def _trenzar(laberinto, proporcion, rng):
+    """Abre una pared en una proporción de los callejones sin salida, creando ciclos."""
+    filas, columnas = laberinto.shape
+    libre = laberinto == LIBRE
+    relleno = np.zeros((filas + 2, columnas + 2), dtype=bool)
+    relleno[1:-1, 1:-1] = libre
+    grado = (relleno[:-2, 1:-1].astype(np.int8) + relleno[2:, 1:-1]
+             + relleno[1:-1, :-2] + relleno[1:-1, 2:])
+
+    callejones = np.argwhere(libre & (grado == 1))
+    for i, j in callejones.tolist():
+        if rng.random() >= proporcion:
+            continue
+        # Paredes que separan al callejón de otra celda (a dos pasos en la misma dirección).
+        opciones = [(i + di, j + dj) for di, dj in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                    if 0 <= i + 2 * di < filas and 0 <= j + 2 * dj < columnas
+                    and laberinto[i + di, j + dj] == PARED]
+        if opciones:
+            laberinto[opciones[rng.randrange(len(opciones))]] = LIBRE
+
+    return laberinto
+
+
+def _laberinto_salas(filas, columnas, rng, tamano_sala, puertas_extra):
+    """Salas abiertas de tamano_sala x tamano_sala unidas por puertas.
+
+    Las puertas siguen un árbol de expansión aleatorio de las salas (todas quedan
+    conectadas) más una proporción puertas_extra de las paredes restantes.
+    """
+    laberinto = np.full((filas, columnas), LIBRE, dtype=np.uint8)
+    paso = tamano_sala + 1
+    laberinto[tamano_sala::paso, :] = PARED
+    laberinto[:, tamano_sala::paso] = PARED
+
+    # Número de salas por lado, contando una última sala recortada por el borde.
+    mf, mc = (filas + paso - 1) // paso, (columnas + paso - 1) // paso
+    if mf * mc <= 1:
+        return laberinto
+
+    def abrir_puerta(a, b):
+        (ai, aj), (bi, bj) = divmod(a, mc), divmod(b, mc)
+        if ai == bi:
+            # Salas lado a lado: la puerta va en la columna de pared entre ellas.
+            columna = min(aj, bj) * paso + tamano_sala
+            inicio = ai * paso
+            fila = inicio + rng.randrange(min(tamano_sala, filas - inicio))
+            laberinto[fila, columna] = LIBRE
+        else:
+            fila = min(ai, bi) * paso + tamano_sala
+            inicio = aj * paso
+            columna = inicio + rng.randrange(min(tamano_sala, columnas - inicio))
+            laberinto[fila, columna] = LIBRE
+
+    arbol = _arbol_aleatorio(mf, mc, rng)
+    for a, b in arbol:
+        abrir_puerta(a, b)
+
+    en_arbol = {(min(a, b), max(a, b)) for a, b in arbol}
+    for a in range(mf * mc):
+        i, j = divmod(a, mc)
+        for b in ((a + 1) if j < mc - 1 else None, (a + mc) if i < mf - 1 else None):
+            if b is not None and (a, b) not in en_arbol and rng.random() < puertas_extra:
+                abrir_puerta(a, b)
+
+    return laberinto
+
+
+# Función principal del generador.
+def generar_laberinto(n, tipo="perfecto", semilla=0, proporcion_trenzado=0.5,
+                      tamano_sala=8, puertas_extra=0.3, columnas=None):
+    """Función que genera un laberinto NxN (o n x columnas) reproducible a partir de una semilla
+
+    Tipos:
+        - "perfecto": un solo camino entre cada par de celdas (árbol de expansión aleatorio)
+        - "trenzado": laberinto perfecto al que se le abre una pared en una proporción de
+          los callejones sin salida, con lo que aparecen ciclos
+        - "salas": salas abiertas unidas por puertas
+
+    El inicio (2) queda en la esquina superior izquierda y la meta (3) en la última
+    celda libre de la esquina inferior derecha, siempre conectados.
+
+    Args:
+        n (int): Tamaño del laberinto (número de filas si se indica `columnas`)
+        tipo (str, optional): Uno de TIPOS
+        semilla (int, optional): Semilla del generador aleatorio
+        proporcion_trenzado (float, optional): Proporción de callejones que se abren ("trenzado")
+        tamano_sala (int, optional): Lado de cada sala ("salas")
+        puertas_extra (float, optional): Probabilidad de abrir las puertas fuera del árbol ("salas")
+        columnas (int, optional): Número de columnas para un laberinto rectangular; por defecto n
+
+    Returns:
+        np.ndarray: Matriz (uint8) que representa el laberinto
+    """
+    if tipo not in TIPOS:
+        raise ValueError(f"tipo desconocido: {tipo}")
+
+    # Los laberintos cuadrados conservan la semilla de siempre para seguir siendo reproducibles.
+    if columnas is None or columnas == n:
+        columnas = n
+        rng = random.Random(f"{tipo}:{n}:{semilla}")
+    else:
+        rng = random.Random(f"{tipo}:{n}x{columnas}:{semilla}")
+
+    if tipo == "salas":
+        laberinto = _laberinto_salas(n, columnas, rng, tamano_sala, puertas_extra)
+    else:
+        laberinto = _laberinto_perfecto(n, columnas, rng)
+        if tipo == "trenzado":
+            _trenzar(laberinto, proporcion_trenzado, rng)
+
+    laberinto[0, 0] = INICIO
+    # Última celda libre recorriendo desde la esquina inferior derecha.
+    libres = np.flatnonzero(laberinto.ravel() == LIBRE)
+    if len(libres):
+        laberinto.flat[libres[-1]] = META
+
+    return laberinto
+
+
+def agregar_terreno(laberinto, costo_maximo=9, proporcion=0.3, semilla=0):
+    """Función que cubre parte de las celdas libres con terreno de costo variable
+
+    Cada celda libre (no el inicio ni la meta) recibe, con probabilidad `proporcion`, un
+    costo al azar entre VALOR_MINIMO_TERRENO y costo_maximo; ese valor queda en la matriz
+    y es lo que cuesta entrar a la celda.
+
+    Args:
+        laberinto (np.ndarray): Matriz del laberinto (se modifica en su lugar)
+        costo_maximo (int, optional): Costo máximo de una celda (hasta 255)
+        proporcion (float, optional): Proporción de celdas libres con terreno
+        semilla (int, optional): Semilla del generador aleatorio
+
+    Returns:
+        np.ndarray: La misma matriz, con el terreno
+    """
+    if not VALOR_MINIMO_TERRENO <= costo_maximo <= 255:
+        raise ValueError(f"costo_maximo debe estar entre {VALOR_MINIMO_TERRENO} y 255")
+
+    rng = np.random.default_rng(semilla)
+    libres = np.flatnonzero(laberinto.ravel() == LIBRE)
+    elegidas = libres[rng.random(len(libres)) < proporcion]
+    laberinto.flat[elegidas] = rng.integers(VALOR_MINIMO_TERRENO, costo_maximo + 1, len(elegidas))
+    return laberinto
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera un laberinto aleatorio reproducible.")
+    parser.add_argument("tipo", choices=TIPOS)
+    parser.add_argument("n", type=int, help="tamaño del laberinto (NxN), o número de filas con --columnas")
+    parser.add_argument("salida", help=f"archivo de salida ({EXTENSION_BINARIA} para binario, otro para texto)")
+    parser.add_argument("-s", "--semilla", type=int, default=0)
+    parser.add_argument("-c", "--columnas", type=int, help="número de columnas para un laberinto rectangular")
+    parser.add_argument("-t", "--terreno", type=float, default=0,
+                        help="proporción de celdas libres con terreno de costo variable")
+    parser.add_argument("--costo-maximo", type=int, default=9, help="costo máximo del terreno")
+    args = parser.parse_args()
+
+    laberinto = generar_laberinto(args.n, args.tipo, args.semilla, columnas=args.columnas)
+    if args.terreno:
+        agregar_terreno(laberinto, args.costo_maximo, args.terreno, args.semilla)
+    if args.salida.endswith(EXTENSION_BINARIA):
+        guardar_laberinto_binario(laberinto, args.salida)
+    else:
+        guardar_laberinto_txt(laberinto, args.salida)
@@ -1,21 +1,39 @@
 # grafo.py
 
+from collections.abc import Mapping
+
+import numpy as np
+
+
 # Funcion para encontrar los puntos de inicio y meta en el laberinto.
-def encontrar_puntos(laberinto, N):
+def encontrar_puntos(laberinto, N=None):
     """Función que encuentra los puntos de inicio y meta en el laberinto
 
+    Si el laberinto se cargó en formato binario, los puntos se leen de su encabezado
+    (atributos `inicio` y `meta`) sin recorrer las celdas.
+
     Args:
-        laberinto (List): Matriz que representa el laberinto
-        N (int): Tamaño del laberinto (debe ser cuadrado)
+        laberinto (List | np.ndarray): Matriz que representa el laberinto (puede ser rectangular)
+        N (int, optional): Número de filas del laberinto; por defecto todas
 
     Returns:
         tuple tuple: Regresa los puntos donde está el inicio y la meta en el laberinto
     """
+    if hasattr(laberinto, "inicio") and hasattr(laberinto, "meta"):
+        return laberinto.inicio, laberinto.meta
+
+    filas, columnas = dimensiones(laberinto, N)
+
+    if isinstance(laberinto, np.ndarray):
+        # Búsqueda vectorizada; se conserva la última aparición, igual que el recorrido por celdas.
+        matriz = laberinto[:filas, :columnas]
+        return _ultima_celda(matriz, 2), _ultima_celda(matriz, 3)
+
     inicio = None
     meta = None
 
-    for i in range(N):
-        for j in range(N):
+    for i in range(filas):
+        for j in range(columnas):
             if laberinto[i][j] == 2:
                 inicio = (i, j)
             if laberinto[i][j] == 3:
@@ -24,22 +42,84 @@ def encontrar_puntos(laberinto, N):
     return inicio, meta
 
 
+# Función para obtener las dimensiones de la matriz del laberinto.
+def dimensiones(laberinto, N=None):
+    """Función que regresa el número de filas y de columnas del laberinto
+
+    Args:
+        laberinto (List | np.ndarray): Matriz que representa el laberinto
+        N (int, optional): Número de filas a considerar; por defecto todas. Las columnas
+            siempre se toman de la matriz, así que también sirve para mallas rectangulares
+
+    Returns:
+        tuple: (filas, columnas)
+    """
+    filas = len(laberinto) if N is None else N
+    columnas = len(laberinto[0]) if len(laberinto) else 0
+    return filas, columnas
+
+
+def _ultima_celda(matriz, valor):
+    """Regresa la coordenada de la última celda (en orden de filas) con el valor dado, o None."""
+    posiciones = np.flatnonzero(matriz == valor)
+    if len(posiciones) == 0:
+        return None
+    return divmod(int(posiciones[-1]), matriz.shape[1])
+
+
+# Los valores de la matriz desde VALOR_MINIMO_TERRENO son celdas libres con terreno: el
+# valor es el costo de entrar a la celda. Entrar a cualquier otra celda libre cuesta 1.
+VALOR_MINIMO_TERRENO = 4
+
+
+def costo_valor(valor):
+    """Costo de entrar a una celda libre según su valor en la matriz."""
+    return valor if valor >= VALOR_MINIMO_TERRENO else 1
+
+
+class GrafoDiccionario(dict):
+    """Diccionario de adyacencia {celda: [(vecino, costo), ...]} que además guarda el costo
+    de entrar a cada celda con terreno.
+
+    Se usa igual que un dict. El costo de una celda no se puede deducir de las aristas
+    cuando ninguna llega a ella (una celda con terreno rodeada de paredes), así que
+    alternar_celda lo toma de `costos` al liberar uno de sus vecinos.
+    """
+
+    def __init__(self, *args, costos=None, **kwargs):
+        """
+        Args:
+            costos (dict, optional): {celda: costo} de las celdas con terreno; las demás cuestan 1
+        """
+        super().__init__(*args, **kwargs)
+        self.costos = {} if costos is None else costos
+
+    def costo(self, nodo):
+        """Costo de entrar a una celda libre."""
+        return self.costos.get(nodo, 1)
+
+
 # Función para convertir la matriz del laberinto en un grafo representado como una matriz de adyacencia.
-def matriz_a_grafo(laberinto, N):
+def matriz_a_grafo(laberinto, N=None):
     """Función que toma la lista del laberinto y la convierte en un grafo representado como un diccionario de adyacencia
 
+    El peso de cada arista es el costo de entrar a la celda destino (ver VALOR_MINIMO_TERRENO).
+
     Args:
-        laberinto (List): Matriz que representa el laberinto
-        N (int): Tamaño del laberinto (debe ser cuadrado)
+        laberinto (List): Matriz que representa el laberinto (puede ser rectangular)
+        N (int, optional): Número de filas del laberinto; por defecto todas
 
     Returns:
-        dict: Grafo representado como un diccionario de adyacencia
+        GrafoDiccionario: Grafo representado como un diccionario de adyacencia
     """
-    grafo = {}
+    grafo = GrafoDiccionario()
+    filas, columnas = dimensiones(laberinto, N)
     
-    for i in range(N):
-        for j in range(N):
+    for i in range(filas):
+        for j in range(columnas):
             if laberinto[i][j] != 1:  # no es pared
+                if laberinto[i][j] >= VALOR_MINIMO_TERRENO:
+                    grafo.costos[(i, j)] = int(laberinto[i][j])
                 vecinos = []
                 
                 movimientos = [(-1,0),(1,0),(0,-1),(0,1)]
@@ -48,10 +128,244 @@ def matriz_a_grafo(laberinto, N):
                     nx = i + dx
                     ny = j + dy
                     
-                    if 0 <= nx < N and 0 <= ny < N:
+                    if 0 <= nx < filas and 0 <= ny < columnas:
                         if laberinto[nx][ny] != 1:
-                            vecinos.append(((nx, ny), 1))
+                            vecinos.append(((nx, ny), costo_valor(int(laberinto[nx][ny]))))
                 
                 grafo[(i, j)] = vecinos
                 
     return grafo
+
+
+# =========================
+# Grafo compacto de malla
+# =========================
+
+# Movimientos permitidos (arriba, abajo, izquierda, derecha). El bit k de la
+# máscara de una celda indica que el movimiento MOVIMIENTOS[k] es válido.
+MOVIMIENTOS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+# Bit que marca una celda como libre (no pared) dentro de su máscara.
+BIT_LIBRE = 16
+
+# Tabla con los desplazamientos válidos para cada una de las 16 máscaras de movimiento.
+_DESPLAZAMIENTOS = [
+    tuple(mov for k, mov in enumerate(MOVIMIENTOS) if mascara >> k & 1)
+    for mascara in range(16)
+]
+
+
+class GrafoMalla(Mapping):
+    """Grafo de la malla del laberinto almacenado en un búfer plano de máscaras.
+
+    Cada celda ocupa un byte: los 4 bits bajos indican hacia qué vecinos se puede
+    mover y el bit BIT_LIBRE indica si la celda no es pared. Las celdas se
+    identifican internamente con un entero id = i * columnas + j, y los vecinos se
+    calculan al vuelo a partir de la máscara, por lo que la memoria y el tiempo de
+    construcción dependen solo del número de celdas.
+
+    Se comporta como el diccionario de adyacencia de `matriz_a_grafo`
+    (grafo[(i, j)] → [((ni, nj), costo), ...]), de modo que los algoritmos que
+    reciben el grafo en forma de diccionario también lo aceptan.
+
+    Con terreno, `costos` guarda el costo de entrar a cada celda (int32, uno por
+    celda); sin terreno es None y todas las aristas pesan 1.
+    """
+
+    def __init__(self, mascaras, filas, columnas, costos=None):
+        self.filas = filas
+        self.columnas = columnas
+        # bytearray para indexar rápido desde Python y vista NumPy (sin copia) para operaciones vectorizadas.
+        self._buffer = bytearray(mascaras.tobytes())
+        self.mascaras = np.frombuffer(self._buffer, dtype=np.uint8)
+        self.costos = None if costos is None else np.array(costos, dtype=np.int32).ravel()
+        self._costo = None if costos is None else memoryview(self.costos)
+        self._desplazamientos_id = [
+            tuple(dx * columnas + dy for dx, dy in desplazamientos)
+            for desplazamientos in _DESPLAZAMIENTOS
+        ]
+
+    # ─ Identificadores enteros ─
+
+    def id_celda(self, nodo):
+        """Convierte una coordenada (i, j) en su identificador entero."""
+        return nodo[0] * self.columnas + nodo[1]
+
+    def coordenada(self, id_celda):
+        """Convierte un identificador entero en su coordenada (i, j)."""
+        return divmod(id_celda, self.columnas)
+
+    def es_libre(self, id_celda):
+        """Indica si la celda con el identificador dado no es pared."""
+        return self._buffer[id_celda] & BIT_LIBRE != 0
+
+    def vecinos_id(self, id_celda):
+        """Regresa los identificadores de los vecinos alcanzables desde una celda."""
+        return [id_celda + d for d in self._desplazamientos_id[self._buffer[id_celda] & 15]]
+
+    def grado(self, id_celda):
+        """Regresa el número de vecinos de una celda."""
+        return len(self._desplazamientos_id[self._buffer[id_celda] & 15])
+
+    def costo(self, nodo):
+        """Regresa el costo de entrar a una celda (1 sin terreno)."""
+        if self._costo is None:
+            return 1
+        return self._costo[nodo[0] * self.columnas + nodo[1]]
+
+    def predecesores(self, nodo):
+        """Aristas que llegan a una celda: [((ni, nj), costo), ...], todas con el costo de la celda."""
+        costo = self.costo(nodo)
+        return [(vecino, costo) for vecino, _ in self[nodo]]
+
+    def establecer_libre(self, id_celda, libre):
+        """Convierte una celda en libre o en pared y actualiza las máscaras de sus vecinos."""
+        i, j = divmod(id_celda, self.columnas)
+        mascara = BIT_LIBRE if libre else 0
+
+        for k, (dx, dy) in enumerate(MOVIMIENTOS):
+            ni, nj = i + dx, j + dy
+            if 0 <= ni < self.filas and 0 <= nj < self.columnas:
+                vecino = ni * self.columnas + nj
+                # En MOVIMIENTOS el movimiento opuesto a k es k ^ 1.
+                if libre and self._buffer[vecino] & BIT_LIBRE:
+                    mascara |= 1 << k
+                    self._buffer[vecino] |= 1 << (k ^ 1)
+                else:
+                    self._buffer[vecino] &= ~(1 << (k ^ 1)) & 0xFF
+
+        self._buffer[id_celda] = mascara
+        # Una celda que se libera queda sin terreno.
+        if libre and self._costo is not None:
+            self._costo[id_celda] = 1
+
+    # ─ Interfaz de diccionario de adyacencia ─
+
+    def __getitem__(self, nodo):
+        i, j = nodo
+        if not (0 <= i < self.filas and 0 <= j < self.columnas):
+            raise KeyError(nodo)
+
+        k = i * self.columnas + j
+        mascara = self._buffer[k]
+        if not mascara & BIT_LIBRE:
+            raise KeyError(nodo)
+
+        if self._costo is None:
+            return [((i + dx, j + dy), 1) for dx, dy in _DESPLAZAMIENTOS[mascara & 15]]
+        costo, columnas = self._costo, self.columnas
+        return [((i + dx, j + dy), costo[k + dx * columnas + dy]) for dx, dy in _DESPLAZAMIENTOS[mascara & 15]]
+
+    def __contains__(self, nodo):
+        try:
+            i, j = nodo
+        except (TypeError, ValueError):
+            return False
+        return (0 <= i < self.filas and 0 <= j < self.columnas
+                and self._buffer[i * self.columnas + j] & BIT_LIBRE != 0)
+
+    def __iter__(self):
+        for id_celda in np.flatnonzero(self.mascaras & BIT_LIBRE).tolist():
+            yield divmod(id_celda, self.columnas)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.mascaras & BIT_LIBRE))
+
+
+# Función para convertir la matriz del laberinto en un grafo de malla compacto.
+def matriz_a_grafo_compacto(laberinto, N=None):
+    """Función que toma la matriz del laberinto y la convierte en un GrafoMalla,
+    calculando las máscaras de movimiento de todas las celdas con arreglos desplazados
+
+    Args:
+        laberinto (List): Matriz que representa el laberinto (puede ser rectangular)
+        N (int, optional): Número de filas del laberinto; por defecto todas
+
+    Returns:
+        GrafoMalla: Grafo compacto equivalente al de matriz_a_grafo
+    """
+    filas, columnas = dimensiones(laberinto, N)
+    valores = np.asarray(laberinto)[:filas, :columnas]
+    libre = valores != 1
+    mascaras = np.where(libre, BIT_LIBRE, 0).astype(np.uint8)
+
+    # Un movimiento es válido si tanto la celda como su vecina son libres.
+    arriba = libre[1:, :] & libre[:-1, :]
+    izquierda = libre[:, 1:] & libre[:, :-1]
+    mascaras[1:, :] |= arriba.astype(np.uint8)            # bit 0: (-1, 0)
+    mascaras[:-1, :] |= arriba.astype(np.uint8) << 1      # bit 1: (1, 0)
+    mascaras[:, 1:] |= izquierda.astype(np.uint8) << 2    # bit 2: (0, -1)
+    mascaras[:, :-1] |= izquierda.astype(np.uint8) << 3   # bit 3: (0, 1)
+
+    # Solo se guardan costos si hay terreno; sin él todas las aristas pesan 1.
+    terreno = libre & (valores >= VALOR_MINIMO_TERRENO)
+    costos = np.where(terreno, valores, 1) if terreno.any() else None
+
+    return GrafoMalla(mascaras.ravel(), filas, columnas, costos)
+
+
+# Función para convertir una celda libre en pared o una pared en celda libre.
+def alternar_celda(grafo, celda):
+    """Función que alterna una celda entre libre y pared actualizando solo su adyacencia
+    y la de sus vecinos
+
+    Args:
+        grafo (dict | GrafoMalla): Grafo del laberinto, que se modifica en el lugar
+        celda (tuple): Coordenada de la celda a alternar
+
+    Returns:
+        bool: True si la celda quedó libre, False si quedó como pared
+    """
+    if isinstance(grafo, GrafoMalla):
+        if not (0 <= celda[0] < grafo.filas and 0 <= celda[1] < grafo.columnas):
+            raise KeyError(celda)
+        libre = celda not in grafo
+        grafo.establecer_libre(grafo.id_celda(celda), libre)
+        return libre
+
+    libre = celda not in grafo
+    # Una celda que se libera queda sin terreno, igual que en el GrafoMalla.
+    if isinstance(grafo, GrafoDiccionario):
+        grafo.costos.pop(celda, None)
+    if libre:
+        grafo[celda] = []
+    vecinos = [v for v, _ in _vecinos_libres(grafo, celda)]
+    if libre:
+        grafo[celda] = _vecinos_libres(grafo, celda)
+    else:
+        del grafo[celda]
+
+    # Las listas de los vecinos se rehacen en el orden de MOVIMIENTOS, igual que en matriz_a_grafo.
+    for vecino in vecinos:
+        grafo[vecino] = _vecinos_libres(grafo, vecino)
+
+    return libre
+
+
+def _vecinos_libres(grafo, celda):
+    # Las aristas que ya existían conservan su peso; las nuevas toman el costo de su destino.
+    i, j = celda
+    pesos = dict(grafo.get(celda, ()))
+    return [((i + dx, j + dy), pesos.get((i + dx, j + dy)) or costo_entrada(grafo, (i + dx, j + dy)))
+            for dx, dy in MOVIMIENTOS if (i + dx, j + dy) in grafo]
+
+
+# Función para obtener el costo de entrar a una celda en cualquiera de los dos grafos.
+def costo_entrada(grafo, celda):
+    """Función que regresa el costo de entrar a una celda libre
+
+    Args:
+        grafo (dict | GrafoMalla): Grafo del laberinto
+        celda (tuple): Coordenada de la celda
+
+    Returns:
+        int: Costo de entrar a la celda; en un dict sin costos guardados se deduce de las
+             aristas que llegan a ella (1 si no llega ninguna)
+    """
+    if isinstance(grafo, (GrafoMalla, GrafoDiccionario)):
+        return grafo.costo(celda)
+    for vecino, _ in grafo[celda]:
+        for destino, peso in grafo[vecino]:
+            if destino == celda:
+                return peso
+    return 1
@@ -0,0 +1,328 @@
+# jerarquico.py
+
+import time
+from collections import ChainMap, deque
+from collections.abc import Mapping
+
+import numpy as np
+
+from estadisticas import registrar_fase
+from grafo import MOVIMIENTOS
+from algoritmos import a_estrella_macro
+
+# Lado (en celdas) de cada cluster.
+TAMANO_CLUSTER = 16
+
+# Un tramo de frontera abierto de al menos esta longitud tiene dos transiciones (una en
+# cada extremo); uno más corto tiene una sola, en su punto medio.
+LARGO_ENTRADA = 6
+
+
+def _transiciones(abierto, tamano_cluster):
+    """Transiciones a lo largo de las fronteras entre clusters vecinos.
+
+    Args:
+        abierto (np.ndarray): Matriz booleana (fronteras x posiciones) con True donde se
+            puede cruzar la frontera
+        tamano_cluster (int): Lado de los clusters; los tramos se cortan en sus esquinas
+
+    Returns:
+        tuple: (frontera, posicion) de cada transición, como arreglos de enteros
+    """
+    fronteras, largo = abierto.shape
+    # Un tramo empieza donde la celda anterior está cerrada o pertenece a otro cluster.
+    anterior = np.zeros_like(abierto)
+    anterior[:, 1:] = abierto[:, :-1]
+    anterior[:, ::tamano_cluster] = False
+    siguiente = np.zeros_like(abierto)
+    siguiente[:, :-1] = abierto[:, 1:]
+    siguiente[:, tamano_cluster - 1::tamano_cluster] = False
+
+    frontera, inicio = np.nonzero(abierto & ~anterior)
+    _, fin = np.nonzero(abierto & ~siguiente)
+    largo_tramo = fin - inicio + 1
+
+    largos = largo_tramo >= LARGO_ENTRADA
+    frontera = np.concatenate([frontera[~largos], frontera[largos], frontera[largos]])
+    posicion = np.concatenate([(inicio + (largo_tramo - 1) // 2)[~largos], inicio[largos], fin[largos]])
+    return frontera, posicion
+
+
+class AbstraccionJerarquica:
+    """Abstracción jerárquica de la malla al estilo HPA*.
+
+    La malla (cuadrada o rectangular) se divide en clusters de tamano_cluster x
+    tamano_cluster. En cada tramo abierto de la frontera entre dos clusters vecinos se
+    colocan transiciones: un par de celdas, una a cada lado, unidas por una arista de
+    costo 1. Dentro de cada cluster se precalculan las distancias entre todas sus celdas
+    de transición, restringidas al cluster. Una consulta conecta inicio y meta a las
+    transiciones de su cluster, busca con A* en el grafo abstracto y refina solo los
+    clusters por los que pasa la ruta.
+
+    Los caminos no siempre son óptimos (las transiciones están en posiciones fijas de cada
+    tramo), pero el grafo abstracto crece con el número de clusters y no con el de celdas
+    ni el de nodos de decisión.
+    """
+
+    def __init__(self, grafo, tamano_cluster=TAMANO_CLUSTER):
+        """
+        Args:
+            grafo (GrafoMalla): Grafo compacto del laberinto
+            tamano_cluster (int, optional): Lado de cada cluster
+        """
+        if grafo.costos is not None:
+            raise ValueError("la abstracción jerárquica solo admite mallas de costo uniforme (sin terreno)")
+
+        t = time.perf_counter()
+        self.grafo = grafo
+        self.tamano_cluster = c = tamano_cluster
+        self.filas, self.columnas = filas, columnas = grafo.filas, grafo.columnas
+        self.clusters_por_fila = -(-columnas // c)
+
+        mascaras = grafo.mascaras.reshape(filas, columnas)
+
+        # 1. Transiciones entre clusters lado a lado (bit 3: derecha) y uno sobre otro (bit 1: abajo).
+        bordes_columna = np.arange(c - 1, columnas - 1, c)
+        frontera, fila = _transiciones((mascaras[:, bordes_columna].T >> 3 & 1).astype(bool), c)
+        izquierda = fila * columnas + bordes_columna[frontera]
+
+        bordes_fila = np.arange(c - 1, filas - 1, c)
+        frontera, columna = _transiciones((mascaras[bordes_fila, :] >> 1 & 1).astype(bool), c)
+        arriba = bordes_fila[frontera] * columnas + columna
+
+        origen_inter = np.concatenate([izquierda, arriba])
+        destino_inter = np.concatenate([izquierda + 1, arriba + columnas])
+
+        # Nodos abstractos: las celdas de transición, ordenadas por identificador de celda.
+        self.nodos_celda = np.unique(np.concatenate([origen_inter, destino_inter]))
+        self.coordenadas = list(zip(*(x.tolist() for x in np.divmod(self.nodos_celda, columnas))))
+        self.indice = {coordenada: k for k, coordenada in enumerate(self.coordenadas)}
+
+        # 2. Distancias dentro de cada cluster entre sus celdas de transición.
+        origen_intra, destino_intra, costo_intra = self._distancias_internas(mascaras)
+
+        # 3. Grafo abstracto en formato CSR: las aristas de cada nodo son contiguas.
+        a = np.searchsorted(self.nodos_celda, np.concatenate([origen_inter, destino_inter, origen_intra]))
+        b = np.searchsorted(self.nodos_celda, np.concatenate([destino_inter, origen_inter, destino_intra]))
+        costo = np.concatenate([np.ones(2 * len(origen_inter), dtype=np.int32), costo_intra])
+        orden = np.argsort(a, kind="stable")
+        self.destinos = b[orden].astype(np.int32)
+        self.costos = costo[orden].astype(np.int32)
+        self.desplazamientos = np.zeros(len(self.nodos_celda) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(a, minlength=len(self.nodos_celda)), out=self.desplazamientos[1:])
+
+        self.segundos_preprocesamiento = time.perf_counter() - t
+
+    @property
+    def nodos(self):
+        return len(self.nodos_celda)
+
+    @property
+    def aristas(self):
+        return len(self.destinos)
+
+    def cluster(self, celda):
+        """Identificador del cluster que contiene una celda."""
+        return (celda[0] // self.tamano_cluster) * self.clusters_por_fila + celda[1] // self.tamano_cluster
+
+    def _distancias_internas(self, mascaras):
+        """Distancias entre las transiciones de cada cluster, sin salir del cluster.
+
+        Todos los clusters se resuelven a la vez: en la ronda k, la k-ésima transición de
+        cada cluster es una fuente, y un solo BFS por frentes de onda sobre la malla
+        completa (con los movimientos que cruzan fronteras desactivados) calcula las
+        distancias desde todas ellas.
+
+        Returns:
+            tuple: (origen, destino, costo) de cada arista interna, como arreglos
+        """
+        c, columnas = self.tamano_cluster, self.columnas
+        filas_id, columnas_id = np.divmod(np.arange(mascaras.size), columnas)
+
+        # Máscaras sin los movimientos que salen del cluster (bits en el orden de MOVIMIENTOS).
+        internas = mascaras.ravel() & 15
+        internas = np.where(filas_id % c == 0, internas & 0b1110, internas)
+        internas = np.where(filas_id % c == c - 1, internas & 0b1101, internas)
+        internas = np.where(columnas_id % c == 0, internas & 0b1011, internas)
+        internas = np.where(columnas_id % c == c - 1, internas & 0b0111, internas)
+        pasos = [di * columnas + dj for di, dj in MOVIMIENTOS]
+
+        nodos = self.nodos_celda
+        cluster = (filas_id[nodos] // c) * self.clusters_por_fila + columnas_id[nodos] // c
+        orden = np.argsort(cluster, kind="stable")
+        nodos, cluster = nodos[orden], cluster[orden]
+        primero = np.searchsorted(cluster, cluster)
+        rango = np.arange(len(nodos)) - primero
+
+        total_clusters = self.clusters_por_fila * -(-self.filas // c)
+        origen, destino, costo = [], [], []
+        distancia = np.empty(mascaras.size, dtype=np.int32)
+
+        for k in range(int(rango.max(initial=-1)) + 1):
+            fuentes = nodos[rango == k]
+            fuente_del_cluster = np.full(total_clusters, -1, dtype=np.int64)
+            fuente_del_cluster[cluster[rango == k]] = fuentes
+
+            distancia.fill(-1)
+            distancia[fuentes] = 0
+            frente, d = fuentes, 0
+            while len(frente):
+                d += 1
+                mascara_frente = internas[frente]
+                candidatos = np.concatenate([frente[mascara_frente >> bit & 1 == 1] + paso
+                                             for bit, paso in enumerate(pasos)])
+                frente = np.unique(candidatos[distancia[candidatos] < 0])
+                distancia[frente] = d
+
+            fuente = fuente_del_cluster[cluster]
+            validas = (fuente >= 0) & (distancia[nodos] > 0)
+            origen.append(fuente[validas])
+            destino.append(nodos[validas])
+            costo.append(distancia[nodos[validas]])
+
+        vacio = np.zeros(0, dtype=np.int64)
+        return (np.concatenate(origen or [vacio]), np.concatenate(destino or [vacio]),
+                np.concatenate(costo or [vacio]).astype(np.int32))
+
+    def vecinos(self, nodo):
+        """Aristas abstractas de una celda de transición: [(vecino, costo), ...]."""
+        k = self.indice.get(nodo)
+        if k is None:
+            return []
+        a, b = self.desplazamientos[k], self.desplazamientos[k + 1]
+        coordenadas = self.coordenadas
+        return [(coordenadas[v], costo) for v, costo in zip(self.destinos[a:b].tolist(), self.costos[a:b].tolist())]
+
+    def _bfs_cluster(self, origen, destino=None):
+        """BFS desde una celda sin salir de su cluster.
+
+        Returns:
+            dict: {celda: celda_anterior} de las celdas alcanzadas; se detiene al llegar a destino
+        """
+        c = self.tamano_cluster
+        fila, columna = origen[0] // c * c, origen[1] // c * c
+        grafo = self.grafo
+        vino_de = {origen: None}
+        cola = deque([origen])
+        while cola:
+            actual = cola.popleft()
+            if actual == destino:
+                break
+            for vecino, _ in grafo[actual]:
+                if (vecino not in vino_de and fila <= vecino[0] < fila + c
+                        and columna <= vecino[1] < columna + c):
+                    vino_de[vecino] = actual
+                    cola.append(vecino)
+        return vino_de
+
+    def _conexiones(self, punto, otro):
+        """Aristas de un punto de consulta hacia las transiciones de su cluster (y hacia el
+        otro punto si está en el mismo cluster), con su costo dentro del cluster."""
+        vino_de = self._bfs_cluster(punto)
+        distancia = {punto: 0}
+        aristas = []
+        for celda, anterior in vino_de.items():
+            if anterior is not None:
+                distancia[celda] = distancia[anterior] + 1
+                if celda in self.indice or celda == otro:
+                    aristas.append((celda, distancia[celda]))
+        return aristas
+
+    @registrar_fase("reconstruccion")
+    def refinar(self, ruta_abstracta, estadisticas=None):
+        """Convierte la ruta abstracta en la ruta celda a celda, refinando solo los clusters
+        por los que pasa.
+
+        Args:
+            ruta_abstracta (list): Celdas de transición (más inicio y meta) en orden
+            estadisticas (Estadisticas, optional): Objeto donde se acumulan los tiempos
+
+        Returns:
+            list: Ruta completa, o None si la ruta abstracta es None
+        """
+        if ruta_abstracta is None:
+            return None
+
+        ruta = [ruta_abstracta[0]]
+        for a, b in zip(ruta_abstracta, ruta_abstracta[1:]):
+            if abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 and self.cluster(a) != self.cluster(b):
+                # Arista entre clusters: las dos celdas son vecinas.
+                ruta.append(b)
+                continue
+            vino_de = self._bfs_cluster(a, b)
+            tramo = []
+            while b != a:
+                tramo.append(b)
+                b = vino_de[b]
+            ruta.extend(reversed(tramo))
+        return ruta
+
+    def consultar(self, inicio, meta, componentes=None, estadisticas=None):
+        """Busca el camino entre inicio y meta: A* en el grafo abstracto y refinamiento.
+
+        Args:
+            inicio (tuple): Punto de inicio
+            meta (tuple): Punto de meta
+            componentes (IndiceComponentes, optional): Índice de componentes conexas; con
+                inicio y meta en componentes distintas se regresa sin conectarlos al grafo abstracto
+                (sin el índice, el A* abstracto recorre toda la componente del inicio)
+            estadisticas (Estadisticas, optional): Objeto donde se acumulan los contadores y tiempos
+
+        Returns:
+            tuple: (camino, nodos_expandidos) donde nodos_expandidos cuenta los nodos del
+                   grafo abstracto
+        """
+        if inicio not in self.grafo or meta not in self.grafo:
+            return None, 0
+        if componentes is not None and not componentes.conectados(inicio, meta):
+            return None, 0
+        if inicio == meta:
+            return [inicio], 0
+
+        # Aristas temporales de inicio y meta; las de la meta se agregan en sentido inverso.
+        temporales = {}
+        if inicio not in self.indice:
+            temporales[inicio] = self._conexiones(inicio, meta)
+        if meta not in self.indice:
+            for celda, costo in self._conexiones(meta, inicio):
+                if celda not in temporales:
+                    temporales[celda] = self.vecinos(celda)
+                temporales[celda].append((meta, costo))
+
+        vista = ChainMap(temporales, _GrafoAbstracto(self))
+        ruta_abstracta, nodos_expandidos = a_estrella_macro(vista, inicio, meta, estadisticas=estadisticas)
+        return self.refinar(ruta_abstracta, estadisticas=estadisticas), nodos_expandidos
+
+
+class _GrafoAbstracto(Mapping):
+    """Vista de diccionario de adyacencia sobre el grafo abstracto en formato CSR."""
+
+    def __init__(self, abstraccion):
+        self.abstraccion = abstraccion
+
+    def __getitem__(self, nodo):
+        if nodo not in self.abstraccion.indice:
+            raise KeyError(nodo)
+        return self.abstraccion.vecinos(nodo)
+
+    def __iter__(self):
+        return iter(self.abstraccion.coordenadas)
+
+    def __len__(self):
+        return self.abstraccion.nodos
+
+
+# Función para construir la abstracción jerárquica.
+@registrar_fase("construccion")
+def construir_abstraccion(grafo, tamano_cluster=TAMANO_CLUSTER, estadisticas=None):
+    """Función que construye la abstracción jerárquica (HPA*) de la malla
+
+    Args:
+        grafo (GrafoMalla): Grafo compacto del laberinto
+        tamano_cluster (int, optional): Lado de cada cluster
+        estadisticas (Estadisticas, optional): Objeto donde se acumulan los tiempos
+
+    Returns:
+        AbstraccionJerarquica: Abstracción lista para consultar
+    """
+    return AbstraccionJerarquica(grafo, tamano_cluster)
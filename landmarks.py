@@ -0,0 +1,297 @@
+# landmarks.py
+
+import random
+import time
+from collections import deque
+
+import numpy as np
+
+from algoritmos import a_estrella, a_estrella_macro
+from cache_macro import (
+    DIRECTORIO_CACHE,
+    LIMITE_BYTES,
+    clave_laberinto,
+    guardar_arreglos,
+    cargar_arreglos
+)
+from grafo import GrafoMalla
+from monticulo import ColaCubetas
+
+# Número de landmarks por defecto.
+K_LANDMARKS = 8
+
+# Valor de las tablas para las celdas que no se alcanzan desde un landmark (o que son pared).
+INALCANZABLE = -1
+
+
+class Landmarks:
+    """Tablas de distancias exactas desde K landmarks para la heurística ALT.
+
+    Por la desigualdad del triángulo, |d(L, n) - d(L, meta)| ≤ d(n, meta) para cualquier
+    landmark L, así que el máximo sobre los landmarks (y la distancia Manhattan) es una
+    heurística admisible y consistente. Las tablas son un arreglo int32 de K x (filas *
+    columnas) indexado por el identificador de celda, por lo que sirven tanto para el
+    grafo de celdas como para el macro-grafo (cuyos nodos también son celdas).
+
+    Con terreno las distancias son dirigidas: un camino cuesta lo mismo al revés salvo
+    que entra al origen en lugar de al destino, d(n, L) = d(L, n) - c(n) + c(L), así que
+    la cota hacia atrás se obtiene de la misma tabla con los costos c de las celdas.
+    """
+
+    def __init__(self, landmarks, distancias, columnas, costos=None):
+        """
+        Args:
+            landmarks (list): Coordenadas de los landmarks
+            distancias (np.ndarray): Tabla int32 (K x celdas) con la distancia desde cada landmark
+            columnas (int): Número de columnas de la malla (para calcular el id de una celda)
+            costos (np.ndarray, optional): Costo de entrar a cada celda, o None sin terreno
+        """
+        self.landmarks = landmarks
+        self.distancias = distancias
+        self.columnas = columnas
+        # Vistas de memoria por fila: indexarlas desde Python es mucho más rápido que indexar NumPy.
+        self._filas = [memoryview(fila) for fila in distancias]
+        self._costos = None if costos is None else memoryview(np.ascontiguousarray(costos, dtype=np.int32))
+
+    def costo(self, nodo):
+        """Costo de entrar a una celda (1 sin terreno), el mismo con que se calcularon las tablas."""
+        if self._costos is None:
+            return 1
+        return self._costos[nodo[0] * self.columnas + nodo[1]]
+
+    @property
+    def memoria_bytes(self):
+        """Bytes que ocupan las tablas de distancias."""
+        return self.distancias.nbytes
+
+    def heuristica(self, nodo, meta):
+        """Heurística ALT: la mayor cota inferior entre los landmarks y la distancia Manhattan
+
+        Args:
+            nodo (tuple): Coordenadas del nodo actual
+            meta (tuple): Coordenadas del nodo meta
+
+        Returns:
+            int: Cota inferior de la distancia entre los dos puntos
+        """
+        mejor = abs(nodo[0] - meta[0]) + abs(nodo[1] - meta[1])
+        i = nodo[0] * self.columnas + nodo[1]
+        j = meta[0] * self.columnas + meta[1]
+
+        if self._costos is not None:
+            # d(n, meta) ≥ d(L, meta) - d(L, n)  y  d(n, meta) ≥ d(n, L) - d(meta, L).
+            ajuste = self._costos[j] - self._costos[i]
+            for fila in self._filas:
+                a = fila[i]
+                b = fila[j]
+                if a >= 0 and b >= 0:
+                    cota = b - a if b - a > a - b + ajuste else a - b + ajuste
+                    if cota > mejor:
+                        mejor = cota
+            return mejor
+
+        for fila in self._filas:
+            a = fila[i]
+            b = fila[j]
+            # Un landmark que no alcanza alguno de los dos puntos no aporta cota.
+            if a >= 0 and b >= 0:
+                cota = a - b if a > b else b - a
+                if cota > mejor:
+                    mejor = cota
+
+        return mejor
+
+
+def _dimensiones(grafo):
+    """Regresa (filas, columnas) de la malla que contiene al grafo."""
+    if isinstance(grafo, GrafoMalla):
+        return grafo.filas, grafo.columnas
+    filas = max((i for i, _ in grafo), default=-1) + 1
+    columnas = max((j for _, j in grafo), default=-1) + 1
+    return filas, columnas
+
+
+def _costos(grafo, filas, columnas):
+    """Costo de entrar a cada celda (arreglo int32), o None si todas las aristas pesan 1."""
+    if isinstance(grafo, GrafoMalla):
+        return grafo.costos
+
+    costos = np.ones(filas * columnas, dtype=np.int32)
+    for aristas in grafo.values():
+        for (i, j), peso in aristas:
+            costos[i * columnas + j] = peso
+    return costos if (costos != 1).any() else None
+
+
+def distancias_desde(grafo, origen, filas, columnas, ponderado=False):
+    """Calcula con BFS la distancia desde una celda a todas las demás
+
+    Con terreno (ponderado=True) usa Dijkstra con una cola de cubetas.
+
+    Args:
+        grafo (dict | GrafoMalla): Grafo del laberinto
+        origen (tuple): Celda de partida
+        filas (int): Número de filas de la malla
+        columnas (int): Número de columnas de la malla
+        ponderado (bool, optional): Si las aristas tienen pesos distintos de 1
+
+    Returns:
+        np.ndarray: Arreglo int32 de filas * columnas con la distancia a cada celda (INALCANZABLE si no se alcanza)
+    """
+    distancia = [INALCANZABLE] * (filas * columnas)
+    inicio = origen[0] * columnas + origen[1]
+    distancia[inicio] = 0
+    cola = deque([inicio])
+
+    if ponderado:
+        cola = ColaCubetas()
+        cola.agregar((0, inicio))
+        while cola:
+            d, actual = cola.extraer()
+            if d != distancia[actual]:
+                continue
+            for (vi, vj), peso in grafo[divmod(actual, columnas)]:
+                vecino = vi * columnas + vj
+                if distancia[vecino] < 0 or d + peso < distancia[vecino]:
+                    distancia[vecino] = d + peso
+                    cola.agregar((d + peso, vecino))
+    elif isinstance(grafo, GrafoMalla):
+        while cola:
+            actual = cola.popleft()
+            siguiente = distancia[actual] + 1
+            for vecino in grafo.vecinos_id(actual):
+                if distancia[vecino] < 0:
+                    distancia[vecino] = siguiente
+                    cola.append(vecino)
+    else:
+        while cola:
+            actual = cola.popleft()
+            siguiente = distancia[actual] + 1
+            for (vi, vj), _ in grafo[divmod(actual, columnas)]:
+                vecino = vi * columnas + vj
+                if distancia[vecino] < 0:
+                    distancia[vecino] = siguiente
+                    cola.append(vecino)
+
+    return np.array(distancia, dtype=np.int32)
+
+
+# Función para elegir los landmarks y calcular sus tablas de distancias.
+def preprocesar_landmarks(grafo, k=K_LANDMARKS, semilla=0):
+    """Función que elige k landmarks y calcula sus tablas de distancias exactas
+
+    Los landmarks se eligen por el criterio del más lejano: se parte de una celda al azar
+    y cada nuevo landmark es la celda alcanzable más lejana a los ya elegidos, lo que los
+    reparte por la periferia del laberinto, donde dan las mejores cotas.
+
+    Args:
+        grafo (dict | GrafoMalla): Grafo del laberinto
+        k (int, optional): Número de landmarks
+        semilla (int, optional): Semilla para elegir la celda de partida
+
+    Returns:
+        Landmarks: Landmarks con sus tablas de distancias
+    """
+    filas, columnas = _dimensiones(grafo)
+    distancias = np.full((k, filas * columnas), INALCANZABLE, dtype=np.int32)
+    landmarks = []
+    costos = _costos(grafo, filas, columnas)
+    ponderado = costos is not None
+
+    celdas = list(grafo)
+    if not celdas or k == 0:
+        return Landmarks(landmarks, distancias[:0], columnas, costos)
+
+    # Distancia mínima de cada celda a los landmarks elegidos (al inicio, a la celda al azar).
+    cercania = distancias_desde(grafo, random.Random(semilla).choice(celdas), filas, columnas, ponderado)
+
+    for n in range(k):
+        # La celda alcanzable más lejana; si todas son ya landmarks, se termina.
+        elegida = int(np.argmax(cercania))
+        if cercania[elegida] <= 0 and n > 0:
+            break
+
+        landmarks.append(divmod(elegida, columnas))
+        distancias[n] = distancias_desde(grafo, landmarks[-1], filas, columnas, ponderado)
+        cercania = distancias[n] if n == 0 else np.where(
+            distancias[n] >= 0, np.minimum(cercania, distancias[n]), cercania)
+
+    return Landmarks(landmarks, distancias[:len(landmarks)], columnas, costos)
+
+
+# Función para obtener los landmarks desde la caché.
+def preprocesar_landmarks_en_cache(laberinto, grafo, k=K_LANDMARKS, semilla=0,
+                                   directorio=DIRECTORIO_CACHE, limite_bytes=LIMITE_BYTES):
+    """Función que carga las tablas de landmarks de la caché, o las calcula y las guarda
+
+    Args:
+        laberinto (List | np.ndarray): Matriz que representa el laberinto
+        grafo (dict | GrafoMalla): Grafo del laberinto
+        k (int, optional): Número de landmarks
+        semilla (int, optional): Semilla para elegir la celda de partida
+        directorio (str, optional): Directorio de la caché
+        limite_bytes (int, optional): Tamaño máximo de la caché en disco
+
+    Returns:
+        Landmarks: Landmarks con sus tablas de distancias
+    """
+    clave = clave_laberinto(laberinto, "landmarks", k, semilla)
+
+    arreglos = cargar_arreglos(clave, directorio)
+    if arreglos is not None:
+        landmarks = [tuple(celda) for celda in arreglos["landmarks"].tolist()]
+        filas, columnas = _dimensiones(grafo)
+        return Landmarks(landmarks, arreglos["distancias"], int(arreglos["columnas"]),
+                         _costos(grafo, filas, columnas))
+
+    resultado = preprocesar_landmarks(grafo, k, semilla)
+    guardar_arreglos(
+        clave,
+        {
+            "landmarks": np.array(resultado.landmarks, dtype=np.int32).reshape(-1, 2),
+            "distancias": resultado.distancias,
+            "columnas": np.array(resultado.columnas),
+        },
+        directorio,
+        limite_bytes,
+    )
+    return resultado
+
+
+# Función para comparar el efecto del número de landmarks.
+def comparar_landmarks(grafo, consultas, valores_k, macro_grafo=None):
+    """Función que mide, para cada número de landmarks, el tiempo de preprocesamiento, la
+    memoria de las tablas y los nodos expandidos por A* (y A* Macro) con la heurística ALT
+
+    Args:
+        grafo (dict | GrafoMalla): Grafo del laberinto
+        consultas (list): Lista de pares (inicio, meta)
+        valores_k (list): Números de landmarks a probar (0 equivale a la distancia Manhattan)
+        macro_grafo (dict, optional): Macro-grafo construido para esas consultas
+
+    Returns:
+        list: Una fila por valor de k con las llaves k, segundos, memoria_bytes,
+              expandidos y expandidos_macro (totales sobre todas las consultas)
+    """
+    filas = []
+    for k in valores_k:
+        t = time.perf_counter()
+        landmarks = preprocesar_landmarks(grafo, k)
+        segundos = time.perf_counter() - t
+
+        expandidos = sum(a_estrella(grafo, inicio, meta, landmarks.heuristica)[1]
+                         for inicio, meta in consultas)
+        expandidos_macro = None
+        if macro_grafo is not None:
+            expandidos_macro = sum(a_estrella_macro(macro_grafo, inicio, meta, landmarks.heuristica)[1]
+                                   for inicio, meta in consultas)
+
+        filas.append({
+            "k": k,
+            "segundos": segundos,
+            "memoria_bytes": landmarks.memoria_bytes,
+            "expandidos": expandidos,
+            "expandidos_macro": expandidos_macro,
+        })
+
+    return filas
@@ -0,0 +1,302 @@
+# lote.py
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from formato_laberinto import EXTENSION_BINARIA, cargar_laberinto
+from grafo import encontrar_puntos, matriz_a_grafo_compacto
+from algoritmos import (
+    bfs,
+    a_estrella,
+    a_estrella_macro,
+    construir_macro_grafo,
+    reconstruir_ruta_completa,
+    jps
+)
+from componentes import IndiceComponentes
+from jerarquico import construir_abstraccion
+
+# Extensiones que se toman al recibir un directorio.
+EXTENSIONES = (".txt", EXTENSION_BINARIA)
+
+ALGORITMOS = ("a_estrella_macro", "a_estrella", "bfs", "jps", "jerarquico")
+
+# Columnas de cada resultado, en el orden en que se escriben en CSV.
+CAMPOS = (
+    "archivo", "algoritmo", "filas", "columnas", "longitud", "nodos_expandidos",
+    "nodos_decision", "t_carga", "t_grafo", "t_macro", "t_busqueda", "t_total", "error"
+)
+
+
+# Función para obtener la lista de laberintos a resolver.
+def listar_laberintos(entradas):
+    """Función que expande directorios y patrones glob a la lista de archivos de laberinto
+
+    Args:
+        entradas (list): Directorios, patrones glob o rutas de archivos
+
+    Returns:
+        list: Rutas de los laberintos, ordenadas y sin repetir
+    """
+    rutas = set()
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            for nombre in os.listdir(entrada):
+                if nombre.endswith(EXTENSIONES):
+                    rutas.add(os.path.join(entrada, nombre))
+        else:
+            rutas.update(ruta for ruta in glob.glob(entrada) if os.path.isfile(ruta))
+
+    return sorted(rutas)
+
+
+# Función que resuelve un laberinto completo; se ejecuta en los procesos del pool.
+def resolver_laberinto(ruta, algoritmo="a_estrella_macro", conservar_camino=False):
+    """Función que carga un laberinto, construye su grafo (y macro-grafo) y lo resuelve,
+    midiendo el tiempo de cada fase
+
+    Los errores se capturan y se regresan en el campo "error" para que un archivo
+    inválido no detenga el lote. Con grafo, las búsquedas reciben un IndiceComponentes
+    y un laberinto sin solución se rechaza sin buscar; JPS, que no construye el grafo,
+    no tiene esa salida temprana y explora toda la componente del inicio.
+
+    Args:
+        ruta (str): Ruta del archivo del laberinto
+        algoritmo (str, optional): Uno de ALGORITMOS
+        conservar_camino (bool, optional): Si es True, el resultado incluye el camino en
+            la llave "camino" (solo hace falta para dibujarlo)
+
+    Returns:
+        dict: Resultado con las llaves de CAMPOS
+    """
+    resultado = dict.fromkeys(CAMPOS)
+    resultado["archivo"] = ruta
+    resultado["algoritmo"] = algoritmo
+    t_inicio = time.perf_counter()
+
+    try:
+        t = time.perf_counter()
+        laberinto = cargar_laberinto(ruta)
+        n = len(laberinto)
+        inicio, meta = encontrar_puntos(laberinto, n)
+        resultado["filas"] = n
+        resultado["columnas"] = len(laberinto[0]) if n else 0
+        resultado["t_carga"] = time.perf_counter() - t
+
+        if inicio is None or meta is None:
+            raise ValueError("el laberinto no tiene inicio o meta")
+
+        if algoritmo == "jps":
+            # JPS trabaja directo sobre la matriz, sin grafo.
+            t = time.perf_counter()
+            camino, expandidos = jps(laberinto, n, inicio, meta)
+            resultado["t_busqueda"] = time.perf_counter() - t
+        else:
+            t = time.perf_counter()
+            grafo = matriz_a_grafo_compacto(laberinto, n)
+            # El índice de componentes cuenta como parte del grafo: con él, un laberinto
+            # sin solución se rechaza sin buscar.
+            componentes = IndiceComponentes(grafo)
+            resultado["t_grafo"] = time.perf_counter() - t
+
+            if algoritmo == "a_estrella_macro":
+                t = time.perf_counter()
+                macro_grafo, nodos_decision, corredores = construir_macro_grafo(grafo, inicio, meta)
+                resultado["t_macro"] = time.perf_counter() - t
+                resultado["nodos_decision"] = len(nodos_decision)
+
+                t = time.perf_counter()
+                ruta_compacta, expandidos = a_estrella_macro(macro_grafo, inicio, meta, componentes=componentes)
+                camino = reconstruir_ruta_completa(ruta_compacta, corredores)
+                resultado["t_busqueda"] = time.perf_counter() - t
+            elif algoritmo == "jerarquico":
+                # La construcción de la abstracción de clusters se reporta como t_macro.
+                t = time.perf_counter()
+                abstraccion = construir_abstraccion(grafo)
+                resultado["t_macro"] = time.perf_counter() - t
+
+                t = time.perf_counter()
+                camino, expandidos = abstraccion.consultar(inicio, meta, componentes=componentes)
+                resultado["t_busqueda"] = time.perf_counter() - t
+            elif algoritmo == "a_estrella":
+                t = time.perf_counter()
+                camino, expandidos = a_estrella(grafo, inicio, meta, componentes=componentes)
+                resultado["t_busqueda"] = time.perf_counter() - t
+            elif algoritmo == "bfs":
+                t = time.perf_counter()
+                camino, expandidos, _ = bfs(grafo, inicio, meta, componentes=componentes)
+                resultado["t_busqueda"] = time.perf_counter() - t
+            else:
+                raise ValueError(f"algoritmo desconocido: {algoritmo}")
+
+        resultado["longitud"] = len(camino) if camino else None
+        resultado["nodos_expandidos"] = expandidos
+        if conservar_camino:
+            resultado["camino"] = camino
+    except Exception as e:
+        resultado["error"] = f"{type(e).__name__}: {e}"
+
+    resultado["t_total"] = time.perf_counter() - t_inicio
+    return resultado
+
+
+# Función que dibuja un resultado; se ejecuta en un pool aparte para no frenar las búsquedas.
+def dibujar_resultado(ruta, camino, algoritmo, directorio):
+    """Función que dibuja el recorrido de un laberinto del lote
+
+    La imagen se guarda como recorrido_<archivo>_<algoritmo>.png dentro del directorio.
+
+    Args:
+        ruta (str): Ruta del archivo del laberinto
+        camino (List): Camino encontrado
+        algoritmo (str): Nombre del algoritmo
+        directorio (str): Directorio donde se guardan las imágenes
+    """
+    # Importación local: matplotlib solo se carga en los procesos que dibujan.
+    from dibujar_laberinto import dibujar_recorrido
+
+    laberinto = cargar_laberinto(ruta)
+    nombre = os.path.splitext(os.path.basename(ruta))[0]
+    dibujar_recorrido(laberinto, len(laberinto), camino, f"{nombre}_{algoritmo}", directorio)
+
+
+class EscritorResultados:
+    """Escribe los resultados en JSONL o CSV (según la extensión) conforme van llegando.
+
+    Cada línea se vacía al disco en cuanto se escribe, así que el archivo puede leerse
+    mientras el lote sigue en curso y lo ya escrito sobrevive a una interrupción.
+    """
+
+    def __init__(self, ruta):
+        """
+        Args:
+            ruta (str): Ruta del archivo de salida (.csv para CSV, cualquier otra para JSONL),
+                o "-" para la salida estándar en JSONL
+        """
+        self.archivo = sys.stdout if ruta == "-" else open(ruta, "w", newline="")
+        self.csv = None
+        if ruta.endswith(".csv"):
+            self.csv = csv.DictWriter(self.archivo, fieldnames=CAMPOS, extrasaction="ignore")
+            self.csv.writeheader()
+
+    def escribir(self, resultado):
+        if self.csv is not None:
+            self.csv.writerow(resultado)
+        else:
+            self.archivo.write(json.dumps({c: resultado[c] for c in CAMPOS}) + "\n")
+        self.archivo.flush()
+
+    def cerrar(self):
+        if self.archivo is not sys.stdout:
+            self.archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+# Función principal del lote.
+def resolver_lote(rutas, salida, algoritmo="a_estrella_macro", trabajadores=None,
+                  directorio_imagenes=None, trabajadores_dibujo=1):
+    """Función que resuelve una lista de laberintos en un pool de procesos y escribe cada
+    resultado en cuanto termina
+
+    Se mantienen en vuelo a lo sumo cuatro tareas por trabajador, para que la memoria no
+    crezca con el número de archivos. Si se piden imágenes, se dibujan en un segundo pool
+    que no retrasa a las búsquedas.
+
+    Args:
+        rutas (list): Rutas de los laberintos
+        salida (str): Archivo de resultados (JSONL o CSV)
+        algoritmo (str, optional): Uno de ALGORITMOS
+        trabajadores (int, optional): Procesos para resolver (por defecto, uno por CPU)
+        directorio_imagenes (str, optional): Si se indica, se dibuja cada recorrido en ese directorio
+        trabajadores_dibujo (int, optional): Procesos para dibujar
+
+    Returns:
+        dict: Resumen con las llaves resueltos, sin_solucion, errores y segundos
+    """
+    trabajadores = trabajadores or os.cpu_count() or 1
+    dibujar = directorio_imagenes is not None
+    if dibujar:
+        os.makedirs(directorio_imagenes, exist_ok=True)
+
+    resumen = {"resueltos": 0, "sin_solucion": 0, "errores": 0}
+    t = time.perf_counter()
+
+    pool_dibujo = ProcessPoolExecutor(trabajadores_dibujo) if dibujar else None
+    dibujos = []
+    pendientes = set()
+    siguiente = iter(rutas)
+
+    with EscritorResultados(salida) as escritor, ProcessPoolExecutor(trabajadores) as pool:
+        while True:
+            for ruta in siguiente:
+                pendientes.add(pool.submit(resolver_laberinto, ruta, algoritmo, dibujar))
+                if len(pendientes) >= 4 * trabajadores:
+                    break
+            if not pendientes:
+                break
+
+            listos, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+            for futuro in listos:
+                resultado = futuro.result()
+                escritor.escribir(resultado)
+
+                if resultado["error"] is not None:
+                    resumen["errores"] += 1
+                elif resultado["longitud"] is None:
+                    resumen["sin_solucion"] += 1
+                else:
+                    resumen["resueltos"] += 1
+                    if dibujar:
+                        dibujos.append(pool_dibujo.submit(
+                            dibujar_resultado, resultado["archivo"], resultado["camino"],
+                            algoritmo, directorio_imagenes))
+
+    resumen["segundos"] = time.perf_counter() - t
+
+    if pool_dibujo is not None:
+        for futuro in dibujos:
+            futuro.result()
+        pool_dibujo.shutdown()
+
+    return resumen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resuelve en paralelo un lote de laberintos.")
+    parser.add_argument("entradas", nargs="+",
+                        help="directorios, patrones glob o archivos de laberinto (.txt o .lab)")
+    parser.add_argument("-o", "--salida", default="resultados.jsonl",
+                        help="archivo de resultados: .csv para CSV, otro para JSONL, - para la salida estándar")
+    parser.add_argument("-a", "--algoritmo", choices=ALGORITMOS, default="a_estrella_macro")
+    parser.add_argument("-j", "--trabajadores", type=int, default=None,
+                        help="procesos para resolver (por defecto, uno por CPU)")
+    parser.add_argument("--imagenes", metavar="DIRECTORIO", default=None,
+                        help="dibuja cada recorrido en este directorio")
+    parser.add_argument("--trabajadores-dibujo", type=int, default=1,
+                        help="procesos para dibujar las imágenes")
+    args = parser.parse_args(argv)
+
+    rutas = listar_laberintos(args.entradas)
+    if not rutas:
+        parser.error("no se encontraron laberintos")
+
+    resumen = resolver_lote(rutas, args.salida, args.algoritmo, args.trabajadores,
+                            args.imagenes, args.trabajadores_dibujo)
+
+    print(f"{len(rutas)} laberintos en {resumen['segundos']:.2f} s: {resumen['resueltos']} resueltos, "
+          f"{resumen['sin_solucion']} sin solución, {resumen['errores']} con error", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,68 @@
 # main.py
 
-from grafo import encontrar_puntos, matriz_a_grafo
+import argparse
+import json
+
+from formato_laberinto import cargar_laberinto
+from grafo import encontrar_puntos, matriz_a_grafo_compacto
 from algoritmos import (
     dfs, bfs,
     a_estrella,
-    construir_macro_grafo,
     a_estrella_macro,
-    reconstruir_ruta_completa
+    reconstruir_ruta_completa,
+    bfs_bidireccional,
+    a_estrella_bidireccional,
+    a_estrella_macro_bidireccional,
+    jps
 )
-from dibujar_laberinto import dibujar_laberinto, dibujar_recorrido
+from cache_macro import construir_macro_grafo_en_cache
+from componentes import IndiceComponentes
+from landmarks import comparar_landmarks
+from contraccion import comparar_contraccion
+
+# Algoritmos que se pueden elegir con -a, en el orden en que se ejecutan.
+ALGORITMOS = ("dfs", "bfs", "a_estrella", "jps", "a_estrella_macro")
+
+# Formatos de salida: texto legible, una línea JSON por algoritmo o nada (solo resolver).
+FORMATOS = ("texto", "json", "ninguno")
+
+# Título con que se imprime cada algoritmo y nombre de su imagen (None si no se dibuja).
+TITULOS = {
+    "dfs": ("DFS", "DFS"),
+    "bfs": ("BFS", "BFS"),
+    "a_estrella": ("A* (original, paso a paso)", "A_estrella"),
+    "jps": ("JPS (Jump Point Search)", None),
+    "a_estrella_macro": ("A* Macro (ruta completa reconstruida)", "A_estrella_macro"),
+}
 
 
 # Función para imprimir los resultados de cada algoritmo de manera clara.
-def imprimir_resultado(nombre, camino, nodos_expandidos=None):
+def imprimir_resultado(nombre, camino, nodos_expandidos=None, nodos_generados=None, formato="texto"):
     """Función que imprime el recorrido que ha tomado el algoritmo
 
+    Con formato "ninguno" regresa sin tocar el camino, así que no se arma la cadena
+    (que en laberintos grandes ocupa decenas de megabytes).
+
     Args:
         nombre (str): Nombre del algoritmo
         camino (List): Camino encontrado por el algoritmo
-        nodos_expandidos (int, optional): Número de nodos expandidos (solo A*)
+        nodos_expandidos (int, optional): Número de nodos expandidos
+        nodos_generados (int, optional): Número de nodos generados (agregados a la frontera)
+        formato (str, optional): Uno de FORMATOS
     """
+    if formato == "ninguno":
+        return
+
+    if formato == "json":
+        print(json.dumps({
+            "algoritmo": nombre,
+            "longitud": len(camino) if camino else None,
+            "nodos_expandidos": nodos_expandidos,
+            "nodos_generados": nodos_generados,
+            "camino": list(camino) if camino else None,
+        }))
+        return
+
     print("\n" + "=" * 40)
     print(nombre)
     print("=" * 40)
@@ -27,103 +70,203 @@ def imprimir_resultado(nombre, camino, nodos_expandidos=None):
         print("Ruta encontrada:")
         print(camino)
         print("Longitud:", len(camino))
-        if nodos_expandidos is not None:
-            print("Nodos expandidos:", nodos_expandidos)
     else:
         print("No se encontró solución.")
-        if nodos_expandidos is not None:
-            print("Nodos expandidos:", nodos_expandidos)
+    if nodos_expandidos is not None:
+        print("Nodos expandidos:", nodos_expandidos)
+    if nodos_generados is not None:
+        print("Nodos generados:", nodos_generados)
+
+
+# Función que imprime el análisis comparativo entre los algoritmos.
+def imprimir_comparativo(grafo, macro_grafo, corredores, inicio, meta, resultados, ruta_compacta,
+                         componentes=None):
+    """Función que imprime la comparación de nodos expandidos, nodos generados y longitud
+    de la ruta, junto con las versiones bidireccionales, los landmarks (ALT) y la
+    jerarquía de contracción
+
+    Args:
+        grafo (GrafoMalla): Grafo del laberinto
+        macro_grafo (dict): Macro-grafo con los nodos de decisión
+        corredores (Mapping): Corredores del macro-grafo
+        inicio (tuple): Punto de inicio
+        meta (tuple): Punto de meta
+        resultados (dict): {algoritmo: (camino, nodos_expandidos, nodos_generados)}
+        ruta_compacta (list): Ruta de A* Macro sobre los nodos de decisión
+        componentes (IndiceComponentes, optional): Índice de componentes conexas del grafo;
+            sin él, las búsquedas bidireccionales no rechazan de inmediato un laberinto sin solución
+    """
+    camino_dfs, expandidos_dfs, generados_dfs = resultados["dfs"]
+    camino_bfs, expandidos_bfs, generados_bfs = resultados["bfs"]
+    camino_astar, expandidos_astar, _ = resultados["a_estrella"]
+    ruta_completa, expandidos_macro, _ = resultados["a_estrella_macro"]
+    camino_jps, expandidos_jps, _ = resultados.get("jps", (None, None, None))
+
+    # ─ Búsquedas bidireccionales ─
+    _, expandidos_bfs_bi, _ = bfs_bidireccional(grafo, inicio, meta, componentes=componentes)
+    _, expandidos_astar_bi = a_estrella_bidireccional(grafo, inicio, meta, componentes=componentes)
+    _, expandidos_macro_bi = a_estrella_macro_bidireccional(macro_grafo, inicio, meta, componentes=componentes)
+
+    print("\n" + "=" * 40)
+    print("ANÁLISIS COMPARATIVO")
+    print("=" * 40)
+    if not (camino_astar and ruta_completa):
+        return
+
+    print(f"{'Métrica':<35} {'DFS':>10} {'BFS':>10} {'A* Original':>12} {'A* Macro':>10}")
+    print("-" * 81)
+    print(f"{'Nodos expandidos':<35} {expandidos_dfs:>10} {expandidos_bfs:>10} "
+          f"{expandidos_astar:>12} {expandidos_macro:>10}")
+    print(f"{'Nodos generados':<35} {generados_dfs:>10} {generados_bfs:>10} {'—':>12} {'—':>10}")
+    print(f"{'Longitud de la ruta (pasos)':<35} {len(camino_dfs):>10} {len(camino_bfs):>10} "
+          f"{len(camino_astar):>12} {len(ruta_completa):>10}")
+    print(f"{'Nodos de decisión en la ruta':<35} {'—':>10} {'—':>10} {'—':>12} {len(ruta_compacta):>10}")
+    reduccion = (1 - expandidos_macro / expandidos_astar) * 100
+    print(f"\nReducción de nodos expandidos (A* Macro vs A* Original): {reduccion:.1f}%")
+    if camino_jps:
+        reduccion_jps = (1 - expandidos_jps / expandidos_astar) * 100
+        print(f"Reducción de nodos expandidos (JPS vs A* Original): {reduccion_jps:.1f}%")
+
+    print(f"\n{'Nodos expandidos':<35} {'Unidireccional':>15} {'Bidireccional':>15} {'Reducción':>10}")
+    print("-" * 78)
+    for nombre, uni, bi in (("BFS", expandidos_bfs, expandidos_bfs_bi),
+                            ("A* Original", expandidos_astar, expandidos_astar_bi),
+                            ("A* Macro", expandidos_macro, expandidos_macro_bi)):
+        print(f"{nombre:<35} {uni:>15} {bi:>15} {(1 - bi / uni) * 100:>9.1f}%")
+
+    # Heurística ALT: memoria de las tablas contra nodos expandidos según el número de landmarks.
+    print(f"\n{'Landmarks (ALT)':<20} {'Memoria (bytes)':>16} {'Prepro. (s)':>12} {'A* Original':>12} {'A* Macro':>10}")
+    print("-" * 74)
+    for fila in comparar_landmarks(grafo, [(inicio, meta)], (0, 2, 4, 8), macro_grafo):
+        print(f"{'K = ' + str(fila['k']):<20} {fila['memoria_bytes']:>16} {fila['segundos']:>12.3f} "
+              f"{fila['expandidos']:>12} {fila['expandidos_macro']:>10}")
 
+    # Jerarquía de contracción sobre el macro-grafo.
+    contraccion = comparar_contraccion(macro_grafo, corredores, [(inicio, meta)])
+    print(f"\nJerarquía de contracción: {contraccion['atajos']} atajos sobre {contraccion['aristas']} "
+          f"macro-aristas, preprocesamiento {contraccion['segundos_preprocesamiento'] * 1000:.2f} ms")
+    print(f"Consulta: {contraccion['latencia_jerarquia'] * 1000:.3f} ms "
+          f"({contraccion['expandidos_jerarquia']:.0f} nodos expandidos) contra "
+          f"{contraccion['latencia_a_estrella'] * 1000:.3f} ms con A* Macro "
+          f"({contraccion['expandidos_a_estrella']:.0f} nodos expandidos)")
 
-# Función principal: ejecuta todos los algoritmos y muestra comparativa.
-def main():
+
+# Función principal: ejecuta los algoritmos elegidos y muestra comparativa.
+def main(argv=None):
     """Función principal donde se indica el laberinto a solucionar y se llama a las
     funciones para encontrar el camino, las dimensiones del laberinto y dibujar el laberinto.
+
+    Sin argumentos resuelve laberinto.txt con todos los algoritmos y muestra el análisis
+    comparativo en texto, sin dibujar. Las imágenes se generan solo con --dibujar, y solo
+    entonces se carga matplotlib.
+
+    Args:
+        argv (list, optional): Argumentos de la línea de comandos (por defecto, sys.argv)
     """
+    parser = argparse.ArgumentParser(description="Resuelve un laberinto con los algoritmos de búsqueda.")
+    parser.add_argument("laberinto", nargs="?", default="laberinto.txt",
+                        help="archivo del laberinto (.txt o .lab)")
+    parser.add_argument("-a", "--algoritmos", nargs="+", choices=ALGORITMOS, default=list(ALGORITMOS),
+                        help="algoritmos a ejecutar (por defecto, todos)")
+    parser.add_argument("-f", "--formato", choices=FORMATOS, default="texto",
+                        help="texto, una línea JSON por algoritmo o ninguno (solo resolver)")
+    parser.add_argument("--dibujar", action="store_true",
+                        help="guarda las imágenes del laberinto y de cada recorrido")
+    args = parser.parse_args(argv)
+    formato = args.formato
+    texto = formato == "texto"
+
     # El laberinto se representa como una matriz de NxN, donde:
     # 0: camino libre.
     # 1: pared.
     # 2: punto de inicio.
     # 3: punto de meta.
 
-    # Cargar el laberinto desde el archivo laberinto.txt
-    laberinto = []
-    with open("laberinto.txt", "r") as f:
-        for linea in f:
-            fila = [int(x) for x in linea.strip().split(",")]
-            laberinto.append(fila)
+    # Cargar el laberinto (texto separado por comas o formato binario .lab).
+    laberinto = cargar_laberinto(args.laberinto)
 
-    # Tamaño del laberinto (debe ser cuadrado).
+    # Tamaño del laberinto.
     N = len(laberinto)
 
     # Encontrar los puntos de inicio y meta en el laberinto.
     inicio, meta = encontrar_puntos(laberinto, N)
 
-    # Convertir la matriz del laberinto a un grafo para facilitar la búsqueda de caminos.
-    grafo = matriz_a_grafo(laberinto, N)
+    # Convertir la matriz del laberinto a un grafo (compacto, respaldado por un búfer de máscaras)
+    # para facilitar la búsqueda de caminos.
+    grafo = matriz_a_grafo_compacto(laberinto, N)
 
-    # Imprimir los puntos de inicio y meta encontrados.
-    print("Inicio:", inicio)
-    print("Meta:  ", meta)
+    # Índice de componentes conexas: si inicio y meta están desconectados, cada búsqueda
+    # regresa sin solución en O(1) en lugar de explorar toda la componente del inicio.
+    componentes = IndiceComponentes(grafo)
 
-    # Dibujar el laberinto vacío para facilitar la visualización.
-    dibujar_laberinto(laberinto, N)
+    # Imprimir los puntos de inicio y meta encontrados.
+    if texto:
+        print("Inicio:", inicio)
+        print("Meta:  ", meta)
 
-    # ─ Algoritmos originales ─
+    if args.dibujar:
+        # Importación local: matplotlib solo se carga cuando se pide dibujar.
+        from dibujar_laberinto import dibujar_laberinto, dibujar_recorrido
 
-    # DFS.
-    camino_dfs = dfs(grafo, inicio, meta)
-    imprimir_resultado("DFS", camino_dfs)
-    dibujar_recorrido(laberinto, N, camino_dfs, "DFS")
+        # Dibujar el laberinto vacío para facilitar la visualización.
+        dibujar_laberinto(laberinto, N)
 
-    # BFS.
-    camino_bfs = bfs(grafo, inicio, meta)
-    imprimir_resultado("BFS", camino_bfs)
-    dibujar_recorrido(laberinto, N, camino_bfs, "BFS")
+    # {algoritmo: (camino, nodos_expandidos, nodos_generados)}
+    resultados = {}
+    macro_grafo = corredores = ruta_compacta = None
 
-    # A* original (paso a paso).
-    camino_astar, expandidos_astar = a_estrella(grafo, inicio, meta)
-    imprimir_resultado("A* (original, paso a paso)", camino_astar, expandidos_astar)
-    dibujar_recorrido(laberinto, N, camino_astar, "A_estrella")
+    for algoritmo in ALGORITMOS:
+        if algoritmo not in args.algoritmos:
+            continue
 
-    # ─ A* sobre el Macro-Grafo ─
+        if algoritmo == "dfs":
+            resultados[algoritmo] = dfs(grafo, inicio, meta, componentes=componentes)
+        elif algoritmo == "bfs":
+            resultados[algoritmo] = bfs(grafo, inicio, meta, componentes=componentes)
+        elif algoritmo == "a_estrella":
+            # A* original (paso a paso).
+            resultados[algoritmo] = (*a_estrella(grafo, inicio, meta, componentes=componentes), None)
+        elif algoritmo == "jps":
+            # Jump Point Search (directamente sobre la matriz, sin preprocesamiento).
+            resultados[algoritmo] = (*jps(laberinto, N, inicio, meta, componentes=componentes), None)
+        else:
+            # 1. Construir el macro-grafo con nodos de decisión (o cargarlo de la caché si el laberinto no cambió).
+            macro_grafo, nodos_decision, corredores = construir_macro_grafo_en_cache(laberinto, grafo, inicio, meta)
 
-    # 1. Construir el macro-grafo con nodos de decisión.
-    macro_grafo, nodos_decision, corredores = construir_macro_grafo(grafo, inicio, meta)
+            if texto:
+                print("\n" + "=" * 40)
+                print("MACRO-GRAFO")
+                print("=" * 40)
+                print(f"Nodos de decisión identificados ({len(nodos_decision)}):")
+                for nd in sorted(nodos_decision):
+                    vecinos_macro = [(v, c) for v, c in macro_grafo[nd]]
+                    print(f"  {nd}  →  {vecinos_macro}")
 
-    print("\n" + "=" * 40)
-    print("MACRO-GRAFO")
-    print("=" * 40)
-    print(f"Nodos de decisión identificados ({len(nodos_decision)}):")
-    for nd in sorted(nodos_decision):
-        vecinos_macro = [(v, c) for v, c in macro_grafo[nd]]
-        print(f"  {nd}  →  {vecinos_macro}")
+            # 2. Ejecutar A* sobre el macro-grafo.
+            ruta_compacta, expandidos_macro = a_estrella_macro(macro_grafo, inicio, meta, componentes=componentes)
 
-    # 2. Ejecutar A* sobre el macro-grafo.
-    ruta_compacta, expandidos_macro = a_estrella_macro(macro_grafo, inicio, meta)
+            if texto:
+                print("\nRuta compacta (solo nodos de decisión):")
+                print(ruta_compacta)
+                if ruta_compacta:
+                    print("Nodos de decisión en la ruta:", len(ruta_compacta))
 
-    print("\nRuta compacta (solo nodos de decisión):")
-    print(ruta_compacta)
-    if ruta_compacta:
-        print("Nodos de decisión en la ruta:", len(ruta_compacta))
+            # 3. Reconstruir la ruta completa (celda a celda); si no se imprime ni se dibuja,
+            # basta la ruta perezosa, que conoce su longitud sin expandir los corredores.
+            perezosa = formato == "ninguno" and not args.dibujar
+            ruta_completa = reconstruir_ruta_completa(ruta_compacta, corredores, perezosa=perezosa)
+            resultados[algoritmo] = (ruta_completa, expandidos_macro, None)
 
-    # 3. Reconstruir la ruta completa (celda a celda) y graficar.
-    ruta_completa = reconstruir_ruta_completa(ruta_compacta, corredores)
-    imprimir_resultado("A* Macro (ruta completa reconstruida)", ruta_completa, expandidos_macro)
-    dibujar_recorrido(laberinto, N, ruta_completa, "A_estrella_macro")
+        titulo, imagen = TITULOS[algoritmo]
+        camino, nodos_expandidos, nodos_generados = resultados[algoritmo]
+        imprimir_resultado(titulo, camino, nodos_expandidos, nodos_generados, formato)
+        if args.dibujar and imagen is not None:
+            dibujar_recorrido(laberinto, N, camino, imagen)
 
     # ─ Análisis Comparativo ─
-    print("\n" + "=" * 40)
-    print("ANÁLISIS COMPARATIVO")
-    print("=" * 40)
-    if camino_astar and ruta_completa:
-        print(f"{'Métrica':<35} {'A* Original':>12} {'A* Macro':>12}")
-        print("-" * 61)
-        print(f"{'Nodos expandidos (cola prioridad)':<35} {expandidos_astar:>12} {expandidos_macro:>12}")
-        print(f"{'Longitud de la ruta (pasos)':<35} {len(camino_astar):>12} {len(ruta_completa):>12}")
-        print(f"{'Nodos de decisión en la ruta':<35} {'—':>12} {len(ruta_compacta):>12}")
-        reduccion = (1 - expandidos_macro / expandidos_astar) * 100
-        print(f"\nReducción de nodos expandidos: {reduccion:.1f}%")
+    if texto and {"dfs", "bfs", "a_estrella", "a_estrella_macro"} <= resultados.keys():
+        imprimir_comparativo(grafo, macro_grafo, corredores, inicio, meta, resultados, ruta_compacta,
+                             componentes)
 
 
 if __name__ == "__main__":
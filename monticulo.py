@@ -0,0 +1,168 @@
+# monticulo.py
+
+
+class MonticuloIndexado:
+    """Montículo binario de mínimos con índice de posiciones y disminución de clave.
+
+    Cada entrada es una tupla cuyo último elemento es el nodo, por ejemplo (f, h, nodo).
+    A diferencia de heapq, un nodo aparece a lo sumo una vez: si se agrega un nodo que ya
+    está con una entrada menor, su entrada se actualiza en su lugar (decrease-key), así
+    que el montículo nunca tiene entradas obsoletas y su tamaño es el de la frontera real.
+    """
+
+    def __init__(self):
+        self._entradas = []
+        self._posicion = {}
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __contains__(self, nodo):
+        return nodo in self._posicion
+
+    def agregar(self, entrada):
+        """Agrega la entrada de un nodo, o la disminuye si el nodo ya está con una mayor.
+
+        Args:
+            entrada (tuple): Prioridad seguida del nodo, por ejemplo (f, h, nodo)
+        """
+        nodo = entrada[-1]
+        k = self._posicion.get(nodo)
+        if k is None:
+            k = len(self._entradas)
+            self._entradas.append(entrada)
+        elif entrada < self._entradas[k]:
+            self._entradas[k] = entrada
+        else:
+            return
+        self._subir(k)
+
+    def extraer(self):
+        """Saca y regresa la entrada mínima.
+
+        Returns:
+            tuple: La entrada con menor prioridad
+        """
+        entradas = self._entradas
+        ultima = entradas.pop()
+        if not entradas:
+            del self._posicion[ultima[-1]]
+            return ultima
+
+        minima = entradas[0]
+        del self._posicion[minima[-1]]
+        entradas[0] = ultima
+        self._bajar(0)
+        return minima
+
+    def tope(self):
+        """Regresa la entrada mínima sin sacarla."""
+        return self._entradas[0]
+
+    def _subir(self, k):
+        entradas, posicion = self._entradas, self._posicion
+        entrada = entradas[k]
+        while k > 0:
+            padre = (k - 1) >> 1
+            if entrada >= entradas[padre]:
+                break
+            entradas[k] = entradas[padre]
+            posicion[entradas[k][-1]] = k
+            k = padre
+        entradas[k] = entrada
+        posicion[entrada[-1]] = k
+
+    def _bajar(self, k):
+        entradas, posicion = self._entradas, self._posicion
+        n = len(entradas)
+        entrada = entradas[k]
+        while True:
+            hijo = 2 * k + 1
+            if hijo >= n:
+                break
+            if hijo + 1 < n and entradas[hijo + 1] < entradas[hijo]:
+                hijo += 1
+            if entradas[hijo] >= entrada:
+                break
+            entradas[k] = entradas[hijo]
+            posicion[entradas[k][-1]] = k
+            k = hijo
+        entradas[k] = entrada
+        posicion[entrada[-1]] = k
+
+
+class ColaCubetas:
+    """Cola de prioridad de cubetas (algoritmo de Dial) para prioridades enteras pequeñas.
+
+    Cada prioridad tiene su cubeta (una lista) y un puntero avanza desde la menor
+    prioridad no vacía, así que agregar y extraer cuestan O(1) más el avance del puntero,
+    que en total es a lo sumo la mayor prioridad extraída. Con costos enteros pequeños y
+    una heurística consistente las prioridades crecen de forma monótona y la búsqueda
+    queda en tiempo casi lineal, sin las comparaciones de tuplas de heapq. Una prioridad
+    menor que el puntero (heurística inconsistente) lo hace retroceder, así que el orden
+    de extracción siempre es correcto.
+
+    Tiene la misma interfaz que MonticuloIndexado: las entradas son tuplas cuyo primer
+    elemento es la prioridad, por ejemplo (f, h, nodo). Dentro de una cubeta se extrae
+    primero la última entrada agregada. La prioridad float("inf") se admite y esas
+    entradas se extraen al final.
+    """
+
+    def __init__(self):
+        self._cubetas = {}
+        self._minimo = 0
+        self._finitas = 0
+        self._infinitas = []
+
+    def __len__(self):
+        return self._finitas + len(self._infinitas)
+
+    def agregar(self, entrada):
+        """Agrega una entrada.
+
+        Args:
+            entrada (tuple): Prioridad (entero no negativo o infinito) seguida del resto de la entrada
+        """
+        prioridad = entrada[0]
+        cubeta = self._cubetas.get(prioridad)
+        if cubeta is not None:
+            cubeta.append(entrada)
+        elif prioridad == float("inf"):
+            self._infinitas.append(entrada)
+            return
+        else:
+            self._cubetas[prioridad] = [entrada]
+            if prioridad < self._minimo:
+                self._minimo = prioridad
+        self._finitas += 1
+
+    def extraer(self):
+        """Saca y regresa una entrada de prioridad mínima.
+
+        Returns:
+            tuple: La entrada extraída
+        """
+        if not self._finitas:
+            if not self._infinitas:
+                raise IndexError("extraer de una cola vacía")
+            return self._infinitas.pop()
+
+        cubetas = self._cubetas
+        prioridad = self._minimo
+        cubeta = cubetas.get(prioridad)
+        while cubeta is None:
+            prioridad += 1
+            cubeta = cubetas.get(prioridad)
+
+        entrada = cubeta.pop()
+        if not cubeta:
+            del cubetas[prioridad]
+        self._minimo = prioridad
+        self._finitas -= 1
+        return entrada
+
+    def tope(self):
+        """Regresa una entrada de prioridad mínima sin sacarla."""
+        entrada = self.extraer()
+        self.agregar(entrada)
+        return entrada
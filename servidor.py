@@ -0,0 +1,368 @@
+# servidor.py
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cache_macro import construir_macro_grafo_en_cache
+from consultas import MotorConsultas
+from formato_laberinto import cargar_laberinto
+from grafo import matriz_a_grafo_compacto
+
+# Socket local por defecto (Unix); con --puerto se escucha en 127.0.0.1.
+RUTA_SOCKET = "laberintos.sock"
+
+# Un lote se cierra al juntar LOTE_MAXIMO consultas o ESPERA_LOTE segundos después de la primera.
+LOTE_MAXIMO = 64
+ESPERA_LOTE = 0.002
+
+# Latencias que se conservan para calcular los percentiles.
+HISTORIAL_LATENCIAS = 100_000
+PERCENTILES = (50, 90, 99, 99.9)
+
+# Motores de consulta de cada proceso del pool (o del propio servidor sin pool).
+_motores = {}
+
+
+def percentiles(valores, cuantiles=PERCENTILES):
+    """Función que calcula los percentiles de una lista de latencias
+
+    Args:
+        valores (list): Latencias en segundos
+        cuantiles (tuple, optional): Percentiles a calcular (0–100)
+
+    Returns:
+        dict: {"p50": segundos, ...}, vacío si no hay valores
+    """
+    if not valores:
+        return {}
+    calculados = np.percentile(np.asarray(valores, dtype=np.float64), cuantiles)
+    return {f"p{c:g}": float(v) for c, v in zip(cuantiles, calculados)}
+
+
+# Funciones que cargan los laberintos; se ejecutan en el servidor y en cada proceso del pool.
+def cargar_motor(ruta):
+    """Función que carga un laberinto y prepara su motor de consultas
+
+    El macro-grafo se toma de la caché en disco, así que solo el primer proceso que
+    carga un laberinto lo construye.
+
+    Args:
+        ruta (str): Ruta del archivo del laberinto
+
+    Returns:
+        MotorConsultas: Motor con el grafo, el macro-grafo y los corredores en memoria
+    """
+    laberinto = cargar_laberinto(ruta)
+    grafo = matriz_a_grafo_compacto(laberinto)
+    macro = construir_macro_grafo_en_cache(laberinto, grafo, None, None)
+    return MotorConsultas(grafo, macro=macro)
+
+
+def nombre_laberinto(ruta):
+    """Nombre con el que se consulta un laberinto: el de su archivo, sin extensión."""
+    return os.path.splitext(os.path.basename(ruta))[0]
+
+
+def _iniciar_trabajador(rutas):
+    # Con fork los procesos ya heredan los motores del servidor.
+    for ruta in rutas:
+        if nombre_laberinto(ruta) not in _motores:
+            _motores[nombre_laberinto(ruta)] = cargar_motor(ruta)
+
+
+def resolver_lote(nombre, consultas):
+    """Función que resuelve un lote de consultas sobre un mismo laberinto
+
+    Se ejecuta en los procesos del pool (o en un hilo del servidor sin pool); los errores
+    de cada consulta se regresan en su resultado sin afectar al resto del lote.
+
+    Args:
+        nombre (str): Nombre del laberinto
+        consultas (list): Diccionarios con inicio, meta y, opcionalmente, plazo,
+            max_expansiones y camino (si hay que regresar el camino completo)
+
+    Returns:
+        list: Un diccionario por consulta con longitud, nodos_expandidos, segundos y,
+              según el caso, camino, cota, optimo o error
+    """
+    motor = _motores[nombre]
+    resultados = []
+
+    for consulta in consultas:
+        t = time.perf_counter()
+        resultado = {}
+        try:
+            inicio, meta = tuple(consulta["inicio"]), tuple(consulta["meta"])
+            # Si solo se pide la longitud, el camino no se llega a expandir.
+            perezosa = not consulta.get("camino")
+            if consulta.get("plazo") is not None or consulta.get("max_expansiones") is not None:
+                camino, expandidos, cota, optimo = motor.consultar_con_plazo(
+                    inicio, meta, consulta.get("plazo"), consulta.get("max_expansiones"), perezosa=perezosa)
+                resultado["cota"] = cota if cota != float("inf") else None
+                resultado["optimo"] = optimo
+            else:
+                camino, expandidos = motor.consultar(inicio, meta, perezosa=perezosa)
+            resultado["longitud"] = len(camino) if camino else None
+            resultado["nodos_expandidos"] = expandidos
+            if consulta.get("camino"):
+                resultado["camino"] = [list(celda) for celda in camino] if camino else None
+        except Exception as e:
+            resultado["error"] = f"{type(e).__name__}: {e}"
+        resultado["segundos"] = time.perf_counter() - t
+        resultados.append(resultado)
+
+    return resultados
+
+
+class ServidorLaberintos:
+    """Servidor asyncio de consultas de caminos sobre laberintos ya preprocesados.
+
+    Los laberintos se cargan una sola vez: el grafo, el macro-grafo y los corredores
+    quedan en memoria en cada proceso del pool. El protocolo es JSON por líneas: cada
+    petición {"id", "laberinto", "inicio", "meta", ...} recibe una respuesta con el mismo
+    id, en el orden en que se terminan (un cliente puede tener muchas en vuelo). Las
+    consultas que llegan juntas se agrupan en lotes por laberinto, para pagar una sola
+    vez el envío al pool, y se mide la latencia de cada petición desde que se lee hasta
+    que se responde.
+    """
+
+    def __init__(self, rutas, trabajadores=None, lote_maximo=LOTE_MAXIMO, espera_lote=ESPERA_LOTE):
+        """
+        Args:
+            rutas (list): Rutas de los laberintos a cargar
+            trabajadores (int, optional): Procesos del pool (por defecto, uno por CPU); con 0
+                las búsquedas corren en un hilo del propio servidor
+            lote_maximo (int, optional): Consultas como máximo por lote
+            espera_lote (float, optional): Segundos que se espera a que se llene un lote
+        """
+        self.rutas = list(rutas)
+        self.trabajadores = (os.cpu_count() or 1) if trabajadores is None else trabajadores
+        self.lote_maximo = lote_maximo
+        self.espera_lote = espera_lote
+        self.latencias = deque(maxlen=HISTORIAL_LATENCIAS)
+        self.atendidas = 0
+        self.lotes = 0
+        self.pool = None
+        self._cola = None
+        self._tareas = []
+        self._envios = set()
+
+        # Se cargan en el servidor para validar los archivos, llenar la caché antes de
+        # arrancar el pool y responder los comandos que no buscan caminos.
+        for ruta in self.rutas:
+            _motores[nombre_laberinto(ruta)] = cargar_motor(ruta)
+
+    # ─ Ciclo de vida ─
+
+    async def iniciar(self, ruta_socket=RUTA_SOCKET, puerto=None):
+        """Arranca el pool, el agrupador de lotes y el socket.
+
+        Args:
+            ruta_socket (str, optional): Ruta del socket Unix
+            puerto (int, optional): Si se indica, escucha en 127.0.0.1 en ese puerto
+
+        Returns:
+            asyncio.Server: El servidor, ya escuchando
+        """
+        if self.trabajadores > 0:
+            self.pool = ProcessPoolExecutor(self.trabajadores, initializer=_iniciar_trabajador,
+                                            initargs=(self.rutas,))
+        self._cola = asyncio.Queue()
+        self._tareas.append(asyncio.create_task(self._agrupar()))
+
+        if puerto is not None:
+            return await asyncio.start_server(self._atender, "127.0.0.1", puerto)
+        if os.path.exists(ruta_socket):
+            os.unlink(ruta_socket)
+        return await asyncio.start_unix_server(self._atender, ruta_socket)
+
+    def cerrar(self):
+        """Detiene el agrupador y el pool."""
+        for tarea in self._tareas:
+            tarea.cancel()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    # ─ Conexiones ─
+
+    async def _atender(self, lector, escritor):
+        """Lee peticiones de una conexión y las despacha sin esperar a que terminen las anteriores."""
+        pendientes = set()
+        candado = asyncio.Lock()
+        try:
+            while linea := await lector.readline():
+                tarea = asyncio.create_task(self._responder(linea, escritor, candado))
+                pendientes.add(tarea)
+                tarea.add_done_callback(pendientes.discard)
+            if pendientes:
+                await asyncio.wait(pendientes)
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def _responder(self, linea, escritor, candado):
+        t = time.perf_counter()
+        identificador = None
+        try:
+            peticion = json.loads(linea)
+            # El id se toma antes de procesar para que el cliente reciba también los errores.
+            if isinstance(peticion, dict):
+                identificador = peticion.get("id")
+            respuesta = await self.procesar(peticion)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            respuesta = {"error": f"{type(e).__name__}: {e}"}
+        respuesta["id"] = identificador
+
+        async with candado:
+            escritor.write((json.dumps(respuesta) + "\n").encode())
+            await escritor.drain()
+
+        if "comando" not in respuesta:
+            self.latencias.append(time.perf_counter() - t)
+            self.atendidas += 1
+
+    async def procesar(self, peticion):
+        """Responde una petición ya decodificada.
+
+        Además de las consultas de camino, acepta los comandos "laberintos" (nombres y
+        dimensiones de los laberintos cargados), "muestra" (celdas libres al azar, para
+        generar carga) y "estadisticas" (consultas atendidas, lotes y percentiles de
+        latencia).
+
+        Args:
+            peticion (dict): Petición del cliente
+
+        Returns:
+            dict: Respuesta (sin el id)
+        """
+        comando = peticion.get("comando")
+        if comando is None:
+            nombre = peticion["laberinto"]
+            if nombre not in _motores:
+                return {"error": f"laberinto desconocido: {nombre}"}
+            futuro = asyncio.get_running_loop().create_future()
+            await self._cola.put((nombre, peticion, futuro))
+            return await futuro
+
+        if comando == "laberintos":
+            return {"comando": comando, "laberintos": {
+                nombre: [motor.grafo.filas, motor.grafo.columnas] for nombre, motor in _motores.items()}}
+        if comando == "muestra":
+            nombre = peticion["laberinto"]
+            if nombre not in _motores:
+                return {"error": f"laberinto desconocido: {nombre}"}
+            celdas = list(_motores[nombre].grafo)
+            rng = random.Random(peticion.get("semilla", 0))
+            return {"comando": comando, "celdas": [list(rng.choice(celdas)) for _ in range(peticion.get("cantidad", 1))]}
+        if comando == "estadisticas":
+            return {"comando": comando, **self.estadisticas()}
+        return {"error": f"comando desconocido: {comando}"}
+
+    def estadisticas(self):
+        """Consultas atendidas, lotes enviados y percentiles de latencia (en segundos)."""
+        return {"atendidas": self.atendidas, "lotes": self.lotes, "latencia": percentiles(list(self.latencias))}
+
+    # ─ Lotes ─
+
+    async def _agrupar(self):
+        """Junta las consultas que llegan en ráfaga y envía un lote por laberinto."""
+        loop = asyncio.get_running_loop()
+        while True:
+            pendientes = [await self._cola.get()]
+            limite = loop.time() + self.espera_lote
+            while len(pendientes) < self.lote_maximo:
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    pendientes.append(await asyncio.wait_for(self._cola.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                self._repartir(pendientes)
+            except Exception as e:
+                # Un lote que falla no debe detener al agrupador: sus consultas reciben el
+                # error y el ciclo sigue con las siguientes.
+                for _, _, futuro in pendientes:
+                    if not futuro.done():
+                        futuro.set_result({"error": f"{type(e).__name__}: {e}"})
+
+    def _repartir(self, pendientes):
+        """Separa las consultas de un lote por laberinto y lanza una tarea de envío por parte."""
+        por_laberinto = {}
+        for nombre, peticion, futuro in pendientes:
+            por_laberinto.setdefault(nombre, []).append((peticion, futuro))
+        for nombre, grupo in por_laberinto.items():
+            # Una ráfaga se reparte entre todos los procesos en lugar de ir entera a uno.
+            partes = max(1, min(self.trabajadores, len(grupo)))
+            tamano = -(-len(grupo) // partes)
+            for k in range(0, len(grupo), tamano):
+                self.lotes += 1
+                # Se guarda una referencia para que el recolector no cancele la tarea.
+                tarea = asyncio.create_task(self._enviar(nombre, grupo[k:k + tamano]))
+                self._envios.add(tarea)
+                tarea.add_done_callback(self._envios.discard)
+
+    async def _enviar(self, nombre, grupo):
+        loop = asyncio.get_running_loop()
+        try:
+            resultados = await loop.run_in_executor(self.pool, resolver_lote, nombre,
+                                                    [peticion for peticion, _ in grupo])
+        except Exception as e:
+            resultados = [{"error": f"{type(e).__name__}: {e}"} for _ in grupo]
+        for (_, futuro), resultado in zip(grupo, resultados):
+            if not futuro.done():
+                futuro.set_result(resultado)
+
+
+async def servir(rutas, ruta_socket=RUTA_SOCKET, puerto=None, trabajadores=None, intervalo_reporte=None):
+    """Función que carga los laberintos y atiende consultas hasta que se interrumpe
+
+    Args:
+        rutas (list): Rutas de los laberintos a cargar
+        ruta_socket (str, optional): Ruta del socket Unix
+        puerto (int, optional): Si se indica, escucha en 127.0.0.1 en lugar del socket Unix
+        trabajadores (int, optional): Procesos del pool (0 para resolver en el servidor)
+        intervalo_reporte (float, optional): Cada cuántos segundos se imprimen los percentiles de latencia
+    """
+    servidor = ServidorLaberintos(rutas, trabajadores)
+    socket = await servidor.iniciar(ruta_socket, puerto)
+    print(f"{len(rutas)} laberintos cargados; escuchando en "
+          f"{f'127.0.0.1:{puerto}' if puerto is not None else ruta_socket}", flush=True)
+
+    try:
+        async with socket:
+            if intervalo_reporte is None:
+                await socket.serve_forever()
+            while True:
+                await asyncio.sleep(intervalo_reporte)
+                print(json.dumps(servidor.estadisticas()), flush=True)
+    finally:
+        servidor.cerrar()
+        if puerto is None and os.path.exists(ruta_socket):
+            os.unlink(ruta_socket)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local de consultas de caminos en laberintos.")
+    parser.add_argument("laberintos", nargs="+", help="archivos de laberinto (.txt o .lab)")
+    parser.add_argument("--socket", default=RUTA_SOCKET, help="ruta del socket Unix")
+    parser.add_argument("-p", "--puerto", type=int, help="escuchar en 127.0.0.1 en este puerto")
+    parser.add_argument("-j", "--trabajadores", type=int, help="procesos del pool (0: sin pool)")
+    parser.add_argument("--reporte", type=float, help="segundos entre reportes de latencia")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(servir(args.laberintos, args.socket, args.puerto, args.trabajadores, args.reporte))
+    except KeyboardInterrupt:
+        pass
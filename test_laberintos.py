@@ -0,0 +1,241 @@
+# test_laberintos.py
+#
+# Pruebas de consistencia con pytest sobre laberintos del generador con semilla fija:
+# el costo del camino de cada algoritmo contra dijkstra, el estado incremental de
+# MotorConsultas contra una reconstrucción completa y la ida y vuelta de la caché.
+
+import random
+
+import numpy as np
+import pytest
+
+from algoritmos import (
+    a_estrella,
+    a_estrella_anytime,
+    a_estrella_bidireccional,
+    a_estrella_macro,
+    a_estrella_macro_anytime,
+    a_estrella_macro_bidireccional,
+    bfs,
+    bfs_bidireccional,
+    construir_macro_grafo,
+    dfs,
+    dijkstra,
+    jps,
+    reconstruir_ruta_completa,
+)
+from bitboard import bfs_bits
+from cache_macro import (
+    cargar_arreglos,
+    cargar_macro_grafo,
+    clave_laberinto,
+    guardar_arreglos,
+    guardar_macro_grafo,
+)
+from componentes import IndiceComponentes
+from consultas import MotorConsultas
+from formato_laberinto import cargar_laberinto, guardar_laberinto_binario
+from generador import agregar_terreno, generar_laberinto
+from grafo import alternar_celda, encontrar_puntos, matriz_a_grafo, matriz_a_grafo_compacto
+from jerarquico import construir_abstraccion
+from landmarks import preprocesar_landmarks
+
+TIPOS = ("perfecto", "trenzado", "salas")
+SEMILLAS = (0, 1)
+N = 31
+CONSULTAS = 8
+
+
+def _laberinto(tipo, semilla, terreno):
+    laberinto = generar_laberinto(N, tipo, semilla)
+    if terreno:
+        agregar_terreno(laberinto, proporcion=0.4, semilla=semilla)
+    return laberinto
+
+
+def _costo(grafo, camino):
+    """Costo de un camino celda a celda; falla si algún paso no es una arista del grafo."""
+    total = 0
+    for origen, destino in zip(camino, camino[1:]):
+        pesos = [peso for vecino, peso in grafo[origen] if vecino == destino]
+        assert pesos, f"paso inválido {origen} → {destino}"
+        total += pesos[0]
+    return total
+
+
+def _costo_macro(macro_grafo, ruta):
+    return sum(min(peso for destino, peso in macro_grafo[origen] if destino == siguiente)
+               for origen, siguiente in zip(ruta, ruta[1:]))
+
+
+def _consultas(grafo, semilla):
+    """Pares (inicio, meta) de celdas libres al azar, reproducibles con la semilla."""
+    rng = random.Random(semilla)
+    libres = sorted(grafo)
+    return [tuple(rng.sample(libres, 2)) for _ in range(CONSULTAS)]
+
+
+def _revisar(grafo, camino, inicio, meta, optimo, exacto=True):
+    if optimo is None:
+        assert camino is None
+        return
+    assert camino is not None and camino[0] == inicio and camino[-1] == meta
+    costo = _costo(grafo, camino)
+    if exacto:
+        assert costo == optimo
+    else:
+        assert costo >= optimo
+
+
+@pytest.mark.parametrize("terreno", (False, True))
+@pytest.mark.parametrize("semilla", SEMILLAS)
+@pytest.mark.parametrize("tipo", TIPOS)
+def test_costos_contra_dijkstra(tipo, semilla, terreno):
+    laberinto = _laberinto(tipo, semilla, terreno)
+    diccionario = matriz_a_grafo(laberinto, N)
+    malla = matriz_a_grafo_compacto(laberinto, N)
+    landmarks = preprocesar_landmarks(malla, 4, semilla)
+    componentes = IndiceComponentes(malla)
+    consultas = _consultas(diccionario, semilla) + [encontrar_puntos(laberinto, N)]
+
+    for inicio, meta in consultas:
+        referencia, _ = dijkstra(diccionario, inicio, meta)
+        optimo = None if referencia is None else _costo(diccionario, referencia)
+
+        for grafo in (diccionario, malla):
+            _revisar(grafo, dijkstra(grafo, inicio, meta, componentes=componentes)[0], inicio, meta, optimo)
+            _revisar(grafo, a_estrella(grafo, inicio, meta)[0], inicio, meta, optimo)
+            _revisar(grafo, a_estrella(grafo, inicio, meta, landmarks.heuristica)[0], inicio, meta, optimo)
+            _revisar(grafo, a_estrella_bidireccional(grafo, inicio, meta)[0], inicio, meta, optimo)
+            _revisar(grafo, a_estrella_bidireccional(grafo, inicio, meta, landmarks.heuristica)[0],
+                     inicio, meta, optimo)
+            _revisar(grafo, a_estrella_anytime(grafo, inicio, meta)[0], inicio, meta, optimo)
+            _revisar(grafo, dfs(grafo, inicio, meta)[0], inicio, meta, optimo, exacto=False)
+        _revisar(malla, a_estrella(malla, inicio, meta, indexado=True)[0], inicio, meta, optimo)
+        _revisar(malla, a_estrella(malla, inicio, meta, cubetas=True)[0], inicio, meta, optimo)
+
+        macro_grafo, _, corredores = construir_macro_grafo(malla, inicio, meta)
+        for ruta, _ in (a_estrella_macro(macro_grafo, inicio, meta),
+                        a_estrella_macro(macro_grafo, inicio, meta, landmarks.heuristica),
+                        a_estrella_macro_bidireccional(macro_grafo, inicio, meta),
+                        a_estrella_macro_bidireccional(macro_grafo, inicio, meta, landmarks.heuristica),
+                        a_estrella_macro_anytime(macro_grafo, inicio, meta)[:2]):
+            if optimo is None:
+                assert ruta is None
+                continue
+            assert _costo_macro(macro_grafo, ruta) == optimo
+            _revisar(malla, reconstruir_ruta_completa(ruta, corredores), inicio, meta, optimo)
+
+        motor = MotorConsultas(malla)
+        _revisar(malla, motor.consultar(inicio, meta)[0], inicio, meta, optimo)
+        _revisar(malla, motor.consultar_jerarquia(inicio, meta)[0], inicio, meta, optimo)
+
+        # Los algoritmos de costo uniforme solo se comparan sin terreno.
+        if not terreno:
+            _revisar(malla, bfs(malla, inicio, meta)[0], inicio, meta, optimo)
+            _revisar(malla, bfs_bidireccional(malla, inicio, meta)[0], inicio, meta, optimo)
+            _revisar(malla, jps(laberinto, N, inicio, meta)[0], inicio, meta, optimo)
+            distancia, camino, _ = bfs_bits(malla, inicio, meta, reconstruir=True)
+            assert distancia == optimo
+            _revisar(malla, camino, inicio, meta, optimo)
+            # HPA* no garantiza el óptimo, solo un camino válido.
+            abstraccion = construir_abstraccion(malla)
+            _revisar(malla, abstraccion.consultar(inicio, meta)[0], inicio, meta, optimo, exacto=False)
+
+
+def _alternar_y_verificar(motor, laberinto, semilla, rondas=15, por_ronda=4):
+    inicio, meta = encontrar_puntos(laberinto, N)
+    rng = random.Random(semilla)
+    candidatas = [(i, j) for i in range(N) for j in range(N) if (i, j) not in (inicio, meta)]
+    for _ in range(rondas):
+        motor.alternar_celdas(rng.sample(candidatas, por_ronda))
+        assert motor.verificar_consistencia() == []
+    # Después de los cambios las consultas siguen coincidiendo con dijkstra.
+    referencia, _ = dijkstra(motor.grafo, inicio, meta)
+    camino, _ = motor.consultar(inicio, meta)
+    if referencia is None:
+        assert camino is None
+    else:
+        assert _costo(motor.grafo, camino) == _costo(motor.grafo, referencia)
+
+
+@pytest.mark.parametrize("convertir", (matriz_a_grafo, matriz_a_grafo_compacto))
+@pytest.mark.parametrize("terreno", (False, True))
+@pytest.mark.parametrize("semilla", SEMILLAS)
+@pytest.mark.parametrize("tipo", TIPOS)
+def test_alternar_celdas_consistente(tipo, semilla, terreno, convertir):
+    laberinto = _laberinto(tipo, semilla, terreno)
+    motor = MotorConsultas(convertir(laberinto, N), laberinto=laberinto)
+    _alternar_y_verificar(motor, laberinto, semilla)
+
+
+@pytest.mark.parametrize("convertir", (matriz_a_grafo, matriz_a_grafo_compacto))
+def test_alternar_celdas_muchas_semillas(convertir):
+    # Laberintos pequeños con mucho terreno: aparecen celdas con terreno aisladas entre
+    # paredes, cuyo costo no se puede deducir de las aristas.
+    for semilla in range(60):
+        rng = random.Random(semilla)
+        n = rng.choice((7, 9, 11))
+        laberinto = generar_laberinto(n, rng.choice(TIPOS), semilla)
+        agregar_terreno(laberinto, proporcion=0.5, semilla=semilla)
+        inicio, meta = encontrar_puntos(laberinto, n)
+        motor = MotorConsultas(convertir(laberinto, n), laberinto=laberinto)
+        candidatas = [(i, j) for i in range(n) for j in range(n) if (i, j) not in (inicio, meta)]
+        for _ in range(5):
+            motor.alternar_celdas(rng.sample(candidatas, 3))
+        assert motor.verificar_consistencia() == [], f"semilla {semilla}"
+
+
+def test_alternar_celda_junto_a_terreno_aislado():
+    grafo = matriz_a_grafo([[9, 1, 0], [1, 1, 0]])
+    alternar_celda(grafo, (0, 1))
+    assert ((0, 0), 9) in grafo[(0, 1)]
+
+
+@pytest.mark.parametrize("convertir", (matriz_a_grafo, matriz_a_grafo_compacto))
+@pytest.mark.parametrize("terreno", (False, True))
+def test_alternar_celdas_laberinto_binario(tmp_path, terreno, convertir):
+    ruta = tmp_path / "laberinto.lab"
+    guardar_laberinto_binario(_laberinto("trenzado", 3, terreno), str(ruta))
+    laberinto = cargar_laberinto(str(ruta))
+    motor = MotorConsultas(convertir(laberinto, N), laberinto=laberinto)
+    _alternar_y_verificar(motor, laberinto, 3)
+
+    with pytest.raises(ValueError):
+        motor.alternar_celdas([encontrar_puntos(laberinto, N)[0]])
+    assert motor.verificar_consistencia() == []
+
+
+@pytest.mark.parametrize("terreno", (False, True))
+@pytest.mark.parametrize("tipo", TIPOS)
+def test_cache_ida_y_vuelta(tmp_path, tipo, terreno):
+    laberinto = _laberinto(tipo, 0, terreno)
+    inicio, meta = encontrar_puntos(laberinto, N)
+    macro_grafo, nodos_decision, corredores = construir_macro_grafo(
+        matriz_a_grafo_compacto(laberinto, N), inicio, meta)
+
+    clave = clave_laberinto(laberinto, inicio, meta)
+    guardar_macro_grafo(clave, macro_grafo, nodos_decision, corredores, directorio=str(tmp_path))
+    cargado = cargar_macro_grafo(clave, directorio=str(tmp_path))
+
+    assert cargado is not None
+    assert {nodo: sorted(aristas) for nodo, aristas in cargado[0].items()} == \
+        {nodo: sorted(aristas) for nodo, aristas in macro_grafo.items()}
+    assert cargado[1] == nodos_decision
+    assert {arista: list(pasos) for arista, pasos in cargado[2].items()} == \
+        {arista: list(pasos) for arista, pasos in corredores.items()}
+
+
+def test_cache_entrada_danada(tmp_path):
+    guardar_arreglos("a", {"x": np.arange(10)}, directorio=str(tmp_path))
+    (ruta,) = tmp_path.glob("a*")
+    ruta.write_bytes(ruta.read_bytes()[:20])
+
+    assert cargar_arreglos("a", directorio=str(tmp_path)) is None
+    assert not ruta.exists()
+
+
+def test_clave_con_terreno_mayor_a_un_byte():
+    assert clave_laberinto(np.array([[0, 4], [0, 0]])) != clave_laberinto(np.array([[0, 260], [0, 0]]))
+    assert clave_laberinto([[0, 300], [2, 3]]) == clave_laberinto(np.array([[0, 300], [2, 3]]))
+    assert clave_laberinto([[0, 4], [2, 3]]) == clave_laberinto(np.array([[0, 4], [2, 3]], dtype=np.uint8))